@@ -0,0 +1,1121 @@
+/*
+ * Optional C accelerator for cree_sro_syllabics.
+ *
+ * This module has no tables of its own: cree_sro_syllabics.py builds
+ * Transcoder and Translator objects from its own tables, and only uses them
+ * when this module has been built (see build.py). Every function here does
+ * exactly what the pure-Python code in cree_sro_syllabics.py does, down to
+ * the exceptions it raises.
+ */
+
+#define PY_SSIZE_T_CLEAN
+#include <Python.h>
+
+/* Interned names. */
+static PyObject *str_finditer;
+static PyObject *str_regs;
+static PyObject *str_lower;
+static PyObject *str_translate;
+static PyObject *str_empty;
+
+/* ------------------------------------------------------------------------
+ * Output: a growable buffer of code points.
+ * ------------------------------------------------------------------------ */
+
+typedef struct {
+    Py_UCS4 *chars;
+    Py_ssize_t length;
+    Py_ssize_t allocated;
+    Py_UCS4 small[256];
+} Output;
+
+static void
+output_init(Output *out)
+{
+    out->chars = out->small;
+    out->length = 0;
+    out->allocated = Py_ARRAY_LENGTH(out->small);
+}
+
+static void
+output_free(Output *out)
+{
+    if (out->chars != out->small) {
+        PyMem_Free(out->chars);
+    }
+    output_init(out);
+}
+
+static int
+output_reserve(Output *out, Py_ssize_t extra)
+{
+    Py_ssize_t needed = out->length + extra;
+    Py_ssize_t allocated = out->allocated;
+    Py_UCS4 *chars;
+
+    if (needed <= allocated) {
+        return 0;
+    }
+    while (allocated < needed) {
+        if (allocated > PY_SSIZE_T_MAX / 2 / (Py_ssize_t)sizeof(Py_UCS4)) {
+            PyErr_NoMemory();
+            return -1;
+        }
+        allocated *= 2;
+    }
+    if (out->chars == out->small) {
+        chars = PyMem_Malloc(allocated * sizeof(Py_UCS4));
+        if (chars != NULL) {
+            memcpy(chars, out->small, out->length * sizeof(Py_UCS4));
+        }
+    }
+    else {
+        chars = PyMem_Realloc(out->chars, allocated * sizeof(Py_UCS4));
+    }
+    if (chars == NULL) {
+        PyErr_NoMemory();
+        return -1;
+    }
+    out->chars = chars;
+    out->allocated = allocated;
+    return 0;
+}
+
+/* Appends text[start:end]. */
+static int
+output_range(Output *out, int kind, const void *data, Py_ssize_t start, Py_ssize_t end)
+{
+    Py_ssize_t i;
+
+    if (output_reserve(out, end - start) < 0) {
+        return -1;
+    }
+    for (i = start; i < end; i++) {
+        out->chars[out->length++] = PyUnicode_READ(kind, data, i);
+    }
+    return 0;
+}
+
+static int
+output_str(Output *out, PyObject *text)
+{
+    return output_range(out, PyUnicode_KIND(text), PyUnicode_DATA(text), 0,
+                        PyUnicode_GET_LENGTH(text));
+}
+
+static PyObject *
+output_finish(Output *out)
+{
+    PyObject *result =
+        PyUnicode_FromKindAndData(PyUnicode_4BYTE_KIND, out->chars, out->length);
+    output_free(out);
+    return result;
+}
+
+/* ------------------------------------------------------------------------
+ * Transcoder: transcribes SRO words to syllabics, for one choice of hyphen.
+ * ------------------------------------------------------------------------ */
+
+/*
+ * Syllables, sandhi onsets and sandhi vowels are all short, and spelled with
+ * only a few Latin-1 characters. So, each is given a number, by numbering
+ * the characters 1, 2, 3, ... and reading the syllable as a number in base
+ * (alphabet size + 1). Looking up a syllable is then just indexing an array.
+ */
+#define MAX_KEY_LENGTH 3
+#define MAX_ALPHABET 63
+
+enum {
+    IS_SYLLABLE = 1,     /* in syllables */
+    IS_SANDHI_ONSET = 2, /* in sandhi_onsets */
+    IS_SANDHI_VOWEL = 4, /* in sandhi_vowels */
+    IS_H_FINAL = 8,      /* the syllabic is "ᐦ" */
+    IS_K_FINAL = 16,     /* the syllabic is "ᐠ" */
+};
+
+typedef struct {
+    PyObject_HEAD
+    PyObject *lookup;        /* dict: SRO syllable -> syllabic, including "-" */
+    PyObject *alt_forms;     /* str.translate() table of canonical vowels */
+    PyObject *h_final;       /* "ᐦ" */
+    PyObject *k_final;       /* "ᐠ" */
+    PyObject *hk_final;      /* lookup["hk"] */
+    PyObject *full_stop;     /* "᙮" */
+    Py_ssize_t radix;        /* alphabet size + 1 */
+    Py_ssize_t size;         /* radix ** MAX_KEY_LENGTH */
+    PyObject **values;       /* key -> lookup[key], or NULL */
+    unsigned char *flags;    /* key -> IS_* flags */
+    unsigned char code[256];      /* character -> its number, or 0 */
+    unsigned char canonical[256]; /* whether lower() and alt_forms keep it */
+} TranscoderObject;
+
+static void
+Transcoder_clear(TranscoderObject *self)
+{
+    Py_ssize_t i;
+
+    if (self->values != NULL) {
+        for (i = 0; i < self->size; i++) {
+            Py_XDECREF(self->values[i]);
+        }
+    }
+    PyMem_Free(self->values);
+    PyMem_Free(self->flags);
+    self->values = NULL;
+    self->flags = NULL;
+    self->size = 0;
+    Py_CLEAR(self->lookup);
+    Py_CLEAR(self->alt_forms);
+    Py_CLEAR(self->h_final);
+    Py_CLEAR(self->k_final);
+    Py_CLEAR(self->hk_final);
+    Py_CLEAR(self->full_stop);
+}
+
+static void
+Transcoder_dealloc(TranscoderObject *self)
+{
+    Transcoder_clear(self);
+    Py_TYPE(self)->tp_free((PyObject *)self);
+}
+
+/*
+ * Returns the key of prefix + text[start:end], given the key and length of
+ * the prefix, or -1 if there cannot be an entry for it.
+ */
+static Py_ssize_t
+key_of(TranscoderObject *self, Py_ssize_t key, Py_ssize_t length, int kind,
+       const void *data, Py_ssize_t start, Py_ssize_t end)
+{
+    Py_ssize_t i;
+
+    if (key < 0 || length + (end - start) > MAX_KEY_LENGTH) {
+        return -1;
+    }
+    for (i = start; i < end; i++) {
+        Py_UCS4 c = PyUnicode_READ(kind, data, i);
+        if (c >= 256 || self->code[c] == 0) {
+            return -1;
+        }
+        key = key * self->radix + self->code[c];
+    }
+    return key;
+}
+
+static Py_ssize_t
+key_of_str(TranscoderObject *self, PyObject *text)
+{
+    return key_of(self, 0, 0, PyUnicode_KIND(text), PyUnicode_DATA(text), 0,
+                  PyUnicode_GET_LENGTH(text));
+}
+
+/* Returns IS_H_FINAL or IS_K_FINAL if the syllabic is either, 0 if neither,
+ * and -1 on error. */
+static int
+final_flags(TranscoderObject *self, PyObject *syllabic)
+{
+    int equal = PyObject_RichCompareBool(syllabic, self->h_final, Py_EQ);
+    if (equal != 0) {
+        return equal < 0 ? -1 : IS_H_FINAL;
+    }
+    equal = PyObject_RichCompareBool(syllabic, self->k_final, Py_EQ);
+    if (equal != 0) {
+        return equal < 0 ? -1 : IS_K_FINAL;
+    }
+    return 0;
+}
+
+/* Adds the characters of each str in collection to the alphabet. */
+static int
+add_to_alphabet(TranscoderObject *self, PyObject *collection, int required)
+{
+    PyObject *iterator, *item;
+
+    iterator = PyObject_GetIter(collection);
+    if (iterator == NULL) {
+        return -1;
+    }
+    while ((item = PyIter_Next(iterator)) != NULL) {
+        Py_ssize_t i, length;
+        int fits = PyUnicode_Check(item) && PyUnicode_READY(item) == 0;
+
+        length = fits ? PyUnicode_GET_LENGTH(item) : 0;
+        fits = fits && length <= MAX_KEY_LENGTH && PyUnicode_MAX_CHAR_VALUE(item) < 256;
+        if (!fits) {
+            if (required) {
+                PyErr_Format(PyExc_ValueError,
+                             "%R must be a str of at most %d Latin-1 characters",
+                             item, MAX_KEY_LENGTH);
+                Py_DECREF(item);
+                Py_DECREF(iterator);
+                return -1;
+            }
+            Py_DECREF(item);
+            continue;
+        }
+        for (i = 0; i < length; i++) {
+            Py_UCS4 c = PyUnicode_READ_CHAR(item, i);
+            if (self->code[c] == 0) {
+                if (self->radix > MAX_ALPHABET) {
+                    PyErr_SetString(PyExc_ValueError, "too many distinct characters");
+                    Py_DECREF(item);
+                    Py_DECREF(iterator);
+                    return -1;
+                }
+                self->code[c] = (unsigned char)self->radix++;
+            }
+        }
+        Py_DECREF(item);
+    }
+    Py_DECREF(iterator);
+    return PyErr_Occurred() ? -1 : 0;
+}
+
+/* Adds each str in collection to the table, with the given flag. */
+static int
+add_to_table(TranscoderObject *self, PyObject *collection, int flag)
+{
+    PyObject *iterator, *item;
+
+    iterator = PyObject_GetIter(collection);
+    if (iterator == NULL) {
+        return -1;
+    }
+    while ((item = PyIter_Next(iterator)) != NULL) {
+        Py_ssize_t key = PyUnicode_Check(item) ? key_of_str(self, item) : -1;
+        if (key >= 0) {
+            if (self->values[key] == NULL) {
+                PyObject *syllabic = PyDict_GetItemWithError(self->lookup, item);
+                if (syllabic == NULL && PyErr_Occurred()) {
+                    Py_DECREF(item);
+                    Py_DECREF(iterator);
+                    return -1;
+                }
+                if (syllabic != NULL) {
+                    int flags = PyUnicode_Check(syllabic) ? final_flags(self, syllabic) : -1;
+                    if (flags < 0) {
+                        if (!PyErr_Occurred()) {
+                            PyErr_SetString(PyExc_TypeError, "syllabics must be str");
+                        }
+                        Py_DECREF(item);
+                        Py_DECREF(iterator);
+                        return -1;
+                    }
+                    Py_INCREF(syllabic);
+                    self->values[key] = syllabic;
+                    self->flags[key] |= flags;
+                }
+            }
+            self->flags[key] |= flag;
+        }
+        Py_DECREF(item);
+    }
+    Py_DECREF(iterator);
+    return PyErr_Occurred() ? -1 : 0;
+}
+
+/* Finds which Latin-1 characters the canonical form of a word keeps as-is. */
+static int
+find_canonical_characters(TranscoderObject *self)
+{
+    int c;
+
+    for (c = 0; c < 256; c++) {
+        PyObject *character, *lowered, *canonical;
+        int equal;
+
+        character = PyUnicode_FromOrdinal(c);
+        if (character == NULL) {
+            return -1;
+        }
+        lowered = PyObject_CallMethodObjArgs(character, str_lower, NULL);
+        canonical = lowered == NULL ? NULL
+                                    : PyObject_CallMethodObjArgs(lowered, str_translate,
+                                                                 self->alt_forms, NULL);
+        Py_XDECREF(lowered);
+        if (canonical == NULL) {
+            Py_DECREF(character);
+            return -1;
+        }
+        equal = PyObject_RichCompareBool(canonical, character, Py_EQ);
+        Py_DECREF(canonical);
+        Py_DECREF(character);
+        if (equal < 0) {
+            return -1;
+        }
+        self->canonical[c] = (unsigned char)equal;
+    }
+    return 0;
+}
+
+static int
+Transcoder_init(TranscoderObject *self, PyObject *args, PyObject *kwargs)
+{
+    static char *keywords[] = {
+        "lookup", "syllables", "sandhi_onsets", "sandhi_vowels", "alt_forms", NULL};
+    PyObject *lookup, *syllables, *sandhi_onsets, *sandhi_vowels, *alt_forms;
+    Py_ssize_t size;
+
+    if (!PyArg_ParseTupleAndKeywords(args, kwargs, "O!OOOO:Transcoder", keywords,
+                                     &PyDict_Type, &lookup, &syllables, &sandhi_onsets,
+                                     &sandhi_vowels, &alt_forms)) {
+        return -1;
+    }
+
+    Transcoder_clear(self);
+    memset(self->code, 0, sizeof(self->code));
+    self->radix = 1;
+    Py_INCREF(lookup);
+    self->lookup = lookup;
+    Py_INCREF(alt_forms);
+    self->alt_forms = alt_forms;
+    self->h_final = PyUnicode_FromOrdinal(0x1426);
+    self->k_final = PyUnicode_FromOrdinal(0x1420);
+    self->full_stop = PyUnicode_FromOrdinal(0x166E);
+    self->hk_final = PyDict_GetItemString(lookup, "hk");
+    if (self->h_final == NULL || self->k_final == NULL || self->full_stop == NULL) {
+        return -1;
+    }
+    if (self->hk_final == NULL || !PyUnicode_Check(self->hk_final)) {
+        self->hk_final = NULL;
+        PyErr_SetString(PyExc_ValueError, "lookup must map 'hk' to a str");
+        return -1;
+    }
+    Py_INCREF(self->hk_final);
+
+    if (add_to_alphabet(self, syllables, 1) < 0 ||
+        add_to_alphabet(self, sandhi_onsets, 1) < 0 ||
+        add_to_alphabet(self, sandhi_vowels, 1) < 0 ||
+        add_to_alphabet(self, lookup, 0) < 0) {
+        return -1;
+    }
+    size = self->radix * self->radix * self->radix;
+    self->values = PyMem_Calloc(size, sizeof(PyObject *));
+    self->flags = PyMem_Calloc(size, sizeof(unsigned char));
+    if (self->values == NULL || self->flags == NULL) {
+        PyErr_NoMemory();
+        return -1;
+    }
+    self->size = size;
+
+    if (add_to_table(self, lookup, 0) < 0 ||
+        add_to_table(self, syllables, IS_SYLLABLE) < 0 ||
+        add_to_table(self, sandhi_onsets, IS_SANDHI_ONSET) < 0 ||
+        add_to_table(self, sandhi_vowels, IS_SANDHI_VOWEL) < 0) {
+        return -1;
+    }
+    return find_canonical_characters(self);
+}
+
+/*
+ * Looks up a syllable that has no entry in the table, raising KeyError if it
+ * is not in the lookup dict either. Steals the reference to syllable, and
+ * returns a borrowed reference to the syllabic.
+ */
+static PyObject *
+lookup_slowly(TranscoderObject *self, PyObject *syllable)
+{
+    PyObject *syllabic;
+
+    if (syllable == NULL) {
+        return NULL;
+    }
+    syllabic = PyDict_GetItemWithError(self->lookup, syllable);
+    if (syllabic == NULL && !PyErr_Occurred()) {
+        PyObject *key = PyTuple_Pack(1, syllable);
+        if (key != NULL) {
+            PyErr_SetObject(PyExc_KeyError, key);
+            Py_DECREF(key);
+        }
+    }
+    Py_DECREF(syllable);
+    return syllabic;
+}
+
+/* The parts of a transcription so far: see the special case for 'hk'. */
+typedef struct {
+    Py_ssize_t count;
+    Py_ssize_t last_start;
+    int last_flags;
+    int previous_flags;
+    Py_ssize_t previous_start;
+} Parts;
+
+static int
+append_part(Output *out, Parts *parts, PyObject *syllabic, int flags)
+{
+    parts->previous_start = parts->last_start;
+    parts->previous_flags = parts->last_flags;
+    parts->last_start = out->length;
+    parts->last_flags = flags;
+    parts->count++;
+    return output_str(out, syllabic);
+}
+
+/*
+ * The same as transcode_syllables() in cree_sro_syllabics.py: transcribes
+ * word[start:end], already in lowercase with canonical vowels, to out.
+ */
+static int
+transcode_into(TranscoderObject *self, Output *out, PyObject *word, Py_ssize_t start,
+               Py_ssize_t end, int sandhi)
+{
+    int kind = PyUnicode_KIND(word);
+    const void *data = PyUnicode_DATA(word);
+    Py_ssize_t pos = start, hyphen_pos;
+    Parts parts = {0, -1, 0, 0, -1};
+
+    hyphen_pos = PyUnicode_FindChar(word, '-', start, end, 1);
+    if (hyphen_pos == -2) {
+        return -1;
+    }
+
+    while (pos < end) {
+        PyObject *syllabic;
+        Py_ssize_t key, next_syllable_pos;
+        int is_sandhi_onset = 0, flags;
+
+        if (hyphen_pos != -1) {
+            if (hyphen_pos < pos) {
+                hyphen_pos = PyUnicode_FindChar(word, '-', pos, end, 1);
+                if (hyphen_pos == -2) {
+                    return -1;
+                }
+            }
+            /* Look for an onset immediately followed by «-» and a vowel. */
+            if (0 < hyphen_pos - pos && hyphen_pos - pos <= 3 && hyphen_pos + 1 < end) {
+                Py_ssize_t vowel = key_of(self, 0, 0, kind, data, hyphen_pos + 1,
+                                          hyphen_pos + 2);
+                Py_ssize_t onset = key_of(self, 0, 0, kind, data, pos, hyphen_pos);
+                is_sandhi_onset = vowel >= 0 && (self->flags[vowel] & IS_SANDHI_VOWEL) &&
+                                  onset >= 0 && (self->flags[onset] & IS_SANDHI_ONSET);
+            }
+        }
+
+        if (sandhi && is_sandhi_onset) {
+            Py_ssize_t onset_start = pos;
+            if (PyUnicode_READ(kind, data, pos) == 'h') {
+                /* Special case for /hw?-V/ sandhi: add the 'h'/ᐦ syllabic,
+                 * then proceed with the w?V as normal. */
+                if (append_part(out, &parts, self->h_final, IS_H_FINAL) < 0) {
+                    return -1;
+                }
+                onset_start++;
+            }
+            /* Apply sandhi rule. */
+            key = key_of(self, key_of(self, 0, 0, kind, data, onset_start, hyphen_pos),
+                         hyphen_pos - onset_start, kind, data, hyphen_pos + 1,
+                         hyphen_pos + 2);
+            syllabic = key >= 0 ? self->values[key] : NULL;
+            flags = key >= 0 ? self->flags[key] : 0;
+            if (syllabic == NULL) {
+                PyObject *onset = PyUnicode_Substring(word, onset_start, hyphen_pos);
+                PyObject *vowel = PyUnicode_Substring(word, hyphen_pos + 1, hyphen_pos + 2);
+                PyObject *syllable = NULL;
+                if (onset != NULL && vowel != NULL) {
+                    syllable = PyUnicode_Concat(onset, vowel);
+                }
+                Py_XDECREF(onset);
+                Py_XDECREF(vowel);
+                syllabic = lookup_slowly(self, syllable);
+                if (syllabic == NULL || (flags = final_flags(self, syllabic)) < 0) {
+                    return -1;
+                }
+            }
+            next_syllable_pos = hyphen_pos + 2;
+        }
+        else {
+            if (is_sandhi_onset) {
+                /* Not sandhi: consume the onset (consonant), but NOT the
+                 * labialized w. */
+                Py_ssize_t onset_end = hyphen_pos;
+                if (!(hyphen_pos - pos == 1 && PyUnicode_READ(kind, data, pos) == 'w')) {
+                    while (onset_end > pos &&
+                           PyUnicode_READ(kind, data, onset_end - 1) == 'w') {
+                        onset_end--;
+                    }
+                }
+                next_syllable_pos = onset_end;
+                key = key_of(self, 0, 0, kind, data, pos, onset_end);
+            }
+            else {
+                /* Find the longest syllable starting at this position. */
+                Py_ssize_t length;
+                key = -1;
+                for (length = MAX_KEY_LENGTH; length >= 1; length--) {
+                    if (pos + length <= end) {
+                        key = key_of(self, 0, 0, kind, data, pos, pos + length);
+                        if (key >= 0 && (self->flags[key] & IS_SYLLABLE)) {
+                            break;
+                        }
+                    }
+                }
+                if (length == 0) {
+                    /* Nothing here can be transcribed. */
+                    break;
+                }
+                next_syllable_pos = pos + length;
+            }
+            syllabic = key >= 0 ? self->values[key] : NULL;
+            flags = key >= 0 ? self->flags[key] : 0;
+            if (syllabic == NULL) {
+                syllabic = lookup_slowly(self,
+                                         PyUnicode_Substring(word, pos, next_syllable_pos));
+                if (syllabic == NULL || (flags = final_flags(self, syllabic)) < 0) {
+                    return -1;
+                }
+            }
+        }
+
+        if (append_part(out, &parts, syllabic, flags) < 0) {
+            return -1;
+        }
+        pos = next_syllable_pos;
+    }
+
+    /* Special-case word-final 'hk': see transcode_syllables(). */
+    if (parts.count >= 2 && (parts.previous_flags & IS_H_FINAL) &&
+        (parts.last_flags & IS_K_FINAL)) {
+        out->length = parts.previous_start;
+        if (output_str(out, self->hk_final) < 0) {
+            return -1;
+        }
+    }
+
+    if (pos != end) {
+        PyObject *rest = PyUnicode_Substring(word, pos, end);
+        if (rest != NULL) {
+            PyErr_Format(PyExc_AssertionError, "could not transcribe %R", rest);
+            Py_DECREF(rest);
+        }
+        return -1;
+    }
+    return 0;
+}
+
+static PyObject *
+Transcoder_transcode(TranscoderObject *self, PyObject *args, PyObject *kwargs)
+{
+    static char *keywords[] = {"word", "sandhi", NULL};
+    PyObject *word;
+    int sandhi;
+    Output out;
+
+    if (!PyArg_ParseTupleAndKeywords(args, kwargs, "Up:transcode", keywords, &word,
+                                     &sandhi)) {
+        return NULL;
+    }
+    if (self->values == NULL) {
+        PyErr_SetString(PyExc_ValueError, "Transcoder.__init__() was not called");
+        return NULL;
+    }
+    if (PyUnicode_READY(word) < 0) {
+        return NULL;
+    }
+    output_init(&out);
+    if (transcode_into(self, &out, word, 0, PyUnicode_GET_LENGTH(word), sandhi) < 0) {
+        output_free(&out);
+        return NULL;
+    }
+    return output_finish(&out);
+}
+
+/*
+ * Transcribes the word text[start:end], after converting it to lowercase
+ * with canonical vowels, like transcode_sro_word_to_syllabics().
+ */
+static int
+transcode_word_into(TranscoderObject *self, Output *out, PyObject *text,
+                    Py_ssize_t start, Py_ssize_t end, int sandhi)
+{
+    int kind = PyUnicode_KIND(text);
+    const void *data = PyUnicode_DATA(text);
+    PyObject *word, *lowered, *canonical;
+    Py_ssize_t i;
+    int status;
+
+    /* Most words are already in their canonical form. */
+    for (i = start; i < end; i++) {
+        Py_UCS4 c = PyUnicode_READ(kind, data, i);
+        if (c >= 256 || !self->canonical[c]) {
+            break;
+        }
+    }
+    if (i == end) {
+        return transcode_into(self, out, text, start, end, sandhi);
+    }
+
+    word = PyUnicode_Substring(text, start, end);
+    if (word == NULL) {
+        return -1;
+    }
+    lowered = PyObject_CallMethodObjArgs(word, str_lower, NULL);
+    Py_DECREF(word);
+    if (lowered == NULL) {
+        return -1;
+    }
+    canonical = PyObject_CallMethodObjArgs(lowered, str_translate, self->alt_forms, NULL);
+    Py_DECREF(lowered);
+    if (canonical == NULL) {
+        return -1;
+    }
+    if (!PyUnicode_Check(canonical) || PyUnicode_READY(canonical) < 0) {
+        if (!PyErr_Occurred()) {
+            PyErr_SetString(PyExc_TypeError, "translate() must return a str");
+        }
+        Py_DECREF(canonical);
+        return -1;
+    }
+    status = transcode_into(self, out, canonical, 0, PyUnicode_GET_LENGTH(canonical),
+                            sandhi);
+    Py_DECREF(canonical);
+    return status;
+}
+
+/*
+ * The same as word_or_full_stop_pattern.sub(transliterate, text) in
+ * sro2syllabics(), when there is no word cache: pattern must match either a
+ * word (group 1), perhaps followed by a full-stop (group 2), or a full-stop
+ * on its own.
+ */
+static PyObject *
+Transcoder_substitute(TranscoderObject *self, PyObject *args, PyObject *kwargs)
+{
+    static char *keywords[] = {"pattern", "text", "sandhi", NULL};
+    PyObject *pattern, *text, *matches, *match;
+    Py_ssize_t last_end = 0;
+    int sandhi, kind;
+    const void *data;
+    Output out;
+
+    if (!PyArg_ParseTupleAndKeywords(args, kwargs, "OUp:substitute", keywords, &pattern,
+                                     &text, &sandhi)) {
+        return NULL;
+    }
+    if (self->values == NULL) {
+        PyErr_SetString(PyExc_ValueError, "Transcoder.__init__() was not called");
+        return NULL;
+    }
+    if (PyUnicode_READY(text) < 0) {
+        return NULL;
+    }
+    kind = PyUnicode_KIND(text);
+    data = PyUnicode_DATA(text);
+
+    matches = PyObject_CallMethodObjArgs(pattern, str_finditer, text, NULL);
+    if (matches == NULL) {
+        return NULL;
+    }
+    output_init(&out);
+
+    while ((match = PyIter_Next(matches)) != NULL) {
+        Py_ssize_t start, end, word_start, word_end, stop_start, stop_end;
+        int status;
+        PyObject *regs = PyObject_GetAttr(match, str_regs);
+
+        Py_DECREF(match);
+        if (regs == NULL) {
+            goto error;
+        }
+        if (!PyArg_ParseTuple(regs, "(nn)(nn)(nn):substitute", &start, &end, &word_start,
+                              &word_end, &stop_start, &stop_end)) {
+            Py_DECREF(regs);
+            goto error;
+        }
+        Py_DECREF(regs);
+
+        if (output_range(&out, kind, data, last_end, start) < 0) {
+            goto error;
+        }
+        if (word_start == -1) {
+            status = output_str(&out, self->full_stop);
+        }
+        else {
+            status = transcode_word_into(self, &out, text, word_start, word_end, sandhi);
+            /* A word's transliteration always ends with a syllabic, so the
+             * full-stop that follows it is always converted. */
+            if (status == 0 && stop_start != -1 && stop_end > stop_start) {
+                status = output_str(&out, self->full_stop);
+            }
+        }
+        if (status < 0) {
+            goto error;
+        }
+        last_end = end;
+    }
+    if (PyErr_Occurred()) {
+        goto error;
+    }
+    Py_DECREF(matches);
+    if (output_range(&out, kind, data, last_end, PyUnicode_GET_LENGTH(text)) < 0) {
+        output_free(&out);
+        return NULL;
+    }
+    return output_finish(&out);
+
+error:
+    output_free(&out);
+    Py_DECREF(matches);
+    return NULL;
+}
+
+static PyMethodDef Transcoder_methods[] = {
+    {"transcode", (PyCFunction)(void (*)(void))Transcoder_transcode,
+     METH_VARARGS | METH_KEYWORDS,
+     "transcode(word, sandhi) -> str\n\n"
+     "Transcribe one word, already in lowercase with canonical vowels."},
+    {"substitute", (PyCFunction)(void (*)(void))Transcoder_substitute,
+     METH_VARARGS | METH_KEYWORDS,
+     "substitute(pattern, text, sandhi) -> str\n\n"
+     "Replace each word and full-stop matched by pattern with syllabics."},
+    {NULL, NULL, 0, NULL},
+};
+
+static PyTypeObject TranscoderType = {
+    PyVarObject_HEAD_INIT(NULL, 0)
+    .tp_name = "_cree_sro_syllabics.Transcoder",
+    .tp_doc = "Transcoder(lookup, syllables, sandhi_onsets, sandhi_vowels, alt_forms)\n\n"
+              "Transcribes SRO words to syllabics.",
+    .tp_basicsize = sizeof(TranscoderObject),
+    .tp_flags = Py_TPFLAGS_DEFAULT,
+    .tp_new = PyType_GenericNew,
+    .tp_init = (initproc)Transcoder_init,
+    .tp_dealloc = (destructor)Transcoder_dealloc,
+    .tp_methods = Transcoder_methods,
+};
+
+/* ------------------------------------------------------------------------
+ * Translator: translates syllabics to SRO, one character, or one sequence of
+ * two characters, at a time.
+ * ------------------------------------------------------------------------ */
+
+typedef struct {
+    PyObject_HEAD
+    Py_UCS4 first;             /* the smallest code point in the tables */
+    Py_ssize_t size;           /* how many code points the tables cover */
+    PyObject **values;         /* replacement for each code point, or NULL */
+    Py_UCS4 *value_max;        /* the largest code point in each value */
+    Py_UCS4 *second;           /* second character of a sequence, or 0 */
+    PyObject **sequences;      /* replacement for each sequence */
+    Py_UCS4 *sequence_max;     /* the largest code point in each sequence */
+} TranslatorObject;
+
+static void
+Translator_clear_tables(TranslatorObject *self)
+{
+    Py_ssize_t i;
+    for (i = 0; i < self->size; i++) {
+        if (self->values != NULL) {
+            Py_XDECREF(self->values[i]);
+        }
+        if (self->sequences != NULL) {
+            Py_XDECREF(self->sequences[i]);
+        }
+    }
+    PyMem_Free(self->values);
+    PyMem_Free(self->value_max);
+    PyMem_Free(self->second);
+    PyMem_Free(self->sequences);
+    PyMem_Free(self->sequence_max);
+    self->values = self->sequences = NULL;
+    self->value_max = self->second = self->sequence_max = NULL;
+    self->size = 0;
+}
+
+static void
+Translator_dealloc(TranslatorObject *self)
+{
+    Translator_clear_tables(self);
+    Py_TYPE(self)->tp_free((PyObject *)self);
+}
+
+static Py_UCS4
+max_char(PyObject *text)
+{
+    Py_ssize_t i, length = PyUnicode_GET_LENGTH(text);
+    Py_UCS4 largest = 0;
+    for (i = 0; i < length; i++) {
+        Py_UCS4 c = PyUnicode_READ_CHAR(text, i);
+        if (c > largest) {
+            largest = c;
+        }
+    }
+    return largest;
+}
+
+/* Converts a str.translate() table value to a str. */
+static PyObject *
+translation_value(PyObject *value)
+{
+    if (value == Py_None) {
+        Py_INCREF(str_empty);
+        return str_empty;
+    }
+    if (PyLong_Check(value)) {
+        long ordinal = PyLong_AsLong(value);
+        if (ordinal == -1 && PyErr_Occurred()) {
+            return NULL;
+        }
+        return PyUnicode_FromOrdinal((int)ordinal);
+    }
+    if (PyUnicode_Check(value)) {
+        if (PyUnicode_READY(value) < 0) {
+            return NULL;
+        }
+        Py_INCREF(value);
+        return value;
+    }
+    PyErr_SetString(PyExc_TypeError, "translation values must be str, int, or None");
+    return NULL;
+}
+
+static int
+Translator_init(TranslatorObject *self, PyObject *args, PyObject *kwargs)
+{
+    static char *keywords[] = {"translation", "sequences", NULL};
+    PyObject *translation, *sequences, *key, *value;
+    Py_ssize_t i;
+    Py_UCS4 first = 0x10FFFF, last = 0;
+
+    if (!PyArg_ParseTupleAndKeywords(args, kwargs, "O!O!:Translator", keywords,
+                                     &PyDict_Type, &translation,
+                                     &PyDict_Type, &sequences)) {
+        return -1;
+    }
+
+    /* Find the range of code points the tables must cover. */
+    i = 0;
+    while (PyDict_Next(translation, &i, &key, &value)) {
+        long ordinal = PyLong_Check(key) ? PyLong_AsLong(key) : -1;
+        if (ordinal < 0 || ordinal > 0x10FFFF) {
+            if (!PyErr_Occurred()) {
+                PyErr_SetString(PyExc_ValueError, "translation keys must be code points");
+            }
+            return -1;
+        }
+        first = (Py_UCS4)ordinal < first ? (Py_UCS4)ordinal : first;
+        last = (Py_UCS4)ordinal > last ? (Py_UCS4)ordinal : last;
+    }
+    i = 0;
+    while (PyDict_Next(sequences, &i, &key, &value)) {
+        Py_UCS4 c;
+        if (!PyUnicode_Check(key) || PyUnicode_READY(key) < 0 ||
+            PyUnicode_GET_LENGTH(key) != 2) {
+            if (!PyErr_Occurred()) {
+                PyErr_SetString(PyExc_ValueError, "sequences must have two characters");
+            }
+            return -1;
+        }
+        c = PyUnicode_READ_CHAR(key, 0);
+        first = c < first ? c : first;
+        last = c > last ? c : last;
+    }
+
+    Translator_clear_tables(self);
+    if (first > last) {
+        return 0;
+    }
+    self->first = first;
+    self->size = (Py_ssize_t)(last - first) + 1;
+    self->values = PyMem_Calloc(self->size, sizeof(PyObject *));
+    self->value_max = PyMem_Calloc(self->size, sizeof(Py_UCS4));
+    self->second = PyMem_Calloc(self->size, sizeof(Py_UCS4));
+    self->sequences = PyMem_Calloc(self->size, sizeof(PyObject *));
+    self->sequence_max = PyMem_Calloc(self->size, sizeof(Py_UCS4));
+    if (self->values == NULL || self->value_max == NULL || self->second == NULL ||
+        self->sequences == NULL || self->sequence_max == NULL) {
+        Translator_clear_tables(self);
+        PyErr_NoMemory();
+        return -1;
+    }
+
+    i = 0;
+    while (PyDict_Next(translation, &i, &key, &value)) {
+        Py_ssize_t index = PyLong_AsLong(key) - first;
+        PyObject *replacement = translation_value(value);
+        if (replacement == NULL) {
+            Translator_clear_tables(self);
+            return -1;
+        }
+        self->values[index] = replacement;
+        self->value_max[index] = max_char(replacement);
+    }
+    i = 0;
+    while (PyDict_Next(sequences, &i, &key, &value)) {
+        Py_ssize_t index = PyUnicode_READ_CHAR(key, 0) - first;
+        PyObject *replacement;
+        if (self->second[index] != 0) {
+            PyErr_SetString(PyExc_ValueError,
+                            "only one sequence may start with each character");
+            Translator_clear_tables(self);
+            return -1;
+        }
+        replacement = translation_value(value);
+        if (replacement == NULL) {
+            Translator_clear_tables(self);
+            return -1;
+        }
+        self->second[index] = PyUnicode_READ_CHAR(key, 1);
+        self->sequences[index] = replacement;
+        self->sequence_max[index] = max_char(replacement);
+    }
+    return 0;
+}
+
+/*
+ * The same as translate_sequences() (or str.translate(), when the text has
+ * no sequences) in cree_sro_syllabics.py.
+ */
+static PyObject *
+Translator_translate(TranslatorObject *self, PyObject *text)
+{
+    Py_ssize_t i, o, length, result_length = 0;
+    Py_UCS4 result_max = 0;
+    int kind, result_kind;
+    const void *data;
+    void *result_data;
+    PyObject *result;
+
+    if (!PyUnicode_Check(text)) {
+        PyErr_Format(PyExc_TypeError, "translate() argument must be str, not %.100s",
+                     Py_TYPE(text)->tp_name);
+        return NULL;
+    }
+    if (PyUnicode_READY(text) < 0) {
+        return NULL;
+    }
+    length = PyUnicode_GET_LENGTH(text);
+    kind = PyUnicode_KIND(text);
+    data = PyUnicode_DATA(text);
+
+    /* First, find the length and the largest character of the result... */
+    for (i = 0; i < length; i++) {
+        Py_UCS4 c = PyUnicode_READ(kind, data, i);
+        Py_ssize_t index = (Py_ssize_t)c - (Py_ssize_t)self->first;
+        if (0 <= index && index < self->size) {
+            if (self->second[index] != 0 && i + 1 < length &&
+                PyUnicode_READ(kind, data, i + 1) == self->second[index]) {
+                result_length += PyUnicode_GET_LENGTH(self->sequences[index]);
+                if (self->sequence_max[index] > result_max) {
+                    result_max = self->sequence_max[index];
+                }
+                i++;
+                continue;
+            }
+            if (self->values[index] != NULL) {
+                result_length += PyUnicode_GET_LENGTH(self->values[index]);
+                if (self->value_max[index] > result_max) {
+                    result_max = self->value_max[index];
+                }
+                continue;
+            }
+        }
+        result_length++;
+        if (c > result_max) {
+            result_max = c;
+        }
+    }
+
+    /* ...then write it. */
+    result = PyUnicode_New(result_length, result_max);
+    if (result == NULL) {
+        return NULL;
+    }
+    result_kind = PyUnicode_KIND(result);
+    result_data = PyUnicode_DATA(result);
+    for (i = 0, o = 0; i < length; i++) {
+        Py_UCS4 c = PyUnicode_READ(kind, data, i);
+        Py_ssize_t index = (Py_ssize_t)c - (Py_ssize_t)self->first;
+        PyObject *replacement = NULL;
+        if (0 <= index && index < self->size) {
+            if (self->second[index] != 0 && i + 1 < length &&
+                PyUnicode_READ(kind, data, i + 1) == self->second[index]) {
+                replacement = self->sequences[index];
+                i++;
+            }
+            else {
+                replacement = self->values[index];
+            }
+        }
+        if (replacement == NULL) {
+            PyUnicode_WRITE(result_kind, result_data, o, c);
+            o++;
+        }
+        else {
+            Py_ssize_t j, replacement_length = PyUnicode_GET_LENGTH(replacement);
+            int replacement_kind = PyUnicode_KIND(replacement);
+            const void *replacement_data = PyUnicode_DATA(replacement);
+            for (j = 0; j < replacement_length; j++) {
+                PyUnicode_WRITE(result_kind, result_data, o,
+                                PyUnicode_READ(replacement_kind, replacement_data, j));
+                o++;
+            }
+        }
+    }
+    return result;
+}
+
+static PyMethodDef Translator_methods[] = {
+    {"translate", (PyCFunction)Translator_translate, METH_O,
+     "translate(text) -> str\n\n"
+     "Translate each sequence and each character of text."},
+    {NULL, NULL, 0, NULL},
+};
+
+static PyTypeObject TranslatorType = {
+    PyVarObject_HEAD_INIT(NULL, 0)
+    .tp_name = "_cree_sro_syllabics.Translator",
+    .tp_doc = "Translator(translation, sequences)\n\n"
+              "Translates text with a str.translate() table, and a table of\n"
+              "two-character sequences that are translated together.",
+    .tp_basicsize = sizeof(TranslatorObject),
+    .tp_flags = Py_TPFLAGS_DEFAULT,
+    .tp_new = PyType_GenericNew,
+    .tp_init = (initproc)Translator_init,
+    .tp_dealloc = (destructor)Translator_dealloc,
+    .tp_methods = Translator_methods,
+};
+
+/* ------------------------------------------------------------------------ */
+
+static struct PyModuleDef module = {
+    PyModuleDef_HEAD_INIT,
+    .m_name = "_cree_sro_syllabics",
+    .m_doc = "Optional C accelerator for cree_sro_syllabics.",
+    .m_size = -1,
+};
+
+PyMODINIT_FUNC
+PyInit__cree_sro_syllabics(void)
+{
+    PyObject *m;
+
+    if ((str_finditer = PyUnicode_InternFromString("finditer")) == NULL ||
+        (str_regs = PyUnicode_InternFromString("regs")) == NULL ||
+        (str_lower = PyUnicode_InternFromString("lower")) == NULL ||
+        (str_translate = PyUnicode_InternFromString("translate")) == NULL ||
+        (str_empty = PyUnicode_FromString("")) == NULL) {
+        return NULL;
+    }
+    if (PyType_Ready(&TranscoderType) < 0 || PyType_Ready(&TranslatorType) < 0) {
+        return NULL;
+    }
+
+    m = PyModule_Create(&module);
+    if (m == NULL) {
+        return NULL;
+    }
+    Py_INCREF(&TranscoderType);
+    if (PyModule_AddObject(m, "Transcoder", (PyObject *)&TranscoderType) < 0) {
+        Py_DECREF(&TranscoderType);
+        Py_DECREF(m);
+        return NULL;
+    }
+    Py_INCREF(&TranslatorType);
+    if (PyModule_AddObject(m, "Translator", (PyObject *)&TranslatorType) < 0) {
+        Py_DECREF(&TranslatorType);
+        Py_DECREF(m);
+        return NULL;
+    }
+    return m;
+}
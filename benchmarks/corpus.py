@@ -0,0 +1,128 @@
+"""
+Generates deterministic, synthetic Cree text for benchmarking.
+
+The words are not real Cree words, but they are built from real SRO
+syllables, with roughly the same shape as real Cree words: some words are
+hyphenated compounds, some are subject to sandhi, and some end with the
+word-final 'hk'. The same seed always produces the same text.
+"""
+
+import random
+import sys
+import unicodedata
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from cree_sro_syllabics import SYLLABIC_WITH_DOT, sro2syllabics  # noqa: E402
+
+ONSETS = ["", "p", "t", "k", "c", "m", "n", "s", "y", "w", "th", "kw", "pw", "sw"]
+VOWELS = ["a", "i", "o", "ê", "â", "î", "ô"]
+CODAS = ["", "", "", "n", "s", "w", "y", "h", "hk", "st", "sk", "m"]
+PUNCTUATION = ["", "", "", "", "", ".", ",", "?"]
+
+ENGLISH = (
+    "the quick brown fox jumped over the lazy dog while everybody else "
+    "watched from the riverbank and laughed about the whole affair"
+).split()
+
+# None of these words could possibly be Cree words.
+NOT_CREE = (
+    "quick brown fox jumped lazy dog everybody watched riverbank laughed "
+    "about affair big dogs bark loudly during five grey days"
+).split()
+
+# The reverse of SYLLABIC_WITH_DOT: splits a 'w' syllabic into the syllabic
+# followed by <U+1427 CANADIAN SYLLABICS FINAL MIDDLE DOT>.
+DECOMPOSE_W_DOT = str.maketrans(
+    {with_dot: without_dot + "ᐧ" for without_dot, with_dot in SYLLABIC_WITH_DOT.items()}
+)
+
+
+def morpheme(rng):
+    # Only the first syllable can go without an onset; Cree does not allow
+    # two vowels in a row.
+    syllables = [rng.choice(ONSETS) + rng.choice(VOWELS)]
+    for _ in range(rng.randint(0, 3)):
+        syllables.append(rng.choice(ONSETS[1:]) + rng.choice(VOWELS))
+    return "".join(syllables) + rng.choice(CODAS)
+
+
+def word(rng):
+    parts = [morpheme(rng)]
+    # About one in five words is a hyphenated compound:
+    while rng.random() < 0.2:
+        if rng.random() < 0.3:
+            # Set up a sandhi context: consonant, hyphen, vowel.
+            parts[-1] += rng.choice("ptkcsh")
+            parts.append(rng.choice(VOWELS) + morpheme(rng))
+        else:
+            parts.append(morpheme(rng))
+    return "-".join(parts) + rng.choice(PUNCTUATION)
+
+
+def sro_text(size, seed=0):
+    """
+    Returns at least size characters of SRO text, in lines of a few words.
+    """
+    rng = random.Random(seed)
+    lines = []
+    length = 0
+    while length < size:
+        line = " ".join(word(rng) for _ in range(rng.randint(3, 15)))
+        lines.append(line)
+        length += len(line) + 1
+    return "\n".join(lines) + "\n"
+
+
+def decomposed_sro_text(size, seed=0):
+    """
+    Returns sro_text(), with all vowels written as ASCII vowels followed by
+    combining diacritical marks (i.e., in NFD normalization form).
+    """
+    return unicodedata.normalize("NFD", sro_text(size, seed))
+
+
+def mixed_text(size, seed=0):
+    """
+    Returns at least size characters of mostly English text, with the
+    occasional Cree word.
+    """
+    rng = random.Random(seed)
+    words = []
+    length = 0
+    while length < size:
+        token = word(rng) if rng.random() < 0.2 else rng.choice(ENGLISH)
+        words.append(token)
+        length += len(token) + 1
+    return " ".join(words) + "\n"
+
+
+def english_text(size, seed=0):
+    """
+    Returns at least size characters of English text, with no words that
+    could possibly be Cree words.
+    """
+    rng = random.Random(seed)
+    words = []
+    length = 0
+    while length < size:
+        token = rng.choice(NOT_CREE)
+        words.append(token)
+        length += len(token) + 1
+    return " ".join(words) + ".\n"
+
+
+def syllabics_text(size, seed=0):
+    """
+    Returns the syllabics transliteration of sro_text().
+    """
+    return sro2syllabics(sro_text(size, seed))
+
+
+def decomposed_syllabics_text(size, seed=0):
+    """
+    Returns syllabics_text(), with all 'w' syllabics written as the syllabic
+    followed by <U+1427 CANADIAN SYLLABICS FINAL MIDDLE DOT>.
+    """
+    return syllabics_text(size, seed).translate(DECOMPOSE_W_DOT)
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Compares converting syllabics to SRO in a single scan, using the table of
+multi-character sequences, against the previous two-pass approach: first
+replacing SYLLABIC + FINAL MIDDLE DOT with a regular expression, then
+translating character by character.
+
+Usage:
+
+    python benchmarks/final_dots.py [--size N] [--repeat N]
+"""
+
+import argparse
+import re
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import corpus  # noqa: E402
+
+from cree_sro_syllabics import (  # noqa: E402
+    SYLLABIC_WITH_DOT,
+    syllabics2sro,
+    syllabics2sro_tables,
+)
+
+# Matches SYLLABIC + FINAL MIDDLE DOT, for syllabics that have a 'w' variant.
+final_dot_pattern = re.compile("([{}])ᐧ".format("".join(SYLLABIC_WITH_DOT)))
+
+
+def fix_final_dot(match):
+    "Translate syllabic + FINAL MIDDLE DOT to syllabic with 'w'"
+    return SYLLABIC_WITH_DOT[match.group(1)]
+
+
+def two_passes(syllabics):
+    "The approach syllabics2sro() used before the sequence table."
+    tables = syllabics2sro_tables()
+    if "ᐧ" in syllabics:
+        syllabics = final_dot_pattern.sub(fix_final_dot, syllabics)
+    return syllabics.translate(tables.translation)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().split("\n")[0])
+    parser.add_argument(
+        "--size", type=int, default=500000, help="characters of text per benchmark"
+    )
+    parser.add_argument("--repeat", type=int, default=10, help="repetitions")
+    args = parser.parse_args()
+
+    texts = {
+        "composed (no ᐧ)": corpus.syllabics_text(args.size),
+        "decomposed (all 'w' with ᐧ)": corpus.decomposed_syllabics_text(args.size),
+    }
+    print("{:32} {:>10} {:>10} {:>8}".format("text", "two passes", "one scan", "ᐧ"))
+    for name, text in texts.items():
+        assert two_passes(text) == syllabics2sro(text)
+        # Alternate between the two, so both suffer the same noise.
+        before = after = float("inf")
+        for _ in range(args.repeat):
+            before = min(before, timeit.timeit(lambda: two_passes(text), number=1))
+            after = min(after, timeit.timeit(lambda: syllabics2sro(text), number=1))
+        print(
+            "{:32} {:8.2f}ms {:8.2f}ms {:8,}".format(
+                name, before * 1e3, after * 1e3, text.count("ᐧ")
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
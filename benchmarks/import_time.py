@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Measures how long it takes to import cree_sro_syllabics, and to convert the
+first text in each direction, in a fresh Python process.
+
+Usage:
+
+    python benchmarks/import_time.py [--repeat N]
+
+Each measurement runs in a new process, as a command-line tool or a cold
+serverless function would. The regular expressions and tables for each
+direction are built on first use, so the first conversion includes that
+cost.
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+MEASURE = """
+import time
+start = time.perf_counter()
+import cree_sro_syllabics
+imported = time.perf_counter()
+cree_sro_syllabics.syllabics2sro("ᑖᓂᓯ")
+first_syllabics2sro = time.perf_counter()
+cree_sro_syllabics.sro2syllabics("tânisi")
+first_sro2syllabics = time.perf_counter()
+print(imported - start, first_syllabics2sro - imported, first_sro2syllabics - first_syllabics2sro)
+"""
+
+COLUMNS = ("import", "first syllabics2sro", "first sro2syllabics")
+
+
+def measure_once():
+    "Returns the time, in seconds, of each column, in a fresh process"
+    # Allow writing bytecode, so that (after the first run) the module is
+    # loaded from __pycache__, as it would be when installed.
+    environment = dict(os.environ, PYTHONPATH=str(ROOT))
+    environment.pop("PYTHONDONTWRITEBYTECODE", None)
+    result = subprocess.run(
+        [sys.executable, "-c", MEASURE],
+        env=environment,
+        stdout=subprocess.PIPE,
+        check=True,
+    )
+    return [float(seconds) for seconds in result.stdout.split()]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().split("\n")[0])
+    parser.add_argument("--repeat", type=int, default=20, help="processes to start")
+    args = parser.parse_args()
+
+    # Warm up: compile the module to bytecode, and the OS's file cache.
+    measure_once()
+    best = [min(times) for times in zip(*(measure_once() for _ in range(args.repeat)))]
+
+    for name, seconds in zip(COLUMNS, best):
+        print("{:24} {:8.2f} ms".format(name, seconds * 1e3))
+
+
+if __name__ == "__main__":
+    main()
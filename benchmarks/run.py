@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Benchmarks conversion speed in both directions, with all option combinations.
+
+Usage:
+
+    python benchmarks/run.py                          # print results
+    python benchmarks/run.py --save baseline.json     # ...and save them
+    python benchmarks/run.py --compare baseline.json  # ...and flag slowdowns
+    python benchmarks/run.py --backend python         # without the C accelerator
+
+When comparing, exits with status 1 if any benchmark is slower than the
+baseline by more than the --threshold (default: 10%).
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import corpus  # noqa: E402
+
+import cree_sro_syllabics  # noqa: E402
+from cree_sro_syllabics import (  # noqa: E402
+    nfc,
+    sro2syllabics,
+    sro2syllabics_bytes,
+    syllabics2sro,
+    syllabics2sro_bytes,
+)
+
+NNBSP = "\N{NARROW NO-BREAK SPACE}"
+
+
+def benchmarks(size):
+    """
+    Yields (name, function, text) for every benchmark.
+    """
+    sro = corpus.sro_text(size)
+    decomposed_sro = corpus.decomposed_sro_text(size)
+    mixed = corpus.mixed_text(size)
+    english = corpus.english_text(size)
+    syllabics = corpus.syllabics_text(size)
+    decomposed = corpus.decomposed_syllabics_text(size)
+
+    for sandhi in (True, False):
+        for name, hyphens in (("nnbsp", NNBSP), ("empty", ""), ("space", " ")):
+            yield (
+                "sro2syllabics sandhi={} hyphens={}".format(sandhi, name),
+                lambda text, h=hyphens, s=sandhi: sro2syllabics(text, hyphens=h, sandhi=s),
+                sro,
+            )
+    yield "sro2syllabics mixed English/Cree", sro2syllabics, mixed
+    yield "sro2syllabics English only", sro2syllabics, english
+    yield "sro2syllabics decomposed", sro2syllabics, decomposed_sro
+    yield (
+        "sro2syllabics assume_nfc=True",
+        lambda text: sro2syllabics(text, assume_nfc=True),
+        sro,
+    )
+
+    yield "sro2syllabics_bytes", sro2syllabics_bytes, sro.encode("UTF-8")
+
+    # The cost of normalization alone, which sro2syllabics() pays on each call:
+    yield "normalize NFC ASCII", nfc, english
+    yield "normalize NFC already NFC", nfc, sro
+    yield "normalize NFC decomposed", nfc, decomposed_sro
+
+    for produce_macrons in (False, True):
+        for name, text in (("composed", syllabics), ("decomposed", decomposed)):
+            yield (
+                "syllabics2sro macrons={} {}".format(produce_macrons, name),
+                lambda text, m=produce_macrons: syllabics2sro(text, produce_macrons=m),
+                text,
+            )
+    yield "syllabics2sro_bytes", syllabics2sro_bytes, syllabics.encode("UTF-8")
+
+
+def measure(function, text, repeat):
+    """
+    Returns the best time, in seconds, to call function(text).
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function(text)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run(size, repeat):
+    results = {}
+    for name, function, text in benchmarks(size):
+        seconds = measure(function, text, repeat)
+        utf8 = text if isinstance(text, bytes) else text.encode("UTF-8")
+        results[name] = {
+            "seconds": seconds,
+            "words_per_second": len(text.split()) / seconds,
+            "megabytes_per_second": len(utf8) / seconds / 1e6,
+        }
+    return results
+
+
+def compare(results, baseline, threshold):
+    """
+    Prints a comparison of results against the baseline, and returns the
+    names of the benchmarks that became slower than the threshold allows.
+    """
+    slower = []
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        change = result["seconds"] / baseline[name]["seconds"] - 1
+        flag = ""
+        if change > threshold:
+            slower.append(name)
+            flag = "  <-- SLOWER"
+        print("{:48} {:+7.1%}{}".format(name, change, flag))
+    return slower
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().split("\n")[0])
+    parser.add_argument(
+        "--size", type=int, default=500000, help="characters of text per benchmark"
+    )
+    parser.add_argument("--repeat", type=int, default=5, help="repetitions per benchmark")
+    parser.add_argument("--save", type=Path, help="save results to this JSON file")
+    parser.add_argument(
+        "--compare", type=Path, help="compare results against this JSON file"
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.10,
+        help="fraction of slowdown to flag when comparing (default: 0.10)",
+    )
+    parser.add_argument(
+        "--backend",
+        choices=("auto", "python"),
+        default="auto",
+        help="use the C accelerator if it is built (auto), or never (python)",
+    )
+    args = parser.parse_args()
+
+    if args.backend == "python":
+        cree_sro_syllabics.accelerator = None
+    print(
+        "backend: {}".format("C" if cree_sro_syllabics.accelerator else "pure Python")
+    )
+    results = run(args.size, args.repeat)
+    print("{:48} {:>16} {:>10}".format("benchmark", "words/s", "MB/s"))
+    for name, result in results.items():
+        print(
+            "{:48} {:16,.0f} {:10.2f}".format(
+                name, result["words_per_second"], result["megabytes_per_second"]
+            )
+        )
+
+    if args.save:
+        args.save.write_text(json.dumps(results, indent=2, sort_keys=True) + "\n")
+
+    if args.compare:
+        print()
+        baseline = json.loads(args.compare.read_text())
+        if compare(results, baseline, args.threshold):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
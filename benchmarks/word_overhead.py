@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Measures the per-word overhead of transcribing short SRO words to syllabics.
+
+Usage:
+
+    python benchmarks/word_overhead.py
+
+Prints the average time spent transcribing one word, and the time spent
+preparing the look-up table for that word.
+"""
+
+import sys
+import timeit
+from collections import ChainMap
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from cree_sro_syllabics import (  # noqa: E402
+    DEFAULT_HYPHENS,
+    lookup_with_hyphen,
+    sro2syllabics_lookup,
+    transcode_sro_word_to_syllabics,
+)
+
+# Short words are the most common case, and where the overhead matters most.
+WORDS = ["ê", "kâ", "ôma", "awa", "mîna", "tânisi", "niya", "êkwa", "nipiy", "kîkway"]
+REPEAT = 5
+NUMBER = 20000
+
+
+def best_time_per_call(statement, number=NUMBER):
+    "Returns the best time, in nanoseconds, of one call of statement()"
+    best = min(timeit.repeat(statement, number=number, repeat=REPEAT))
+    return best / number * 1e9
+
+
+def transcribe_all_words():
+    for word in WORDS:
+        transcode_sro_word_to_syllabics(word, DEFAULT_HYPHENS, True)
+
+
+def main():
+    per_word = best_time_per_call(transcribe_all_words) / len(WORDS)
+    chain_map = best_time_per_call(
+        lambda: ChainMap({"-": DEFAULT_HYPHENS}, sro2syllabics_lookup)["ka"]
+    )
+    cached_table = best_time_per_call(lambda: lookup_with_hyphen(DEFAULT_HYPHENS)["ka"])
+
+    print("transcribe one word:        {:8.1f} ns".format(per_word))
+    print("ChainMap table + lookup:    {:8.1f} ns".format(chain_map))
+    print("cached table + lookup:      {:8.1f} ns".format(cached_table))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Builds the optional C accelerator, _cree_sro_syllabics.
+
+cree_sro_syllabics works without it; it is only faster with it. So, if the
+extension cannot be built (no C compiler, or not CPython), installation
+carries on with the pure-Python module.
+
+To build the extension in place, for development:
+
+    python build.py
+"""
+
+import sys
+
+from setuptools import Extension  # type: ignore
+from setuptools.command.build_ext import build_ext  # type: ignore
+
+extensions = [Extension("_cree_sro_syllabics", sources=["_cree_sro_syllabics.c"])]
+
+
+class OptionalBuildExt(build_ext):
+    """
+    Builds C extensions, but only warns when they cannot be built.
+    """
+
+    def run(self):
+        try:
+            super().run()
+        except Exception as error:  # e.g., no compiler at all
+            self.warn_skipped(error)
+
+    def build_extension(self, ext):
+        try:
+            super().build_extension(ext)
+        except Exception as error:  # e.g., compilation failed
+            self.warn_skipped(error)
+
+    def warn_skipped(self, error):
+        print(
+            "WARNING: could not build the C accelerator ({}); "
+            "using pure Python instead".format(error),
+            file=sys.stderr,
+        )
+
+
+def build(setup_kwargs):
+    """
+    Called by poetry to add the extension to the build.
+    """
+    if sys.implementation.name != "cpython":
+        return
+    setup_kwargs.update(
+        {"ext_modules": extensions, "cmdclass": {"build_ext": OptionalBuildExt}}
+    )
+
+
+if __name__ == "__main__":
+    from setuptools import setup  # type: ignore
+
+    setup(
+        name="cree_sro_syllabics",
+        ext_modules=extensions,
+        cmdclass={"build_ext": OptionalBuildExt},
+        script_args=["build_ext", "--inplace"],
+    )
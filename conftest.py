@@ -0,0 +1,5 @@
+import sys
+
+# The asyncio functions need Python 3.7 or later.
+if sys.version_info < (3, 7):
+    collect_ignore = ["cree_sro_syllabics_async.py", "tests/test_async.py"]
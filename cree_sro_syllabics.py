@@ -18,11 +18,81 @@
 # CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
 
 
+import io
+import os
 import re
-from collections import ChainMap
+import sys
+import time
+from collections import OrderedDict, deque, namedtuple
+from functools import lru_cache, partial
+from itertools import repeat
 from unicodedata import normalize
 
-__all__ = ["sro2syllabics", "syllabics2sro"]
+# Importing typing takes longer than importing the rest of this module, so it
+# is only imported by type checkers, and annotations that use it are strings.
+MYPY = False
+if MYPY:  # pragma: no cover
+    from typing import (
+        IO,
+        Any,
+        Callable,
+        Iterable,
+        Iterator,
+        List,
+        Optional,
+        Tuple,
+        Union,
+    )
+
+    # Anything that supports the buffer protocol, containing UTF-8.
+    BytesLike = Union[bytes, bytearray, memoryview]
+    PathLike = Union[str, "os.PathLike[Any]"]
+
+# The optional C accelerator (see build.py). Everything it does, this module
+# also does in pure Python, so it is only used if it has been built. PyPy is
+# faster with pure Python, so it is only used on CPython.
+try:
+    import _cree_sro_syllabics as accelerator
+except ImportError:  # pragma: no cover
+    accelerator = None
+if sys.implementation.name != "cpython":  # pragma: no cover
+    accelerator = None
+
+__all__ = [
+    "sro2syllabics",
+    "syllabics2sro",
+    "sro2syllabics_many",
+    "syllabics2sro_many",
+    "syllabics2sro_numpy",
+    "SroToSyllabics",
+    "SyllabicsToSro",
+    "IncrementalSroToSyllabics",
+    "TextEdit",
+    "find_sro_words",
+    "SroWord",
+    "sro2syllabics_bytes",
+    "syllabics2sro_bytes",
+    "sro2syllabics_column",
+    "syllabics2sro_column",
+    "sro2syllabics_parallel",
+    "syllabics2sro_parallel",
+    "sro2syllabics_stream",
+    "syllabics2sro_stream",
+    "sro2syllabics_file",
+    "syllabics2sro_file",
+    "enable_word_cache",
+    "disable_word_cache",
+    "clear_word_cache",
+    "word_cache_info",
+    "warm_word_cache",
+    "fast_path_info",
+    "reset_fast_path_info",
+    "enable_instrumentation",
+    "disable_instrumentation",
+    "reset_instrumentation",
+    "instrumentation_info",
+    "dump_instrumentation",
+]
 __version__ = "2021.7.26"
 
 
@@ -32,44 +102,6 @@ CONSONANT = "[ptkcshmnyw]|th"
 STRICT_VOWEL = "[êioaîôâ]"
 VOWEL = "{STRICT_VOWEL}|[eēī'’ōā]".format_map(globals())
 
-# Match an SRO syllable.
-sro_pattern = re.compile(
-    r"""
-    # A syllable that should be joined under the sandhi rule:
-    # We're setting this up so that the onset (consonant and optional w) can
-    # be glued together with the vowel. The parts are joined to
-    # form one syllable, even though the intervening hyphen indicates that
-    # they are in separate morphemes. That's sandhi!  See the front-matter in
-    # Arok Wolvengrey's dictionary for more information and examples.
-    #   Wolvengrey, Arok, ed. "ᓀᐦᐃᔭᐍᐏᐣ: ᐃᑗᐏᓇ / nēhiýawēwin: itwēwina/Cree:
-    #   Words". Canadian Plains Research Center, October 2001. pp. xvi–xviii.
-
-    ((?:{CONSONANT})w?)-({STRICT_VOWEL}) |
-
-    # Listing all of the syllables.
-    # NOTE: List the longer syllable first, since
-    # the regular expression will match the first alternative that will
-    # work—which must be the longest match!
-    thê|thi|tho|tha|thî|thô|thâ                            |th|
-    wê |wi |wo |wa |wî |wô |wâ                             |w |
-    pê |pi |po |pa |pî |pô |pâ |pwê|pwi|pwo|pwa|pwî|pwô|pwâ|p |
-    tê |ti |to |ta |tî |tô |tâ |twê|twi|two|twa|twî|twô|twâ|t |
-    kê |ki |ko |ka |kî |kô |kâ |kwê|kwi|kwo|kwa|kwî|kwô|kwâ|k |
-    cê |ci |co |ca |cî |cô |câ |cwê|cwi|cwo|cwa|cwî|cwô|cwâ|c |
-    mê |mi |mo |ma |mî |mô |mâ |mwê|mwi|mwo|mwa|mwî|mwô|mwâ|m |
-    nê |ni |no |na |nî |nô |nâ |nwê|nwa        |nwâ        |n |
-    sê |si |so |sa |sî |sô |sâ |swê|swi|swo|swa|swî|swô|swâ|s |
-    yê |yi |yo |ya |yî |yô |yâ |ywê|ywi|ywo|ywa|ywî|ywô|ywâ|y |
-    h|l|r|
-    ê|i|î|o|ô|a|â|
-    -
-""".format_map(
-        globals()
-    ),
-    re.VERBOSE,
-)
-
-
 # A complete SRO to syllabics look-up table.
 sro2syllabics_lookup = {
     "ê": "ᐁ",
@@ -217,6 +249,30 @@ sro2syllabics_lookup = {
     "hk": "ᕽ",
 }
 
+# The transcoder walks each word once, left to right, consuming the longest
+# syllable that it finds at each position. It can consume every entry in the
+# look-up table except for 'hk' (which is special-cased at the end of the
+# word), plus the hyphen. The longest syllable is three characters long.
+SRO_SYLLABLES = frozenset(sro2syllabics_lookup.keys() - {"hk"} | {"-"})
+SYLLABLE_LENGTHS = (3, 2, 1)
+
+# A syllable that should be joined under the sandhi rule:
+# We're setting this up so that the onset (consonant and optional w) can
+# be glued together with the vowel. The parts are joined to
+# form one syllable, even though the intervening hyphen indicates that
+# they are in separate morphemes. That's sandhi!  See the front-matter in
+# Arok Wolvengrey's dictionary for more information and examples.
+#   Wolvengrey, Arok, ed. "ᓀᐦᐃᔭᐍᐏᐣ: ᐃᑗᐏᓇ / nēhiýawēwin: itwēwina/Cree:
+#   Words". Canadian Plains Research Center, October 2001. pp. xvi–xviii.
+#
+# These are all the onsets that can precede the hyphen: any consonant
+# (matching CONSONANT), optionally followed by 'w'. The vowel following the
+# hyphen must match STRICT_VOWEL.
+SANDHI_ONSETS = frozenset(
+    consonant + w for consonant in "p t k c s h m n y w th".split() for w in ("", "w")
+)
+SANDHI_VOWELS = frozenset("êioaîôâ")
+
 
 # These regular expressions are intended to strictly match Cree words
 # We want to match *CREE* words, because we want to avoid accidentally
@@ -286,23 +342,116 @@ WORD = r"""
 """.format_map(
     globals()
 )
-word_pattern = re.compile(WORD, re.IGNORECASE | re.VERBOSE)
 
+# Converts Cree words, and full-stops, in a single pass over the text.
 # This regex prevents matching EVERY period, instead only matching periods
 # after Cree words, or, as an exception, as the only item in a string.
-full_stop_pattern = re.compile(
-    r"""
-    (?<=[\u1400-\u167f])[.] |   # Match a full-stop after syllabics
+WORD_OR_FULL_STOP = r"""
+    ({WORD}) ([.])? |           # Match a Cree word, and its full-stop (if any)
+    (?<=[\u1400-\u167f])[.] |   # or match a full-stop after syllabics
     \A[.]\Z                     # or match as the only item.
-""",
-    re.VERBOSE,
+""".format(
+    WORD=WORD
+)
+
+# Matches full-stops after syllabics in a word's transliteration, which only
+# happens when the hyphens are replaced with full-stops.
+SYLLABIC_FULL_STOP = r"(?<=[\u1400-\u167f])[.]"
+
+# After classifying letters (see build_letter_classes()), turns every other
+# character into a space, and deletes the Cree consonants: what is left of a
+# Cree word is a run of "v".
+ONLY_CLASSES = bytes(
+    byte if byte in b"vxs" else ord(" ") for byte in range(256)
 )
 
+SroToSyllabicsTables = namedtuple(
+    "SroToSyllabicsTables",
+    "word_pattern word_or_full_stop_pattern syllabic_full_stop_pattern "
+    "letter_classes only_vowels_pattern",
+)
+
+
+@lru_cache(maxsize=None)
+def sro2syllabics_tables() -> SroToSyllabicsTables:
+    """
+    Return the regular expressions and tables used to convert SRO to
+    syllabics. They are built on first use, so that importing this module is
+    quick, and converting syllabics to SRO never builds them.
+    """
+    return SroToSyllabicsTables(
+        word_pattern=re.compile(WORD, re.IGNORECASE | re.VERBOSE),
+        word_or_full_stop_pattern=re.compile(
+            WORD_OR_FULL_STOP, re.IGNORECASE | re.VERBOSE
+        ),
+        syllabic_full_stop_pattern=re.compile(SYLLABIC_FULL_STOP),
+        letter_classes=build_letter_classes(),
+        only_vowels_pattern=re.compile(rb" v+ "),
+    )
+
+
+def build_letter_classes() -> dict:
+    """
+    Return the translation table that classifies letters for
+    could_contain_cree().
+
+    Every Cree word starts with a run of letters that are all letters used in
+    Cree words, including at least one vowel. To find such runs quickly,
+    every letter is classified: Cree vowels become "v", Cree consonants
+    become "c", and letters that are never used in Cree words become "x".
+    Syllabics become "s".
+    """
+    letter_classes = {}
+    for letters, letter_class in (
+        # NOTE: with re.IGNORECASE, the word pattern also considers 'İ' and
+        # 'ı' to be 'i', 'ſ' to be 's', and KELVIN SIGN to be 'k'.
+        ("êioaîôâeēī'’ōāİı", "v"),
+        ("ptkcmnsyhwrlſ\N{KELVIN SIGN}", "c"),
+        ("bdfgjquvxz", "x"),
+    ):
+        for letter in letters:
+            for variant in (letter, letter.upper()):
+                # Only include variants that the word pattern considers to be
+                # letters.
+                if re.match(r"(?i)[a-zêioaîôâeēī'’ōā]\Z", variant):
+                    letter_classes[ord(variant)] = letter_class
+    letter_classes.update(dict.fromkeys(range(0x1400, 0x1680), "s"))
+    return letter_classes
+
+
+def could_contain_cree(text: str) -> bool:
+    """
+    Return False only if sro2syllabics() would certainly leave the
+    NFC-normalized text unchanged.
+
+    >>> could_contain_cree('Big dogs bark!')
+    False
+    >>> could_contain_cree('Big dogs bark at the moon!')
+    True
+    """
+    if text == ".":
+        return True
+    tables = sro2syllabics_tables()
+    classes = (
+        text.translate(tables.letter_classes)
+        .encode("ascii", "replace")
+        .translate(ONLY_CLASSES, b"c")
+    )
+    return b"s" in classes or (
+        tables.only_vowels_pattern.search(b" " + classes + b" ") is not None
+    )
+
+
 # Converts macron and alternate forms of vowels into "canonical" forms.
 TRANSLATE_ALT_FORMS = str.maketrans("eē'’īōā", "êêiiîôâ")
 
 
-def sro2syllabics(sro: str, hyphens: str = DEFAULT_HYPHENS, sandhi: bool = True) -> str:
+def sro2syllabics(
+    sro: str,
+    hyphens: str = DEFAULT_HYPHENS,
+    sandhi: bool = True,
+    assume_nfc: bool = False,
+) -> str:
     r"""
     Convert Cree words written in SRO text to syllabics.
 
@@ -439,22 +588,296 @@ def sro2syllabics(sro: str, hyphens: str = DEFAULT_HYPHENS, sandhi: bool = True)
     >>> sro2syllabics('pîhc-âyihk', sandhi=False)
     'ᐲᐦᐨ ᐋᔨᕽ'
 
+    Normalization
+    -------------
+
+    SRO may be written with combining diacritical marks (e.g., ``a`` followed
+    by <U+0302 COMBINING CIRCUMFLEX ACCENT>) instead of pre-composed
+    characters (e.g., ``â``), so the text is first converted to *NFC
+    normalization form*:
+
+    >>> sro2syllabics('ta\u0302nisi')
+    'ᑖᓂᓯ'
+
+    This is cheap for text that is already normalized, but if you can
+    guarantee that the text is in NFC (or pure ASCII), set
+    ``assume_nfc=True`` to skip normalization entirely.
+
     :param str sro: the text with Cree words written in SRO.
     :param str hyphens: what to replace hyphens with
                         (default: ``<U+202F NARROW NO-BREAK SPACE>``).
     :param bool sandhi: whether to apply sandhi orthography rule (default:
                         ``True``).
+    :param bool assume_nfc: whether the text is known to be NFC-normalized
+                            already (default: ``False``).
     :return: the text with Cree words written in syllabics.
     :rtype: str
     """
 
-    def transliterate_word(match) -> str:
-        return transcode_sro_word_to_syllabics(match.group(0), hyphens, sandhi)
+    return sro2syllabics_converters[hyphens, sandhi, assume_nfc].convert(sro)
+
+
+def sro2syllabics_many(
+    texts: "Iterable[str]",
+    hyphens: str = DEFAULT_HYPHENS,
+    sandhi: bool = True,
+    assume_nfc: bool = False,
+) -> "Iterator[str]":
+    r"""
+    Convert many SRO texts to syllabics, one after the other.
+
+    This is equivalent to calling :py:func:`sro2syllabics` on each text,
+    however the set-up is done only once for the entire batch, making it
+    faster for converting lots of short texts (e.g., rows in a database):
+
+    >>> list(sro2syllabics_many(['tânisi', 'Eddie nitisiyihkâson.', 'kâ-mâci-']))
+    ['ᑖᓂᓯ', 'Eddie ᓂᑎᓯᔨᐦᑳᓱᐣ᙮', 'ᑳ\u202fᒫᒋ-']
+
+    Results are produced lazily, so ``texts`` may be any iterable, even one
+    that is too large to fit in memory.
+
+    :param texts: an iterable of texts with Cree words written in SRO.
+    :param str hyphens: what to replace hyphens with
+                        (default: ``<U+202F NARROW NO-BREAK SPACE>``).
+    :param bool sandhi: whether to apply sandhi orthography rule (default:
+                        ``True``).
+    :param bool assume_nfc: whether the texts are known to be NFC-normalized
+                            already (default: ``False``).
+    :return: an iterator of texts with Cree words written in syllabics.
+    """
+
+    return sro2syllabics_converters[hyphens, sandhi, assume_nfc].many(texts)
+
+
+class SroToSyllabics:
+    r"""
+    Converts SRO to syllabics, always with the same options.
+
+    Calling a converter is the same as calling :py:func:`sro2syllabics` with
+    its options, however everything that depends on the options is set up
+    only once, when the converter is created:
+
+    >>> convert = SroToSyllabics(hyphens='', sandhi=False)
+    >>> convert('pîhc-âyihk')
+    'ᐲᐦᐨᐋᔨᕽ'
+    >>> list(convert.many(['tânisi', 'kâ-mahihkani-pimohtêt.']))
+    ['ᑖᓂᓯ', 'ᑳᒪᐦᐃᐦᑲᓂᐱᒧᐦᑌᐟ᙮']
+
+    Converters can be pickled, so they can be sent to worker processes.
+
+    :param str hyphens: what to replace hyphens with
+                        (default: ``<U+202F NARROW NO-BREAK SPACE>``).
+    :param bool sandhi: whether to apply sandhi orthography rule (default:
+                        ``True``).
+    :param bool assume_nfc: whether texts are known to be NFC-normalized
+                            already (default: ``False``).
+    """
+
+    __slots__ = (
+        "_hyphens",
+        "_sandhi",
+        "_assume_nfc",
+        "_pattern",
+        "_transliterate",
+        "_accelerable",
+        "_transcoder",
+    )
+
+    def __init__(
+        self, hyphens: str = DEFAULT_HYPHENS, sandhi: bool = True, assume_nfc: bool = False
+    ) -> None:
+        self._hyphens = hyphens
+        self._sandhi = sandhi
+        self._assume_nfc = assume_nfc
+        self._pattern = sro2syllabics_tables().word_or_full_stop_pattern
+        self._transliterate = word_and_full_stop_transliterator(hyphens, sandhi)
+        # The C accelerator cannot convert full-stops within the hyphens. Its
+        # transcoder is only created once it is used.
+        self._accelerable = "." not in hyphens
+        self._transcoder = None  # type: Any
+
+    @property
+    def hyphens(self) -> str:
+        "What hyphens are replaced with."
+        return self._hyphens
+
+    @property
+    def sandhi(self) -> bool:
+        "Whether the sandhi orthography rule is applied."
+        return self._sandhi
+
+    @property
+    def assume_nfc(self) -> bool:
+        "Whether texts are assumed to be NFC-normalized already."
+        return self._assume_nfc
+
+    def convert(self, sro: str) -> str:
+        """
+        Convert Cree words written in SRO text to syllabics. Calling the
+        converter itself does the same thing.
+        """
+        global fast_path_skipped, fast_path_converted
+
+        if instrumentation is not None:
+            return instrumented_sro2syllabics(
+                sro, self._hyphens, self._sandhi, self._assume_nfc
+            )
+
+        normalized = sro if self._assume_nfc else nfc(sro)
+        if not could_contain_cree(normalized):
+            # There's nothing to convert!
+            fast_path_skipped += 1
+            return normalized
+        fast_path_converted += 1
+        return self._substitute(normalized)
+
+    def many(self, texts: "Iterable[str]") -> "Iterator[str]":
+        """
+        Convert many SRO texts to syllabics, one after the other. Results are
+        produced lazily.
+        """
+        return map(self.convert, texts)
+
+    def _substitute(self, normalized: str) -> str:
+        # Replace each Cree word with its syllabics transliteration, and Latin
+        # full-stops with syllabics full-stops.
+        if self._accelerable and accelerator is not None and word_cache is None:
+            transcoder = self._transcoder
+            if transcoder is None:
+                transcoder = self._transcoder = accelerated_transcoder(self._hyphens)
+            return transcoder.substitute(self._pattern, normalized, self._sandhi)
+        return self._pattern.sub(self._transliterate, normalized)
+
+    # Calling the converter is the same as calling convert(), although
+    # convert() is a little faster to call.
+    __call__ = convert
+
+    def __reduce__(self) -> tuple:
+        # Only the options are pickled; everything else is set up again.
+        return (SroToSyllabics, (self._hyphens, self._sandhi, self._assume_nfc))
+
+    def __repr__(self) -> str:
+        return "SroToSyllabics(hyphens={!r}, sandhi={!r}, assume_nfc={!r})".format(
+            self._hyphens, self._sandhi, self._assume_nfc
+        )
+
+
+class ConverterCache(dict):
+    """
+    The converters used by the module-level functions, for each combination
+    of options, created on first use. Looking one up is a single dict look-up,
+    which matters when converting short texts. Only a few are kept.
+    """
+
+    def __init__(self, converter_class: type, maxsize: int = 32) -> None:
+        super().__init__()
+        self.converter_class = converter_class
+        self.maxsize = maxsize
+
+    def __missing__(self, options: tuple) -> "Any":
+        if len(self) >= self.maxsize:
+            self.clear()
+        converter = self[options] = self.converter_class(*options)
+        return converter
 
-    # Replace each Cree word with its syllabics transliteration.
-    transliteration = word_pattern.sub(transliterate_word, nfc(sro))
-    # Replace Latin full-stops with syllabics full-stops.
-    return full_stop_pattern.sub("\u166E", transliteration)
+
+sro2syllabics_converters = ConverterCache(SroToSyllabics)
+
+
+def word_and_full_stop_transliterator(
+    hyphens: str, sandhi: bool
+) -> "Callable[..., str]":
+    """
+    Returns a function that transliterates matches of
+    word_or_full_stop_pattern: either a Cree word, perhaps followed by a
+    full-stop, or a full-stop on its own.
+    """
+    hyphens_contain_full_stops = "." in hyphens
+    syllabic_full_stop_pattern = sro2syllabics_tables().syllabic_full_stop_pattern
+
+    def transliterate(match) -> str:
+        word, full_stop = match.groups()
+        if word is None:
+            return "\u166E"
+        syllabics = transcode_sro_word_to_syllabics(word, hyphens, sandhi)
+        if hyphens_contain_full_stops:
+            syllabics = syllabic_full_stop_pattern.sub("\u166E", syllabics)
+        # A word's transliteration always ends with a syllabic, so the
+        # full-stop that follows it is always converted.
+        if full_stop:
+            return syllabics + "\u166E"
+        return syllabics
+
+    return transliterate
+
+
+def find_sro_words(
+    sro: str, hyphens: str = DEFAULT_HYPHENS, sandhi: bool = True
+) -> "Iterator[SroWord]":
+    """
+    Find the Cree words written in SRO in a text, without converting them.
+
+    Yields an :py:class:`SroWord` for each word, in order. Each word's
+    syllabics are only computed if you ask for them:
+
+    >>> for word in find_sro_words('Eddie nitisiyihkâson. kâ-mâci-'):
+    ...     print(word.start, word.end, word.sro, word.syllabics)
+    6 20 nitisiyihkâson ᓂᑎᓯᔨᐦᑳᓱᐣ
+    22 29 kâ-mâci ᑳ\u202fᒫᒋ
+
+    Words may also be unpacked as ``(start, end, sro, syllabics)``. The
+    offsets are indices into the NFC-normalized text, which is the text
+    itself, unless it contains combining diacritical marks.
+
+    :param str sro: the text with Cree words written in SRO.
+    :param str hyphens: what to replace hyphens with in the syllabics
+                        (default: ``<U+202F NARROW NO-BREAK SPACE>``).
+    :param bool sandhi: whether to apply sandhi orthography rule (default:
+                        ``True``).
+    :return: an iterator of :py:class:`SroWord`.
+    """
+    normalized = nfc(sro)
+    if not could_contain_cree(normalized):
+        return
+    for match in sro2syllabics_tables().word_pattern.finditer(normalized):
+        yield SroWord(match.start(), match.end(), match.group(0), hyphens, sandhi)
+
+
+class SroWord:
+    """
+    A Cree word written in SRO, found by :py:func:`find_sro_words`.
+
+    ``start`` and ``end`` are the word's position in the (NFC-normalized)
+    text, and ``sro`` is the word itself. ``syllabics`` is computed the first
+    time it is used.
+    """
+
+    __slots__ = ("start", "end", "sro", "_hyphens", "_sandhi", "_syllabics")
+
+    def __init__(self, start: int, end: int, sro: str, hyphens: str, sandhi: bool):
+        self.start = start
+        self.end = end
+        self.sro = sro
+        self._hyphens = hyphens
+        self._sandhi = sandhi
+        self._syllabics = None  # type: Optional[str]
+
+    @property
+    def syllabics(self) -> str:
+        "The word, transliterated to syllabics."
+        if self._syllabics is None:
+            self._syllabics = transcode_sro_word_to_syllabics(
+                self.sro, self._hyphens, self._sandhi
+            )
+        return self._syllabics
+
+    def __iter__(self) -> "Iterator[Any]":
+        return iter((self.start, self.end, self.sro, self.syllabics))
+
+    def __repr__(self) -> str:
+        return "SroWord(start={!r}, end={!r}, sro={!r})".format(
+            self.start, self.end, self.sro
+        )
 
 
 def transcode_sro_word_to_syllabics(sro_word: str, hyphen: str, sandhi: bool) -> str:
@@ -464,15 +887,49 @@ def transcode_sro_word_to_syllabics(sro_word: str, hyphen: str, sandhi: bool) ->
 
     to_transcribe = sro_word.lower().translate(TRANSLATE_ALT_FORMS)
 
-    # Augment the lookup table with an entry for «-» so that we can replace
-    # all instances of '-' easily.
-    lookup = ChainMap({"-": hyphen}, sro2syllabics_lookup)
+    cache = word_cache
+    if cache is None:
+        return transcode_syllables(to_transcribe, hyphen, sandhi)
+
+    key = (to_transcribe, hyphen, sandhi)
+    syllabics = cache.get(key)
+    if syllabics is None:
+        syllabics = transcode_syllables(to_transcribe, hyphen, sandhi)
+        cache.put(key, syllabics)
+    return syllabics
+
+
+def transcode_syllables(to_transcribe: str, hyphen: str, sandhi: bool) -> str:
+    """
+    Transcribes one word, already in lowercase with canonical vowels.
+    """
+
+    if accelerator is not None:
+        return accelerated_transcoder(hyphen).transcode(to_transcribe, sandhi)
+
+    lookup = lookup_with_hyphen(hyphen)
 
     parts = []
 
-    match = sro_pattern.match(to_transcribe)
-    while match:
-        onset, vowel = match.groups()
+    pos = 0
+    end = len(to_transcribe)
+    # Sandhi onsets can only occur right before a hyphen, so keep track of
+    # where the next one is.
+    hyphen_pos = to_transcribe.find("-")
+    while pos < end:
+        onset = None
+        if hyphen_pos != -1:
+            if hyphen_pos < pos:
+                hyphen_pos = to_transcribe.find("-", pos)
+            # Look for an onset immediately followed by «-» and a vowel.
+            if (
+                0 < hyphen_pos - pos <= 3
+                and to_transcribe[hyphen_pos + 1 : hyphen_pos + 2] in SANDHI_VOWELS
+                and to_transcribe[pos:hyphen_pos] in SANDHI_ONSETS
+            ):
+                onset = to_transcribe[pos:hyphen_pos]
+                vowel = to_transcribe[hyphen_pos + 1]
+
         if sandhi and onset is not None:
             if onset.startswith("h"):
                 # Special case for /hw?-V/ sandhi case:
@@ -480,27 +937,31 @@ def transcode_sro_word_to_syllabics(sro_word: str, hyphen: str, sandhi: bool) ->
                 parts.append("ᐦ")
                 onset = onset[1:]
             # Apply sandhi rule
-            assert vowel is not None
             syllable = onset + vowel
-            next_syllable_pos = match.end()
+            next_syllable_pos = hyphen_pos + 2
         elif onset is not None:
             # Not Sandhi -- let's consume the onset (consonant)
             # Do NOT consume the labialized w!
             syllable = "w" if onset == "w" else onset.rstrip("w")
             # Skip the first consonant.
-            next_syllable_pos = len(syllable)
+            next_syllable_pos = pos + len(syllable)
             assert syllable in CONSONANT
         else:
-            syllable = match.group(0)
-            next_syllable_pos = match.end()
+            # Find the longest syllable starting at this position.
+            for length in SYLLABLE_LENGTHS:
+                syllable = to_transcribe[pos : pos + length]
+                if syllable in SRO_SYLLABLES:
+                    break
+            else:
+                # Nothing here can be transcribed.
+                break
+            next_syllable_pos = pos + len(syllable)
 
         # Get the syllabic
         syllabic = lookup[syllable]
         parts.append(syllabic)
 
-        # Chop off transcribed part
-        to_transcribe = to_transcribe[next_syllable_pos:]
-        match = sro_pattern.match(to_transcribe)
+        pos = next_syllable_pos
 
     # Special-case word-final 'hk': we did not convert it in the above loop,
     # because it can only happen at the end of words, and if we did convert it
@@ -510,45 +971,701 @@ def transcode_sro_word_to_syllabics(sro_word: str, hyphen: str, sandhi: bool) ->
     if parts[-2:] == ["ᐦ", "ᐠ"]:
         parts[-2:] = [sro2syllabics_lookup["hk"]]
 
-    assert to_transcribe == "", "could not transcribe %r" % (to_transcribe)
+    assert pos == end, "could not transcribe %r" % (to_transcribe[pos:])
     return "".join(parts)
 
 
-def nfc(text):
+@lru_cache(maxsize=32)
+def lookup_with_hyphen(hyphen: str) -> dict:
     """
-    Return NFC-normalized text.
+    Return the SRO to syllabics look-up table, augmented with an entry for
+    «-» so that we can replace all instances of '-' easily.
+
+    The tables are cached, since the same few hyphens are used over and over
+    again.
     """
-    return normalize("NFC", text)
+    lookup = dict(sro2syllabics_lookup)
+    lookup["-"] = hyphen
+    return lookup
+
+
+@lru_cache(maxsize=32)
+def accelerated_transcoder(hyphen: str) -> "Any":
+    """
+    Return the C accelerator's equivalent of transcode_syllables() and
+    word_and_full_stop_transliterator(), for the given hyphen.
+    """
+    assert accelerator is not None
+    return accelerator.Transcoder(
+        lookup_with_hyphen(hyphen),
+        SRO_SYLLABLES,
+        SANDHI_ONSETS,
+        SANDHI_VOWELS,
+        TRANSLATE_ALT_FORMS,
+    )
+
+
+class CacheInfo(namedtuple("CacheInfo", "hits misses evictions maxsize currsize")):
+    """
+    Statistics for the word cache: see :py:func:`word_cache_info`.
+    """
+
+    __slots__ = ()
+
+    @property
+    def hit_rate(self) -> float:
+        "The fraction of look-ups that found the word in the cache."
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class WordCache:
+    """
+    A size-bounded cache of words transcribed to syllabics. When the cache is
+    full, the least recently used word is evicted.
+    """
+
+    def __init__(self, maxsize: int) -> None:
+        from threading import Lock
+
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1; got %r" % (maxsize,))
+        self.maxsize = maxsize
+        self._entries = OrderedDict()  # type: OrderedDict
+        self._lock = Lock()
+        self.hits = self.misses = self.evictions = 0
+
+    def get(self, key):
+        """
+        Return the cached syllabics for this key, or None if it is not cached.
+        """
+        with self._lock:
+            try:
+                self._entries.move_to_end(key)
+            except KeyError:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return self._entries[key]
+
+    def put(self, key, syllabics: str) -> None:
+        """
+        Cache the syllabics for this key, evicting the least recently used
+        entry if the cache is full.
+        """
+        with self._lock:
+            self._add(key, syllabics)
+
+    def _add(self, key, syllabics: str) -> None:
+        # Must be called with the lock held.
+        self._entries[key] = syllabics
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self) -> None:
+        """
+        Remove all entries, and reset the statistics.
+        """
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def info(self) -> CacheInfo:
+        return CacheInfo(
+            self.hits, self.misses, self.evictions, self.maxsize, len(self._entries)
+        )
+
+    def close(self) -> None:
+        """
+        Called when the cache is replaced or disabled.
+        """
+
+
+# Words converted for the first time are written to the database of a
+# persistent word cache in batches of this many.
+PERSISTENT_CACHE_BATCH_SIZE = 1024
+
+# os.fspath() is new in Python 3.6; before then, str() of a path is its path.
+fspath = getattr(os, "fspath", str)
+
+
+class PersistentWordCache(WordCache):
+    """
+    A word cache that is also stored in an SQLite database, so that it can be
+    shared by many processes, and outlive them. Words that are not in memory
+    are looked up in the database, and words converted for the first time are
+    added to the database in batches.
+    """
+
+    def __init__(self, maxsize: int, path: "PathLike") -> None:
+        # Unlike atexit, this also runs when a worker process of
+        # multiprocessing or concurrent.futures exits.
+        from multiprocessing.util import Finalize
+        from threading import Lock
+
+        super().__init__(maxsize)
+        self.path = fspath(path)
+        self._pending = []  # type: list
+        self._connection = None  # type: Any
+        self._pid = None  # type: Optional[int]
+        # Guards the connection, so that converting threads only wait for the
+        # database when they need it, and never while holding self._lock.
+        self._database_lock = Lock()
+        with self._database_lock:
+            self._connect()
+        self._finalizer = Finalize(self, self.close, exitpriority=10)
+
+    def get(self, key):
+        """
+        Return the cached syllabics for this key, looking in the database if
+        it is not in memory, or None if it is not cached at all.
+        """
+        with self._lock:
+            try:
+                self._entries.move_to_end(key)
+            except KeyError:
+                pass
+            else:
+                self.hits += 1
+                return self._entries[key]
+
+        word, hyphens, sandhi = key
+        with self._database_lock:
+            row = self._connect().execute(
+                "SELECT syllabics FROM words WHERE word = ? AND hyphens = ? AND sandhi = ?",
+                (word, hyphens, bool(sandhi)),
+            ).fetchone()
+
+        with self._lock:
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._add(key, row[0])
+        return row[0]
+
+    def _connect(self) -> "Any":
+        # Must be called with the database lock held.
+        # SQLite connections must not be used by a child process, so a process
+        # forked with this cache enabled opens its own connection.
+        if self._connection is None or self._pid != os.getpid():
+            self._connection = open_word_database(self.path)
+            self._pid = os.getpid()
+        return self._connection
+
+    def put(self, key, syllabics: str) -> None:
+        word, hyphens, sandhi = key
+        with self._lock:
+            self._add(key, syllabics)
+            self._pending.append((word, hyphens, bool(sandhi), syllabics))
+            if len(self._pending) < PERSISTENT_CACHE_BATCH_SIZE:
+                return
+        self.flush()
+
+    def flush(self) -> None:
+        """
+        Write words converted for the first time to the database.
+        """
+        # Take the pending words, so that other threads can carry on
+        # converting while they are written.
+        with self._lock:
+            rows, self._pending = self._pending, []
+        if rows:
+            with self._database_lock:
+                store_words(self._connect(), rows)
+
+    def clear(self) -> None:
+        """
+        Remove all entries, from the database as well, and reset the
+        statistics.
+        """
+        super().clear()
+        with self._lock:
+            self._pending = []
+        with self._database_lock:
+            with self._connect() as connection:
+                connection.execute("DELETE FROM words")
+
+    def close(self) -> None:
+        """
+        Write any remaining words to the database, and close it.
+        """
+        self._finalizer.cancel()
+        with self._lock:
+            rows, self._pending = self._pending, []
+        with self._database_lock:
+            if self._connection is None:
+                return
+            if self._pid == os.getpid():
+                if rows:
+                    store_words(self._connection, rows)
+                self._connection.close()
+            self._connection = None
+
+
+def open_word_database(path: str) -> "Any":
+    """
+    Open the SQLite database of a persistent word cache, creating it if
+    necessary. Words converted by a different version of this module are
+    discarded, since they might have been converted differently.
+    """
+    import sqlite3
+
+    connection = sqlite3.connect(path, timeout=60, check_same_thread=False)
+    try:
+        # Lets processes read the database while another process writes to it.
+        connection.execute("PRAGMA journal_mode=WAL")
+        with connection:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS metadata (key TEXT PRIMARY KEY, value TEXT)"
+            )
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS words ("
+                "word TEXT, hyphens TEXT, sandhi INTEGER, syllabics TEXT, "
+                "PRIMARY KEY (word, hyphens, sandhi)) WITHOUT ROWID"
+            )
+            row = connection.execute(
+                "SELECT value FROM metadata WHERE key = 'version'"
+            ).fetchone()
+            if row is None or row[0] != __version__:
+                connection.execute("DELETE FROM words")
+                connection.execute(
+                    "INSERT OR REPLACE INTO metadata VALUES ('version', ?)", (__version__,)
+                )
+    except BaseException:
+        connection.close()
+        raise
+    return connection
+
+
+def store_words(connection: "Any", rows: "Iterable[tuple]") -> None:
+    """
+    Add (word, hyphens, sandhi, syllabics) rows to the database of a
+    persistent word cache, keeping any rows that are already there.
+    """
+    with connection:
+        connection.executemany("INSERT OR IGNORE INTO words VALUES (?, ?, ?, ?)", rows)
 
 
-# Derive the Syllabics -> SRO lookup table from the SRO -> Syllabics table.
-syllabics2sro_lookup = {syl: sro for sro, syl in sro2syllabics_lookup.items()}
-# Initially, no syllabics should map to an SRO string more than once
-# (hence, the two tables should have an equal amount of entries).
-assert len(syllabics2sro_lookup) == len(sro2syllabics_lookup)
-# Add alternate and "look-alike" forms:
-syllabics2sro_lookup.update(
-    {
-        # Some communities use the ᐝ symbol instead of ᐩ for the y-final.
-        # See:
-        # https://en.wikipedia.org/w/index.php?title=Plains_Cree&oldid=848160114#Canadian_aboriginal_syllabics
-        # for an explanation of this special y-final.
-        "\N{CANADIAN SYLLABICS Y-CREE W}": "y",
-        # Convert ᙮ into a Latin full-stop.
-        "\N{CANADIAN SYLLABICS FULL STOP}": ".",
-        # Look-alikes characters:
-        "\N{CANADIAN SYLLABICS T}": "m",  # ᑦ looks like ᒼ or "m"
-        "\N{CANADIAN SYLLABICS SAYISI YI}": "hk",  # ᕁ looks like ᕽ or "hk"
-        # See: https://github.com/UAlbertaALTLab/nehiyawewin-syllabics/issues/2
-        "\N{CANADIAN SYLLABICS WEST-CREE Y}": "y",  # ᕀ looks like ᐩ or "y"
-        # Convert NNBSP within syllabics to hyphens to support round-trip
-        # conversion between syllabics and SRO.
-        "\N{NARROW NO-BREAK SPACE}": "-",
+# The word cache is opt-in: see enable_word_cache().
+word_cache = None  # type: Optional[WordCache]
+
+
+def enable_word_cache(maxsize: int = 4096, path: "Optional[PathLike]" = None) -> None:
+    """
+    Cache the syllabics of words converted by :py:func:`sro2syllabics`.
+
+    Cree text is very repetitive, so caching the most recently converted words
+    can avoid a lot of work when converting lots of text. At most ``maxsize``
+    distinct words are cached; when the cache is full, the least recently used
+    word is forgotten.
+
+    >>> enable_word_cache(maxsize=2)
+    >>> sro2syllabics('nipiy nipiy nipiy')
+    'ᓂᐱᐩ ᓂᐱᐩ ᓂᐱᐩ'
+    >>> word_cache_info()
+    CacheInfo(hits=2, misses=1, evictions=0, maxsize=2, currsize=1)
+
+    Words are cached regardless of their spelling variations, but separately
+    for each combination of ``hyphens`` and ``sandhi``:
+
+    >>> sro2syllabics('NIPIY nipīy')
+    'ᓂᐱᐩ ᓂᐲᐩ'
+    >>> sro2syllabics('nipiy', sandhi=False)
+    'ᓂᐱᐩ'
+    >>> word_cache_info()
+    CacheInfo(hits=3, misses=3, evictions=1, maxsize=2, currsize=2)
+
+    Calling ``enable_word_cache()`` again replaces the cache with a new, empty
+    cache:
+
+    >>> enable_word_cache(maxsize=1024)
+    >>> word_cache_info()
+    CacheInfo(hits=0, misses=0, evictions=0, maxsize=1024, currsize=0)
+    >>> disable_word_cache()
+
+    Persistent word cache
+    ---------------------
+
+    Given a ``path``, the cache is also stored in an SQLite database at that
+    path, which can be shared by many processes at once, and kept from one
+    run to the next. Words that are not among the ``maxsize`` words in memory
+    are looked up in the database, and words converted for the first time are
+    added to the database. This means that a new process converts words it
+    has never seen before just as quickly as an old one. To fill the database
+    before any conversion, see :py:func:`warm_word_cache`.
+
+    Note that with the C accelerator, converting a word takes about as long
+    as looking it up, so the word cache is most useful without it.
+
+    :param int maxsize: the maximum number of words to cache (default: 4096).
+    :param path: where to store the cache, if it should persist.
+    """
+    global word_cache
+    previous, word_cache = word_cache, None
+    if previous is not None:
+        previous.close()
+    if path is None:
+        word_cache = WordCache(maxsize)
+    else:
+        word_cache = PersistentWordCache(maxsize, path)
+
+
+def disable_word_cache() -> None:
+    """
+    Stop caching words, and forget all cached words. A persistent word cache
+    keeps its words in its database.
+    """
+    global word_cache
+    previous, word_cache = word_cache, None
+    if previous is not None:
+        previous.close()
+
+
+def clear_word_cache() -> None:
+    """
+    Forget all cached words, and reset the cache statistics. A persistent word
+    cache forgets the words in its database, too.
+    Does nothing if the word cache is not enabled.
+    """
+    cache = word_cache
+    if cache is not None:
+        cache.clear()
+
+
+def word_cache_info() -> CacheInfo:
+    """
+    Return statistics for the word cache as a named tuple of ``hits``,
+    ``misses``, ``evictions``, ``maxsize``, and ``currsize``. Its ``hit_rate``
+    is the fraction of words that were found in the cache. If the word cache is
+    not enabled, all statistics are zero.
+    """
+    cache = word_cache
+    if cache is None:
+        return CacheInfo(0, 0, 0, 0, 0)
+    return cache.info()
+
+
+def warm_word_cache(
+    texts: "Iterable[str]",
+    path: "PathLike",
+    hyphens: str = DEFAULT_HYPHENS,
+    sandhi: bool = True,
+) -> int:
+    """
+    Add every Cree word in the texts to the database of a persistent word
+    cache, so that processes using it never have to convert these words
+    themselves (see :py:func:`enable_word_cache`). Words are cached separately
+    for each combination of ``hyphens`` and ``sandhi``, so use the same options
+    as the conversions that will use the cache.
+
+    Each text is searched for words separately, so ``texts`` can be an open
+    file, whose lines are read one at a time.
+
+    :param texts: an iterable of texts with Cree words written in SRO.
+    :param path: where the cache is stored.
+    :param str hyphens: what to replace hyphens with
+                        (default: ``<U+202F NARROW NO-BREAK SPACE>``).
+    :param bool sandhi: whether to apply sandhi orthography rule (default:
+                        ``True``).
+    :return: how many words were added.
+    """
+    words = {}  # type: dict
+    for text in texts:
+        for word in find_sro_words(text, hyphens, sandhi):
+            words[word.sro.lower().translate(TRANSLATE_ALT_FORMS)] = None
+
+    connection = open_word_database(fspath(path))
+    try:
+        changes = connection.total_changes
+        store_words(
+            connection,
+            (
+                (word, hyphens, bool(sandhi), transcode_syllables(word, hyphens, sandhi))
+                for word in words
+            ),
+        )
+        return connection.total_changes - changes
+    finally:
+        connection.close()
+
+
+FastPathInfo = namedtuple("FastPathInfo", "skipped converted")
+
+# How many texts sro2syllabics() returned without converting, because they
+# could not possibly contain Cree words or syllabics; and how many it
+# had to convert.
+fast_path_skipped = 0
+fast_path_converted = 0
+
+
+def fast_path_info() -> FastPathInfo:
+    """
+    Return how many texts :py:func:`sro2syllabics` ``skipped``, because they
+    could not possibly contain anything to convert, and how many texts it
+    ``converted``:
+
+    >>> reset_fast_path_info()
+    >>> sro2syllabics('Big dogs bark!')
+    'Big dogs bark!'
+    >>> sro2syllabics('tânisi, dogs!')
+    'ᑖᓂᓯ, dogs!'
+    >>> fast_path_info()
+    FastPathInfo(skipped=1, converted=1)
+
+    Note that many short English words (like "a", "on", or "the") look just
+    like Cree words, so most English sentences must be converted.
+    """
+    return FastPathInfo(fast_path_skipped, fast_path_converted)
+
+
+def reset_fast_path_info() -> None:
+    """
+    Reset the statistics reported by :py:func:`fast_path_info`.
+    """
+    global fast_path_skipped, fast_path_converted
+    fast_path_skipped = fast_path_converted = 0
+
+
+class Instrumentation:
+    """
+    Accumulates the time spent in each stage of conversion, in seconds, and
+    counts of what was converted.
+    """
+
+    def __init__(self) -> None:
+        from threading import Lock
+
+        self.timers = {}  # type: dict
+        self.counters = {}  # type: dict
+        self._lock = Lock()
+
+    def record(self, timers: dict, counters: dict) -> None:
+        "Add the timers and counters of one conversion."
+        with self._lock:
+            for stage, seconds in timers.items():
+                self.timers[stage] = self.timers.get(stage, 0.0) + seconds
+            for name, count in counters.items():
+                self.counters[name] = self.counters.get(name, 0) + count
+
+    def info(self) -> dict:
+        with self._lock:
+            return {
+                "timers": dict(sorted(self.timers.items())),
+                "counters": dict(sorted(self.counters.items())),
+            }
+
+
+# The global instrumentation, or None when instrumentation is disabled.
+instrumentation = None  # type: Optional[Instrumentation]
+
+
+def enable_instrumentation() -> None:
+    """
+    Start timing each stage of conversion, and counting what is converted,
+    in :py:func:`sro2syllabics`, :py:func:`syllabics2sro`, and the functions
+    that build on them.
+
+    >>> enable_instrumentation()
+    >>> sro2syllabics('tânisi. Eddie nitisiyihkâson.')
+    'ᑖᓂᓯ᙮ Eddie ᓂᑎᓯᔨᐦᑳᓱᐣ᙮'
+    >>> info = instrumentation_info()
+    >>> info['counters']['sro2syllabics.words']
+    2
+    >>> sorted(info['timers'])  # doctest: +NORMALIZE_WHITESPACE
+    ['sro2syllabics.fast_path', 'sro2syllabics.normalize',
+     'sro2syllabics.scan', 'sro2syllabics.transcode']
+    >>> disable_instrumentation()
+
+    Instrumentation makes conversion slower, so only enable it to find out
+    where the time goes. When it is disabled, it costs next to nothing.
+    Conversions in worker processes (see :py:func:`sro2syllabics_parallel`)
+    are not instrumented.
+
+    Enabling instrumentation when it is already enabled does nothing.
+    """
+    global instrumentation
+    if instrumentation is None:
+        instrumentation = Instrumentation()
+
+
+def disable_instrumentation() -> None:
+    """
+    Stop instrumenting conversions, and discard what was recorded.
+    """
+    global instrumentation
+    instrumentation = None
+
+
+def reset_instrumentation() -> None:
+    """
+    Discard what was recorded so far, but keep instrumenting conversions.
+    """
+    global instrumentation
+    if instrumentation is not None:
+        instrumentation = Instrumentation()
+
+
+def instrumentation_info() -> dict:
+    """
+    Return what was recorded since instrumentation was enabled (or reset), as
+    a dictionary with these keys:
+
+    ``"timers"``
+        the seconds spent in each stage of conversion, e.g.,
+        ``"sro2syllabics.transcode"``.
+    ``"counters"``
+        counts, such as texts converted (``"sro2syllabics.calls"``),
+        characters scanned (``"sro2syllabics.characters"``), words converted
+        (``"sro2syllabics.words"``), and texts returned unchanged by the fast
+        path (``"sro2syllabics.fast_path_skips"``).
+    ``"word_cache"``
+        the statistics of :py:func:`word_cache_info`.
+
+    When instrumentation is disabled, the timers and counters are empty.
+    """
+    if instrumentation is None:
+        info = {"timers": {}, "counters": {}}  # type: dict
+    else:
+        info = instrumentation.info()
+    cache_info = word_cache_info()
+    info["word_cache"] = dict(cache_info._asdict(), hit_rate=cache_info.hit_rate)
+    return info
+
+
+def dump_instrumentation(file: "Optional[IO[str]]" = None) -> str:
+    """
+    Return :py:func:`instrumentation_info` as JSON, writing it to ``file``
+    too, if given.
+    """
+    import json
+
+    dumped = json.dumps(instrumentation_info(), indent=2)
+    if file is not None:
+        file.write(dumped + "\n")
+    return dumped
+
+
+def instrumented_sro2syllabics(
+    sro: str, hyphens: str, sandhi: bool, assume_nfc: bool
+) -> str:
+    """
+    The same as sro2syllabics(), but recording the time spent in each stage.
+    """
+    global fast_path_skipped, fast_path_converted
+    assert instrumentation is not None
+    stats = instrumentation
+    clock = time.perf_counter
+
+    started = clock()
+    normalized = sro if assume_nfc else nfc(sro)
+    normalized_at = clock()
+    skip = not could_contain_cree(normalized)
+    checked_at = clock()
+
+    timers = {
+        "sro2syllabics.normalize": normalized_at - started,
+        "sro2syllabics.fast_path": checked_at - normalized_at,
     }
-)
+    counters = {"sro2syllabics.calls": 1, "sro2syllabics.characters": len(normalized)}
+    if skip:
+        fast_path_skipped += 1
+        counters["sro2syllabics.fast_path_skips"] = 1
+        stats.record(timers, counters)
+        return normalized
+    fast_path_converted += 1
+
+    transliterate = word_and_full_stop_transliterator(hyphens, sandhi)
+    transcode_seconds = 0.0
+    words = full_stops = 0
+
+    def timed_transliterate(match) -> str:
+        nonlocal transcode_seconds, words, full_stops
+        transcode_started = clock()
+        transliteration = transliterate(match)
+        transcode_seconds += clock() - transcode_started
+        word, full_stop = match.groups()
+        if word is None:
+            full_stops += 1
+        else:
+            words += 1
+            if full_stop:
+                full_stops += 1
+        return transliteration
+
+    pattern = sro2syllabics_tables().word_or_full_stop_pattern
+    result = pattern.sub(timed_transliterate, normalized)
+    # Time spent in the regular expression is everything but transcoding.
+    timers["sro2syllabics.scan"] = clock() - checked_at - transcode_seconds
+    timers["sro2syllabics.transcode"] = transcode_seconds
+    counters["sro2syllabics.words"] = words
+    counters["sro2syllabics.full_stops"] = full_stops
+    stats.record(timers, counters)
+    return result
+
+
+def instrumented_syllabics2sro(syllabics: str, produce_macrons: bool) -> str:
+    """
+    The same as syllabics2sro(), but recording the time spent in each stage.
+    """
+    assert instrumentation is not None
+    stats = instrumentation
+    clock = time.perf_counter
+
+    started = clock()
+    tables = syllabics2sro_tables()
+    if produce_macrons:
+        translation = tables.translation_with_macrons
+        sequences = tables.sequences_with_macrons
+    else:
+        translation = tables.translation
+        sequences = tables.sequences
+    final_middle_dots = syllabics.count("ᐧ")
+    counted_at = clock()
+    if final_middle_dots:
+        result = translate_sequences(
+            syllabics, tables.sequence_pattern, sequences, translation
+        )
+        stage = "syllabics2sro.sequences"
+    else:
+        result = syllabics.translate(translation)
+        stage = "syllabics2sro.translate"
+
+    stats.record(
+        {"syllabics2sro.find_sequences": counted_at - started, stage: clock() - counted_at},
+        {
+            "syllabics2sro.calls": 1,
+            "syllabics2sro.characters": len(syllabics),
+            "syllabics2sro.final_middle_dots": final_middle_dots,
+        },
+    )
+    return result
+
+
+# str.isascii() costs next to nothing, but is new in Python 3.7. On older
+# versions, search for a non-ASCII character instead.
+if hasattr(str, "isascii"):
+    is_ascii = str.isascii
+else:  # pragma: no cover
+    non_ascii_pattern = re.compile("[^\x00-\x7f]")
+
+    def is_ascii(text: str) -> bool:
+        return non_ascii_pattern.search(text) is None
+
+
+def nfc(text: str) -> str:
+    """
+    Return NFC-normalized text.
+
+    Text that is already normalized is returned as-is, without copying it.
+    """
+    # ASCII text is always normalized. Otherwise, normalize() quickly checks
+    # whether the text is normalized already, before doing any real work.
+    if is_ascii(text):
+        return text
+    return normalize("NFC", text)
 
-# Translation table to convert syllabics to SRO.
-SYLLABICS_TO_SRO = str.maketrans(syllabics2sro_lookup)
 
 # For use when converting SYLLABIC + FINAL MIDDLE DOT into the syllabic
 # with a 'w'
@@ -613,10 +1730,120 @@ SYLLABIC_WITH_DOT = {
     "ᔭ": "ᔺ",
     "ᔮ": "ᔼ",
 }
-final_dot_pattern = re.compile(
-    r"([{without_dot}])ᐧ".format(without_dot="".join(SYLLABIC_WITH_DOT.keys()))
+
+SyllabicsToSroTables = namedtuple(
+    "SyllabicsToSroTables",
+    "syllabics2sro_lookup translation translation_with_macrons "
+    "sequences sequences_with_macrons sequence_pattern",
 )
 
+
+@lru_cache(maxsize=None)
+def syllabics2sro_tables() -> SyllabicsToSroTables:
+    """
+    Return the regular expressions and tables used to convert syllabics to
+    SRO. They are built on first use, so that importing this module is quick,
+    and converting SRO to syllabics never builds them.
+    """
+    # Derive the Syllabics -> SRO lookup table from the SRO -> Syllabics table.
+    syllabics2sro_lookup = {syl: sro for sro, syl in sro2syllabics_lookup.items()}
+    # Initially, no syllabics should map to an SRO string more than once
+    # (hence, the two tables should have an equal amount of entries).
+    assert len(syllabics2sro_lookup) == len(sro2syllabics_lookup)
+    # Add alternate and "look-alike" forms:
+    syllabics2sro_lookup.update(
+        {
+            # Some communities use the ᐝ symbol instead of ᐩ for the y-final.
+            # See:
+            # https://en.wikipedia.org/w/index.php?title=Plains_Cree&oldid=848160114#Canadian_aboriginal_syllabics
+            # for an explanation of this special y-final.
+            "\N{CANADIAN SYLLABICS Y-CREE W}": "y",
+            # Convert ᙮ into a Latin full-stop.
+            "\N{CANADIAN SYLLABICS FULL STOP}": ".",
+            # Look-alikes characters:
+            "\N{CANADIAN SYLLABICS T}": "m",  # ᑦ looks like ᒼ or "m"
+            "\N{CANADIAN SYLLABICS SAYISI YI}": "hk",  # ᕁ looks like ᕽ or "hk"
+            # See: https://github.com/UAlbertaALTLab/nehiyawewin-syllabics/issues/2
+            "\N{CANADIAN SYLLABICS WEST-CREE Y}": "y",  # ᕀ looks like ᐩ or "y"
+            # Convert NNBSP within syllabics to hyphens to support round-trip
+            # conversion between syllabics and SRO.
+            "\N{NARROW NO-BREAK SPACE}": "-",
+        }
+    )
+
+    # Translation table to convert syllabics to SRO.
+    translation = str.maketrans(syllabics2sro_lookup)
+    # The same, but also converting circumflexes to macrons, both in the SRO
+    # produced, and in the original text, in a single pass.
+    translation_with_macrons = dict(circumflex_to_macrons)
+    translation_with_macrons.update(
+        (char, sro.translate(circumflex_to_macrons))
+        for char, sro in translation.items()
+    )
+
+    # Sequences of several characters that are converted together, rather
+    # than character by character: SYLLABIC + FINAL MIDDLE DOT is converted
+    # as the syllabic with a 'w'.
+    sequences = {
+        without_dot + "ᐧ": syllabics2sro_lookup[with_dot]
+        for without_dot, with_dot in SYLLABIC_WITH_DOT.items()
+    }
+    # syllabics2sro() only looks for sequences in text with FINAL MIDDLE DOTs.
+    assert all("ᐧ" in sequence for sequence in sequences)
+
+    return SyllabicsToSroTables(
+        syllabics2sro_lookup=syllabics2sro_lookup,
+        translation=translation,
+        translation_with_macrons=translation_with_macrons,
+        sequences=sequences,
+        sequences_with_macrons={
+            sequence: sro.translate(circumflex_to_macrons)
+            for sequence, sro in sequences.items()
+        },
+        sequence_pattern=compile_longest_match(sequences),
+    )
+
+
+def compile_longest_match(sequences: "Iterable[str]") -> "re.Pattern[str]":
+    """
+    Compile a regular expression that matches any of the sequences, preferring
+    the longest, in a single capturing group.
+
+    Sequences that differ only in their first character are matched with a
+    character class, which is much faster than listing each alternative.
+
+    >>> compile_longest_match(['ab', 'cb', 'abc']).pattern
+    '((?:[a]bc)|(?:[ac]b))'
+    """
+    first_characters = {}  # type: dict
+    for sequence in sorted(sequences, key=len, reverse=True):
+        first_characters.setdefault(sequence[1:], []).append(sequence[0])
+    return re.compile(
+        "({})".format(
+            "|".join(
+                "(?:[{}]{})".format(re.escape("".join(firsts)), re.escape(rest))
+                for rest, firsts in first_characters.items()
+            )
+        )
+    )
+
+
+def translate_sequences(
+    text: str, sequence_pattern: "re.Pattern[str]", sequences: dict, translation: dict
+) -> str:
+    """
+    Translate text in a single scan: sequences matched by sequence_pattern are
+    looked up in sequences, and everything in between is translated one
+    character at a time.
+    """
+    # Splitting on a pattern with a capturing group alternates between text
+    # in between sequences, and the sequences themselves.
+    parts = sequence_pattern.split(text)
+    parts[::2] = map(str.translate, parts[::2], repeat(translation))
+    parts[1::2] = map(sequences.__getitem__, parts[1::2])
+    return "".join(parts)
+
+
 circumflex_to_macrons = str.maketrans("êîôâ", "ēīōā")
 
 
@@ -714,16 +1941,1699 @@ def syllabics2sro(syllabics: str, produce_macrons=False) -> str:
     :rtype: str
     """
 
-    def fix_final_dot(match):
-        "Translate syllabic + FINAL MIDDLE DOT to syllabic with 'w'"
-        return SYLLABIC_WITH_DOT[match.group(1)]
+    return syllabics2sro_converters[(produce_macrons,)].convert(syllabics)
 
-    # Normalize all SYLLABIC + FINAL MIDDLE DOT to the composed variant of the
-    # syllabic.
-    normalized = final_dot_pattern.sub(fix_final_dot, syllabics)
-    # **AFTER** normalization, translate syllabics characters to SRO
-    sro_string = normalized.translate(SYLLABICS_TO_SRO)
 
-    if produce_macrons:
-        return sro_string.translate(circumflex_to_macrons)
-    return sro_string
+def syllabics2sro_many(
+    texts: "Iterable[str]", produce_macrons: bool = False
+) -> "Iterator[str]":
+    """
+    Convert many syllabics texts to SRO, one after the other.
+
+    This is equivalent to calling :py:func:`syllabics2sro` on each text,
+    however the set-up is done only once for the entire batch, making it
+    faster for converting lots of short texts (e.g., rows in a database):
+
+    >>> list(syllabics2sro_many(['ᑖᓂᓯ', 'Eddie ᓂᑎᓯᔨᐦᑳᓱᐣ᙮', 'ᐃᑌᐧᐃᐧᓇ']))
+    ['tânisi', 'Eddie nitisiyihkâson.', 'itwêwina']
+
+    Results are produced lazily, so ``texts`` may be any iterable, even one
+    that is too large to fit in memory.
+
+    :param texts: an iterable of texts with Cree words written in syllabics.
+    :param produce_macrons: if ``True``, produces macrons (āēīō) instead of
+                            circumflexes (âêîô).
+    :return: an iterator of texts with Cree words written in SRO.
+    """
+
+    return syllabics2sro_converters[(produce_macrons,)].many(texts)
+
+
+class SyllabicsToSro:
+    """
+    Converts syllabics to SRO, always with the same options.
+
+    Calling a converter is the same as calling :py:func:`syllabics2sro` with
+    its options, however everything that depends on the options is set up
+    only once, when the converter is created:
+
+    >>> convert = SyllabicsToSro(produce_macrons=True)
+    >>> convert('ᐁᐍᐹᐲᐦᑫᐍᐱᓇᒪᕽ')
+    'ēwēpāpīhkēwēpinamahk'
+    >>> list(convert.many(['ᑖᓂᓯ', 'ᐃᑌᐧᐃᐧᓇ']))
+    ['tānisi', 'itwēwina']
+
+    Converters can be pickled, so they can be sent to worker processes.
+
+    :param produce_macrons: if ``True``, produces macrons (āēīō) instead of
+                            circumflexes (âêîô).
+    """
+
+    __slots__ = (
+        "_produce_macrons",
+        "_translation",
+        "_sequences",
+        "_sequence_pattern",
+        "_translator",
+    )
+
+    def __init__(self, produce_macrons: bool = False) -> None:
+        self._produce_macrons = produce_macrons
+        tables = syllabics2sro_tables()
+        self._sequence_pattern = tables.sequence_pattern
+        if produce_macrons:
+            self._translation = tables.translation_with_macrons
+            self._sequences = tables.sequences_with_macrons
+        else:
+            self._translation = tables.translation
+            self._sequences = tables.sequences
+        # The C accelerator's translator is only created once it is used.
+        self._translator = None  # type: Any
+
+    @property
+    def produce_macrons(self) -> bool:
+        "Whether macrons (āēīō) are produced instead of circumflexes (âêîô)."
+        return self._produce_macrons
+
+    def convert(self, syllabics: str) -> str:
+        """
+        Convert Cree words written in syllabics to SRO. Calling the converter
+        itself does the same thing.
+        """
+        if instrumentation is not None:
+            return instrumented_syllabics2sro(syllabics, self._produce_macrons)
+
+        if accelerator is not None:
+            translator = self._translator
+            if translator is None:
+                translator = self._translator = accelerator.Translator(
+                    self._translation, self._sequences
+                )
+            return translator.translate(syllabics)
+
+        # Only text with FINAL MIDDLE DOTs can have sequences to convert together.
+        if "ᐧ" in syllabics:
+            return translate_sequences(
+                syllabics, self._sequence_pattern, self._sequences, self._translation
+            )
+        return syllabics.translate(self._translation)
+
+    def many(self, texts: "Iterable[str]") -> "Iterator[str]":
+        """
+        Convert many syllabics texts to SRO, one after the other. Results are
+        produced lazily.
+        """
+        return map(self.convert, texts)
+
+    # Calling the converter is the same as calling convert(), although
+    # convert() is a little faster to call.
+    __call__ = convert
+
+    def __reduce__(self) -> tuple:
+        # Only the options are pickled; everything else is set up again.
+        return (SyllabicsToSro, (self._produce_macrons,))
+
+    def __repr__(self) -> str:
+        return "SyllabicsToSro(produce_macrons={!r})".format(self._produce_macrons)
+
+
+syllabics2sro_converters = ConverterCache(SyllabicsToSro)
+
+
+def syllabics2sro_numpy(
+    texts: "Iterable[str]", produce_macrons: bool = False
+) -> "List[str]":
+    """
+    Convert a batch of syllabics texts to SRO using NumPy, giving exactly the
+    same results as :py:func:`syllabics2sro`.
+
+    All texts are converted together, as arrays of code points, so this is
+    faster than converting large batches one text at a time with
+    ``str.translate()``. For small batches, or with the C accelerator, use
+    :py:func:`syllabics2sro_many` instead:
+
+    >>> syllabics2sro_numpy(['ᑖᓂᓯ᙮', 'ᐃᑌᐧᐃᐧᓇ'], produce_macrons=True)  # doctest: +SKIP
+    ['tānisi.', 'itwēwina']
+
+    Requires NumPy, which is imported the first time this is called.
+
+    :param texts: an iterable of texts with Cree words written in syllabics.
+    :param produce_macrons: if ``True``, produces macrons (āēīō) instead of
+                            circumflexes (âêîô).
+    :return: a list of texts with Cree words written in SRO.
+    """
+    import numpy  # type: ignore
+
+    texts = list(texts)
+    tables = syllabics2sro_numpy_tables(produce_macrons)
+    table_size = len(tables.lengths)
+
+    # Python strings are indexed by code point, so offsets into the joined
+    # text are offsets into the array of code points too.
+    code_points = numpy.frombuffer(
+        "".join(texts).encode("UTF-32-LE", "surrogatepass"), dtype="<u4"
+    )
+    in_table = code_points < table_size
+    index = numpy.where(in_table, code_points, 0)
+    # Code points beyond the table are copied from the input itself, which is
+    # appended to the pool of converted code points.
+    lengths = numpy.where(in_table, tables.lengths[index], 1)
+    offsets = numpy.where(
+        in_table,
+        tables.offsets[index],
+        len(tables.pool) + numpy.arange(len(code_points)),
+    )
+
+    # Convert SYLLABIC + FINAL MIDDLE DOT as the syllabic with a 'w', and drop
+    # the dot, unless the dot starts the next text.
+    text_ends = numpy.cumsum([len(text) for text in texts], dtype=numpy.intp)
+    with_dot = tables.with_dot[index]
+    dotted = (with_dot[:-1] != 0) & (code_points[1:] == ord("ᐧ"))
+    starts = text_ends[:-1]
+    dotted[starts[(0 < starts) & (starts < len(code_points))] - 1] = False
+    syllabics = numpy.flatnonzero(dotted)
+    lengths[syllabics] = tables.lengths[with_dot[syllabics]]
+    offsets[syllabics] = tables.offsets[with_dot[syllabics]]
+    lengths[syllabics + 1] = 0
+
+    # Gather the converted code points of each input code point, in order.
+    output_ends = numpy.cumsum(lengths)
+    gather = numpy.repeat(offsets - (output_ends - lengths), lengths)
+    gather += numpy.arange(len(gather))
+    converted = (
+        numpy.concatenate((tables.pool, code_points))[gather]
+        .tobytes()
+        .decode("UTF-32-LE", "surrogatepass")
+    )
+
+    # Split the converted texts apart again.
+    bounds = [0]
+    bounds.extend(numpy.concatenate(([0], output_ends))[text_ends].tolist())
+    return [converted[start:end] for start, end in zip(bounds, bounds[1:])]
+
+
+SyllabicsToSroNumpyTables = namedtuple(
+    "SyllabicsToSroNumpyTables", "lengths offsets pool with_dot"
+)
+
+
+@lru_cache(maxsize=2)
+def syllabics2sro_numpy_tables(produce_macrons: bool) -> SyllabicsToSroNumpyTables:
+    """
+    Return the NumPy tables used by syllabics2sro_numpy(), derived from the
+    translation tables used by syllabics2sro().
+
+    Every code point below the largest one that is converted has an entry in
+    the tables: the converted code points are stored at pool[offsets[c]] up to
+    pool[offsets[c] + lengths[c]]; code points that are not converted map to
+    themselves. with_dot[c] is the syllabic with a 'w' for a syllabic that can
+    take a FINAL MIDDLE DOT, or 0.
+    """
+    import numpy
+
+    tables = syllabics2sro_tables()
+    translation = (
+        tables.translation_with_macrons if produce_macrons else tables.translation
+    )
+    size = max(translation) + 1
+    # Translation tables map code points to either strings or code points.
+    converted = [translation.get(code_point, code_point) for code_point in range(size)]
+    converted = [chr(text) if isinstance(text, int) else text for text in converted]
+
+    lengths = numpy.array([len(text) for text in converted], dtype=numpy.intp)
+    offsets = numpy.cumsum(lengths) - lengths
+    pool = numpy.frombuffer("".join(converted).encode("UTF-32-LE"), dtype="<u4")
+    with_dot = numpy.zeros(size, dtype=numpy.intp)
+    for without_dot, syllabic in SYLLABIC_WITH_DOT.items():
+        with_dot[ord(without_dot)] = ord(syllabic)
+    return SyllabicsToSroNumpyTables(lengths, offsets, pool, with_dot)
+
+
+def sro2syllabics_bytes(
+    sro: "BytesLike",
+    hyphens: str = DEFAULT_HYPHENS,
+    sandhi: bool = True,
+    out: "Optional[BytesLike]" = None,
+) -> "Union[bytes, int]":
+    """
+    Convert UTF-8 encoded SRO text to UTF-8 encoded syllabics.
+
+    Accepts ``bytes``, ``bytearray``, ``memoryview``, or anything else that
+    supports the buffer protocol, without copying it first:
+
+    >>> sro2syllabics_bytes('tânisi.'.encode('UTF-8')).decode('UTF-8')
+    'ᑖᓂᓯ᙮'
+
+    If ``out`` is given, the conversion is written to the start of that
+    writable buffer, and the number of bytes written is returned instead:
+
+    >>> out = bytearray(64)
+    >>> size = sro2syllabics_bytes(memoryview(b'niya'), out=out)
+    >>> out[:size].decode('UTF-8')
+    'ᓂᔭ'
+
+    :param sro: UTF-8 encoded text with Cree words written in SRO.
+    :param str hyphens: what to replace hyphens with
+                        (default: ``<U+202F NARROW NO-BREAK SPACE>``).
+    :param bool sandhi: whether to apply sandhi orthography rule (default:
+                        ``True``).
+    :param out: an optional writable buffer to write the conversion to.
+    :return: the UTF-8 encoded text with Cree words written in syllabics, or,
+             if ``out`` is given, the number of bytes written to ``out``.
+    :raises ValueError: if ``out`` is too small to hold the conversion.
+    """
+    return convert_utf8(sro2syllabics, sro, dict(hyphens=hyphens, sandhi=sandhi), out)
+
+
+def syllabics2sro_bytes(
+    syllabics: "BytesLike",
+    produce_macrons: bool = False,
+    out: "Optional[BytesLike]" = None,
+) -> "Union[bytes, int]":
+    """
+    Convert UTF-8 encoded syllabics text to UTF-8 encoded SRO.
+
+    Accepts ``bytes``, ``bytearray``, ``memoryview``, or anything else that
+    supports the buffer protocol, without copying it first:
+
+    >>> syllabics2sro_bytes('ᑖᓂᓯ᙮'.encode('UTF-8')).decode('UTF-8')
+    'tânisi.'
+
+    If ``out`` is given, the conversion is written to the start of that
+    writable buffer, and the number of bytes written is returned instead:
+
+    >>> out = bytearray(64)
+    >>> size = syllabics2sro_bytes('ᓂᔭ'.encode('UTF-8'), out=out)
+    >>> bytes(out[:size])
+    b'niya'
+
+    :param syllabics: UTF-8 encoded text with Cree words written in
+                      syllabics.
+    :param produce_macrons: if ``True``, produces macrons (āēīō) instead of
+                            circumflexes (âêîô).
+    :param out: an optional writable buffer to write the conversion to.
+    :return: the UTF-8 encoded text with Cree words written in SRO, or, if
+             ``out`` is given, the number of bytes written to ``out``.
+    :raises ValueError: if ``out`` is too small to hold the conversion.
+    """
+    return convert_utf8(
+        syllabics2sro, syllabics, dict(produce_macrons=produce_macrons), out
+    )
+
+
+def convert_utf8(
+    convert: "Callable[..., str]",
+    data: "BytesLike",
+    options: dict,
+    out: "Optional[BytesLike]" = None,
+) -> "Union[bytes, int]":
+    """
+    Convert UTF-8 encoded text, returning UTF-8 bytes, or writing them to
+    out.
+    """
+    # NOTE: Converting UTF-8 byte sequences directly (with a bytes regex and
+    # tables of UTF-8 sequences) is several times slower than decoding,
+    # converting with str.translate(), and encoding again, all of which
+    # happen in C. str() decodes directly from the buffer, without copying it
+    # to bytes first.
+    converted = convert(str(data, "UTF-8"), **options).encode("UTF-8")
+    if out is None:
+        return converted
+
+    size = len(converted)
+    with memoryview(out) as view, view.cast("B") as destination:
+        if size > len(destination):
+            raise ValueError(
+                "output buffer is too small: need {} bytes, "
+                "but it has {}".format(size, len(destination))
+            )
+        destination[:size] = converted
+    return size
+
+
+def sro2syllabics_column(
+    column: "Any", hyphens: str = DEFAULT_HYPHENS, sandhi: bool = True
+) -> "Any":
+    """
+    Convert a column of SRO texts to syllabics, converting each distinct text
+    only once.
+
+    Columns of words and lemmas tend to repeat the same few texts over and
+    over, so each text is converted once, and the results are scattered back
+    to every row with that text. The result is the same kind of column as the
+    input: a ``list``, a ``tuple``, a NumPy array, a pandas ``Series``
+    (keeping its index and name), or a pyarrow ``Array`` or ``ChunkedArray``:
+
+    >>> sro2syllabics_column(['nipiy', 'wâpamêw', 'nipiy', None])
+    ['ᓂᐱᐩ', 'ᐚᐸᒣᐤ', 'ᓂᐱᐩ', None]
+
+    Missing values (``None``, ``NaN``, or nulls) are left as they are. NumPy,
+    pandas, and pyarrow are never imported unless a column of theirs is
+    converted.
+
+    :param column: the column with Cree words written in SRO.
+    :param str hyphens: what to replace hyphens with
+                        (default: ``<U+202F NARROW NO-BREAK SPACE>``).
+    :param bool sandhi: whether to apply sandhi orthography rule (default:
+                        ``True``).
+    :return: a column of the same type with Cree words written in syllabics.
+    """
+    return convert_column(
+        sro2syllabics_converters[hyphens, sandhi, False].convert, column
+    )
+
+
+def syllabics2sro_column(column: "Any", produce_macrons: bool = False) -> "Any":
+    """
+    Convert a column of syllabics texts to SRO, converting each distinct text
+    only once. Accepts the same kinds of columns as
+    :py:func:`sro2syllabics_column`, and returns the same kind of column:
+
+    >>> syllabics2sro_column(('ᓂᐱᐩ', 'ᐚᐸᒣᐤ', 'ᓂᐱᐩ'), produce_macrons=True)
+    ('nipiy', 'wāpamēw', 'nipiy')
+
+    :param column: the column with Cree words written in syllabics.
+    :param produce_macrons: if ``True``, produces macrons (āēīō) instead of
+                            circumflexes (âêîô).
+    :return: a column of the same type with Cree words written in SRO.
+    """
+    return convert_column(syllabics2sro_converters[(produce_macrons,)].convert, column)
+
+
+def convert_column(convert: "Callable[[str], str]", column: "Any") -> "Any":
+    """
+    Convert each distinct text in a column once, returning the same kind of
+    column.
+    """
+    # Tell columns apart by the library that defines them, so that the
+    # libraries themselves are only imported when one of their columns is
+    # given.
+    library = type(column).__module__.partition(".")[0]
+    if library == "pandas":
+        return convert_series(convert, column)
+    if library == "pyarrow":
+        return convert_arrow_array(convert, column)
+    if library == "numpy":
+        return convert_ndarray(convert, column)
+
+    converted = convert_distinct(convert, column)
+    if isinstance(column, tuple):
+        return tuple(converted)
+    return converted
+
+
+def convert_distinct(convert: "Callable[[str], str]", values: "Iterable[Any]") -> list:
+    """
+    Convert a sequence of values, converting each distinct string once.
+    Anything that is not a string is passed through as-is.
+    """
+    if not isinstance(values, (list, tuple)):
+        values = list(values)
+    # Both building the dict of distinct values and looking each value up
+    # again happen in C.
+    distinct = dict.fromkeys(values)
+    for value in distinct:
+        distinct[value] = convert(value) if isinstance(value, str) else value
+    return list(map(distinct.__getitem__, values))
+
+
+def convert_ndarray(convert: "Callable[[str], str]", array: "Any") -> "Any":
+    """
+    Convert a NumPy array of strings, either of dtype=object or of a
+    fixed-width string dtype.
+    """
+    import numpy  # type: ignore
+
+    if array.dtype.kind == "U":
+        distinct, inverse = numpy.unique(array.ravel(), return_inverse=True)
+        converted = numpy.array(
+            [convert(value) for value in distinct.tolist()], dtype=str
+        )
+        return converted[inverse].reshape(array.shape)
+
+    result = numpy.empty(array.shape, dtype=object)
+    result.ravel()[:] = convert_distinct(convert, array.ravel().tolist())
+    return result
+
+
+def convert_series(convert: "Callable[[str], str]", series: "Any") -> "Any":
+    """
+    Convert a pandas Series of strings, keeping its index, name, and dtype.
+    """
+    import numpy
+    import pandas  # type: ignore
+
+    # Missing values get the code -1, which picks the last converted value.
+    codes, distinct = pandas.factorize(series)
+    converted = numpy.empty(len(distinct) + 1, dtype=object)
+    converted[:-1] = [
+        convert(value) if isinstance(value, str) else value for value in distinct
+    ]
+    values = converted[codes]
+    missing = codes == -1
+    if missing.any():
+        values[missing] = series.to_numpy(dtype=object)[missing]
+
+    # The converted texts are (generally) not among the categories of a
+    # categorical series.
+    dtype = None if isinstance(series.dtype, pandas.CategoricalDtype) else series.dtype
+    return pandas.Series(values, index=series.index, name=series.name, dtype=dtype)
+
+
+def convert_arrow_array(convert: "Callable[[str], str]", array: "Any") -> "Any":
+    """
+    Convert a pyarrow Array or ChunkedArray of strings, keeping its type.
+    """
+    import pyarrow  # type: ignore
+
+    if isinstance(array, pyarrow.ChunkedArray):
+        return pyarrow.chunked_array(
+            [convert_arrow_array(convert, chunk) for chunk in array.chunks],
+            type=array.type,
+        )
+
+    # Nulls are kept as null indices, and so stay null after take().
+    encoded = array.dictionary_encode()
+    converted = pyarrow.array(
+        [convert(value) for value in encoded.dictionary.to_pylist()], type=array.type
+    )
+    return converted.take(encoded.indices)
+
+
+# Parallel conversion splits the text into chunks of (at least) this many
+# characters.
+DEFAULT_CHUNK_SIZE = 1024 * 1024
+
+
+def sro2syllabics_parallel(
+    sro: str,
+    hyphens: str = DEFAULT_HYPHENS,
+    sandhi: bool = True,
+    max_workers: "Optional[int]" = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> str:
+    r"""
+    Convert a large SRO text to syllabics, using multiple processes.
+
+    The text is split into chunks on line boundaries, and the chunks are
+    converted in a pool of worker processes. The result is exactly the same as
+    :py:func:`sro2syllabics`:
+
+    >>> sro2syllabics_parallel('tânisi.\nnitisiyihkâson.\n', chunk_size=4)
+    'ᑖᓂᓯ᙮\nᓂᑎᓯᔨᐦᑳᓱᐣ᙮\n'
+
+    Starting worker processes is expensive, so this is only worthwhile for
+    very large texts (several megabytes or more). Texts that fit in one chunk
+    are converted in the current process.
+
+    :param str sro: the text with Cree words written in SRO.
+    :param str hyphens: what to replace hyphens with
+                        (default: ``<U+202F NARROW NO-BREAK SPACE>``).
+    :param bool sandhi: whether to apply sandhi orthography rule (default:
+                        ``True``).
+    :param max_workers: how many worker processes to use (default: the number
+                        of CPUs).
+    :param int chunk_size: the approximate size of each chunk, in characters.
+    :return: the text with Cree words written in syllabics.
+    :rtype: str
+    """
+    return "".join(
+        convert_in_parallel(
+            SroToSyllabics(hyphens, sandhi),
+            split_into_chunks(sro, chunk_size),
+            {},
+            max_workers,
+        )
+    )
+
+
+def syllabics2sro_parallel(
+    syllabics: str,
+    produce_macrons: bool = False,
+    max_workers: "Optional[int]" = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> str:
+    r"""
+    Convert a large syllabics text to SRO, using multiple processes.
+
+    The text is split into chunks on line boundaries, and the chunks are
+    converted in a pool of worker processes. The result is exactly the same as
+    :py:func:`syllabics2sro`:
+
+    >>> syllabics2sro_parallel('ᑖᓂᓯ᙮\nᓂᑎᓯᔨᐦᑳᓱᐣ᙮\n', chunk_size=4)
+    'tânisi.\nnitisiyihkâson.\n'
+
+    Starting worker processes is expensive, so this is only worthwhile for
+    very large texts (several megabytes or more). Texts that fit in one chunk
+    are converted in the current process.
+
+    :param str syllabics: the text with Cree words written in syllabics.
+    :param produce_macrons: if ``True``, produces macrons (āēīō) instead of
+                            circumflexes (âêîô).
+    :param max_workers: how many worker processes to use (default: the number
+                        of CPUs).
+    :param int chunk_size: the approximate size of each chunk, in characters.
+    :return: the text with Cree words written in SRO.
+    :rtype: str
+    """
+    return "".join(
+        convert_in_parallel(
+            SyllabicsToSro(produce_macrons),
+            split_into_chunks(syllabics, chunk_size),
+            {},
+            max_workers,
+        )
+    )
+
+
+def split_into_chunks(text: str, chunk_size: int) -> "Iterator[str]":
+    r"""
+    Split text into chunks of at least chunk_size characters, ending on a line
+    boundary. No word, nor full-stop, nor syllabic + FINAL MIDDLE DOT can
+    cross a line boundary, so each chunk can be converted independently.
+
+    >>> list(split_into_chunks('one\ntwo\nthree', 2))
+    ['one\n', 'two\n', 'three']
+    """
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be at least 1; got %r" % (chunk_size,))
+
+    start = 0
+    end = len(text)
+    while start < end:
+        newline = text.find("\n", start + chunk_size - 1)
+        stop = end if newline == -1 else newline + 1
+        yield text[start:stop]
+        start = stop
+
+
+def convert_fragment(convert: "Callable[..., str]", fragment: str, options: dict) -> str:
+    """
+    Convert one fragment of a larger text.
+    """
+    # A lone "." is only a full-stop when it is the entire text, not when it
+    # is merely the last line of a larger text.
+    if fragment == ".":
+        return fragment
+    return convert(fragment, **options)
+
+
+def convert_fragment_with_cache(
+    word_cache_path: str, convert: "Callable[..., str]", fragment: str, options: dict
+) -> str:
+    """
+    Convert one fragment of a larger text in a worker process, using the
+    persistent word cache at word_cache_path.
+    """
+    cache = word_cache
+    if not (isinstance(cache, PersistentWordCache) and cache.path == word_cache_path):
+        enable_word_cache(path=word_cache_path)
+    return convert_fragment(convert, fragment, options)
+
+
+def convert_in_parallel(
+    convert: "Callable[..., str]",
+    chunks: "Iterable[str]",
+    options: dict,
+    max_workers: "Optional[int]" = None,
+    word_cache_path: "Optional[str]" = None,
+) -> "Iterator[str]":
+    """
+    Convert each chunk in a pool of worker processes, yielding the converted
+    chunks in their original order. Only a few chunks per worker are in flight
+    at any given time, so chunks may be produced lazily. If word_cache_path is
+    given, the workers use the persistent word cache stored there.
+    """
+    chunks = iter(chunks)
+    first = next(chunks, None)
+    if first is None:
+        return
+    second = next(chunks, None)
+    if second is None:
+        # There's only one chunk: it's not worth starting the pool.
+        yield convert(first, **options)
+        return
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    # ProcessPoolExecutor only takes an initializer since Python 3.7, so each
+    # job enables the word cache in its worker, if it is not enabled yet.
+    if word_cache_path is None:
+        convert_chunk = partial(convert_fragment, convert)
+    else:
+        convert_chunk = partial(convert_fragment_with_cache, word_cache_path, convert)
+
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        max_in_flight = 2 * (max_workers or os.cpu_count() or 1)
+        in_flight = deque()  # type: deque
+        in_flight.append(executor.submit(convert_chunk, first, options))
+        in_flight.append(executor.submit(convert_chunk, second, options))
+        for chunk in chunks:
+            if len(in_flight) >= max_in_flight:
+                yield in_flight.popleft().result()
+            in_flight.append(executor.submit(convert_chunk, chunk, options))
+        while in_flight:
+            yield in_flight.popleft().result()
+
+
+# Streaming conversion reads this many characters at a time.
+DEFAULT_BUFFER_SIZE = 64 * 1024
+
+# Matches everything up to, and including, the last whitespace character.
+up_to_last_whitespace_pattern = re.compile(r".*\s", re.DOTALL)
+
+
+def sro2syllabics_stream(
+    source: "Union[IO[str], Iterable[str]]",
+    hyphens: str = DEFAULT_HYPHENS,
+    sandhi: bool = True,
+    buffer_size: int = DEFAULT_BUFFER_SIZE,
+) -> "Iterator[str]":
+    r"""
+    Convert SRO text to syllabics, incrementally.
+
+    Reads text from ``source``, which is either a text file, or an iterable of
+    strings, and yields the syllabics conversion piece by piece. This makes it
+    possible to convert files that are larger than the available memory:
+
+    >>> import io
+    >>> source = io.StringIO('tânisi. nitisiyihkâson. kâ-mahihkani-pimohtêt')
+    >>> list(sro2syllabics_stream(source, buffer_size=8))
+    ['ᑖᓂᓯ᙮ ', 'ᓂᑎᓯᔨᐦᑳᓱᐣ᙮ ', 'ᑳ ᒪᐦᐃᐦᑲᓂ ᐱᒧᐦᑌᐟ']
+
+    The input is only split on whitespace, so the output is always the same as
+    converting the entire text with :py:func:`sro2syllabics`. Write the output
+    to a file with ``output.writelines(sro2syllabics_stream(input))``.
+
+    :param source: a text file, or an iterable of strings, with Cree words
+                   written in SRO.
+    :param str hyphens: what to replace hyphens with
+                        (default: ``<U+202F NARROW NO-BREAK SPACE>``).
+    :param bool sandhi: whether to apply sandhi orthography rule (default:
+                        ``True``).
+    :param int buffer_size: how many characters to read from a file at a time.
+    :return: an iterator of pieces of the text with Cree words written in
+             syllabics.
+    """
+    return convert_stream(
+        sro2syllabics,
+        read_blocks(source, buffer_size),
+        dict(hyphens=hyphens, sandhi=sandhi),
+    )
+
+
+def syllabics2sro_stream(
+    source: "Union[IO[str], Iterable[str]]",
+    produce_macrons: bool = False,
+    buffer_size: int = DEFAULT_BUFFER_SIZE,
+) -> "Iterator[str]":
+    r"""
+    Convert syllabics text to SRO, incrementally.
+
+    Reads text from ``source``, which is either a text file, or an iterable of
+    strings, and yields the SRO conversion piece by piece. This makes it
+    possible to convert files that are larger than the available memory:
+
+    >>> list(syllabics2sro_stream(['ᑖᓂ', 'ᓯ᙮ ᐃᑌ', 'ᐧᐃᐧᓇ']))
+    ['tânisi. ', 'itwêwina']
+
+    The input is only split on whitespace, so the output is always the same as
+    converting the entire text with :py:func:`syllabics2sro`. Write the output
+    to a file with ``output.writelines(syllabics2sro_stream(input))``.
+
+    :param source: a text file, or an iterable of strings, with Cree words
+                   written in syllabics.
+    :param produce_macrons: if ``True``, produces macrons (āēīō) instead of
+                            circumflexes (âêîô).
+    :param int buffer_size: how many characters to read from a file at a time.
+    :return: an iterator of pieces of the text with Cree words written in SRO.
+    """
+    return convert_stream(
+        syllabics2sro,
+        read_blocks(source, buffer_size),
+        dict(produce_macrons=produce_macrons),
+    )
+
+
+def read_blocks(source: "Union[IO[str], Iterable[str]]", size: int) -> "Iterator[str]":
+    """
+    Yields blocks of text from a file, or from an iterable of strings.
+    """
+    if hasattr(source, "read"):
+        read = source.read  # type: ignore
+        return iter(lambda: read(size), "")
+    return iter(source)
+
+
+def split_at_last_whitespace(text: str):
+    """
+    Split text into everything up to and including the last whitespace
+    character, and everything after it.
+
+    Converting each part separately gives the same result as converting the
+    whole text, because neither words, nor full-stops, nor syllabic + FINAL
+    MIDDLE DOT sequences can span whitespace. Whitespace also never combines
+    with the characters that follow it when NFC-normalizing.
+
+    >>> split_at_last_whitespace('tânisi. nitisiyi')
+    ('tânisi. ', 'nitisiyi')
+    >>> split_at_last_whitespace('tânisi')
+    ('', 'tânisi')
+    """
+    match = up_to_last_whitespace_pattern.match(text)
+    if match is None:
+        return "", text
+    end = match.end()
+    return text[:end], text[end:]
+
+
+def convert_stream(
+    convert: "Callable[..., str]", blocks: "Iterable[str]", options: dict
+) -> "Iterator[str]":
+    """
+    Convert a text arriving as blocks of arbitrary size, yielding converted
+    pieces as soon as it is safe to do so. Only the text since the last
+    whitespace character is kept in memory.
+    """
+    chunks = split_stream(blocks)
+    for chunk in chunks:
+        # The first chunk might be the entire text.
+        yield convert(chunk, **options)
+        break
+    for chunk in chunks:
+        yield convert_fragment(convert, chunk, options)
+
+
+def split_stream(blocks: "Iterable[str]", chunk_size: int = 1) -> "Iterator[str]":
+    """
+    Rejoin and split blocks of arbitrary size into chunks of at least
+    chunk_size characters that can be converted independently. Every chunk
+    but the last ends with whitespace.
+
+    >>> list(split_stream(['tâni', 'si. nitisi', 'yihkâson.']))
+    ['tânisi. ', 'nitisiyihkâson.']
+    """
+    pieces = []  # type: list
+    size = 0
+    for block in blocks:
+        ready, rest = split_at_last_whitespace(block)
+        if ready:
+            pieces.append(ready)
+            size += len(ready)
+            if size >= chunk_size:
+                yield "".join(pieces)
+                pieces.clear()
+                size = 0
+        if rest:
+            pieces.append(rest)
+            size += len(rest)
+
+    if pieces:
+        yield "".join(pieces)
+
+
+# Memory-mapped file conversion converts (at least) this many bytes at a time.
+DEFAULT_REGION_SIZE = 16 * 1024 * 1024
+
+# ASCII whitespace never occurs within a multi-byte UTF-8 sequence, so it is
+# always safe to split UTF-8 text after one of these bytes.
+ascii_whitespace_pattern = re.compile(rb"[ \t\n\r\x0b\x0c]")
+
+FileProgress = namedtuple("FileProgress", "bytes_done total_bytes bytes_per_second")
+
+
+def sro2syllabics_file(
+    source: "PathLike",
+    destination: "PathLike",
+    hyphens: str = DEFAULT_HYPHENS,
+    sandhi: bool = True,
+    region_size: int = DEFAULT_REGION_SIZE,
+    progress: "Optional[Callable[[FileProgress], None]]" = None,
+) -> None:
+    """
+    Convert a UTF-8 file written in SRO to a UTF-8 file written in syllabics.
+
+    The source file is memory-mapped and converted one region at a time, so
+    even files that are many gigabytes large never have to be loaded into
+    memory as a whole. Each region ends at an ASCII whitespace character, so
+    the result is always the same as converting the entire text with
+    :py:func:`sro2syllabics`.
+
+    If given, ``progress`` is called after each region with a
+    ``FileProgress(bytes_done, total_bytes, bytes_per_second)`` tuple.
+
+    :param source: the path of the file with Cree words written in SRO.
+    :param destination: the path of the file to write the syllabics to. It
+                        must not be the same file as ``source``.
+    :param str hyphens: what to replace hyphens with
+                        (default: ``<U+202F NARROW NO-BREAK SPACE>``).
+    :param bool sandhi: whether to apply sandhi orthography rule (default:
+                        ``True``).
+    :param int region_size: the approximate size of each region, in bytes.
+    :param progress: a function to call after converting each region.
+    """
+    convert_mapped_file(
+        sro2syllabics,
+        dict(hyphens=hyphens, sandhi=sandhi),
+        source,
+        destination,
+        region_size,
+        progress,
+    )
+
+
+def syllabics2sro_file(
+    source: "PathLike",
+    destination: "PathLike",
+    produce_macrons: bool = False,
+    region_size: int = DEFAULT_REGION_SIZE,
+    progress: "Optional[Callable[[FileProgress], None]]" = None,
+) -> None:
+    """
+    Convert a UTF-8 file written in syllabics to a UTF-8 file written in SRO.
+
+    The source file is memory-mapped and converted one region at a time, so
+    even files that are many gigabytes large never have to be loaded into
+    memory as a whole. Each region ends at an ASCII whitespace character, so
+    the result is always the same as converting the entire text with
+    :py:func:`syllabics2sro`.
+
+    If given, ``progress`` is called after each region with a
+    ``FileProgress(bytes_done, total_bytes, bytes_per_second)`` tuple.
+
+    :param source: the path of the file with Cree words written in syllabics.
+    :param destination: the path of the file to write the SRO to. It must not
+                        be the same file as ``source``.
+    :param produce_macrons: if ``True``, produces macrons (āēīō) instead of
+                            circumflexes (âêîô).
+    :param int region_size: the approximate size of each region, in bytes.
+    :param progress: a function to call after converting each region.
+    """
+    convert_mapped_file(
+        syllabics2sro,
+        dict(produce_macrons=produce_macrons),
+        source,
+        destination,
+        region_size,
+        progress,
+    )
+
+
+def convert_mapped_file(
+    convert: "Callable[..., str]",
+    options: dict,
+    source: "PathLike",
+    destination: "PathLike",
+    region_size: int,
+    progress: "Optional[Callable[[FileProgress], None]]",
+) -> None:
+    """
+    Memory-map the source file, and convert it, region by region, into the
+    destination file. Pages of the source file are released once they have
+    been converted, so memory use does not grow with the size of the file.
+    """
+    import mmap
+
+    if region_size < 1:
+        raise ValueError("region_size must be at least 1; got %r" % (region_size,))
+
+    with open(source, "rb") as source_file, open(destination, "wb") as output:
+        total_bytes = os.fstat(source_file.fileno()).st_size
+        if total_bytes == 0:
+            # Empty files cannot be memory-mapped.
+            output.write(convert("", **options).encode("UTF-8"))
+            return
+
+        started = time.perf_counter()
+        with mmap.mmap(source_file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            with memoryview(mapped) as whole_file:
+                start = released = 0
+                for stop in region_boundaries(mapped, region_size):
+                    with whole_file[start:stop] as region:
+                        text = str(region, "UTF-8")
+                    if start == 0:
+                        # The first region might be the entire text.
+                        converted = convert(text, **options)
+                    else:
+                        converted = convert_fragment(convert, text, options)
+                    output.write(converted.encode("UTF-8"))
+                    start = stop
+
+                    if hasattr(mmap, "MADV_DONTNEED"):
+                        release = stop - stop % mmap.PAGESIZE
+                        if release > released:
+                            mapped.madvise(
+                                mmap.MADV_DONTNEED, released, release - released
+                            )
+                            released = release
+                    if progress is not None:
+                        elapsed = time.perf_counter() - started
+                        progress(
+                            FileProgress(
+                                stop, total_bytes, stop / elapsed if elapsed else 0.0
+                            )
+                        )
+
+
+def region_boundaries(data, region_size: int) -> "Iterator[int]":
+    """
+    Yields the end of each region of UTF-8 data, so that each region has
+    (approximately) region_size bytes, and every region but the last ends
+    with ASCII whitespace.
+
+    >>> list(region_boundaries(b'tansi. nitisiyihkason.', 4))
+    [7, 22]
+    """
+    size = len(data)
+    start = 0
+    while start < size:
+        stop = start + region_size
+        if stop >= size:
+            yield size
+            return
+        # Cut after the last newline or space in the region...
+        cut = max(data.rfind(b"\n", start, stop), data.rfind(b" ", start, stop))
+        if cut == -1:
+            # ...or failing that, after the next whitespace, wherever that is.
+            match = ascii_whitespace_pattern.search(data, stop)
+            cut = size - 1 if match is None else match.start()
+        start = cut + 1
+        yield start
+
+
+# An incrementally converted document is split into tokens: a run of
+# non-whitespace, and the whitespace after it. Since neither words, nor
+# full-stops can span whitespace, each token is converted on its own.
+token_pattern = re.compile(r"\S+\s*|\s+")
+
+# Tokens are kept in blocks of about this many, so that finding the token at
+# an offset does not depend on the length of the document.
+INCREMENTAL_BLOCK_SIZE = 64
+
+# An edit to a text: replace deleted characters at offset with inserted.
+TextEdit = namedtuple("TextEdit", "offset deleted inserted")
+
+# Indices of the SRO and syllabics sides of an IncrementalSroToSyllabics.
+SRO_SIDE, SYLLABICS_SIDE = 0, 1
+
+
+class IncrementalSroToSyllabics:
+    r"""
+    Keeps the syllabics of a document written in SRO up-to-date as the
+    document is edited, one keystroke at a time.
+
+    Each edit only converts the words around it again, and returns the edit to
+    make to the syllabics, so converting an edit takes about as long no matter
+    how long the document is:
+
+    >>> document = IncrementalSroToSyllabics('tânisi')
+    >>> document.syllabics
+    'ᑖᓂᓯ'
+    >>> document.edit(6, 0, ' nitisiyihkâson.')
+    TextEdit(offset=3, deleted=0, inserted=' ᓂᑎᓯᔨᐦᑳᓱᐣ᙮')
+    >>> document.edit(0, 6, 'kâ-mahihkani-pimohtêt')
+    TextEdit(offset=0, deleted=3, inserted='ᑳ\u202fᒪᐦᐃᐦᑲᓂ\u202fᐱᒧᐦᑌᐟ')
+    >>> document.sro
+    'kâ-mahihkani-pimohtêt nitisiyihkâson.'
+    >>> document.syllabics
+    'ᑳ\u202fᒪᐦᐃᐦᑲᓂ\u202fᐱᒧᐦᑌᐟ ᓂᑎᓯᔨᐦᑳᓱᐣ᙮'
+
+    Offsets in the SRO can be mapped to offsets in the syllabics, and back, for
+    example, to place the cursor. An offset within a Cree word maps to the
+    start of the word:
+
+    >>> document.syllabics_offset(22)
+    15
+    >>> document.sro_offset(15)
+    22
+    >>> document.syllabics_offset(25)
+    15
+
+    Offsets are indices into the SRO as it is edited, and into the syllabics as
+    it is produced. The syllabics are converted from NFC-normalized SRO, so in
+    text containing combining diacritical marks, any offset within a run of
+    non-whitespace maps to the start of that run.
+
+    :param str sro: the document with Cree words written in SRO (default: an
+                    empty document).
+    :param str hyphens: what to replace hyphens with
+                        (default: ``<U+202F NARROW NO-BREAK SPACE>``).
+    :param bool sandhi: whether to apply sandhi orthography rule (default:
+                        ``True``).
+    """
+
+    __slots__ = (
+        "_hyphens",
+        "_sandhi",
+        "_convert",
+        "_transliterate",
+        "_blocks",
+        "_trees",
+    )
+
+    def __init__(
+        self, sro: str = "", hyphens: str = DEFAULT_HYPHENS, sandhi: bool = True
+    ) -> None:
+        self._hyphens = hyphens
+        self._sandhi = sandhi
+        self._convert = SroToSyllabics(hyphens, sandhi).convert
+        self._transliterate = word_and_full_stop_transliterator(hyphens, sandhi)
+        tokens = token_pattern.findall(sro)
+        self._blocks = [
+            TokenBlock(chunk, self._convert_tokens(chunk, len(sro)))
+            for chunk in split_into_blocks(tokens)
+        ]
+        self._rebuild_trees()
+
+    @property
+    def hyphens(self) -> str:
+        "What hyphens are replaced with."
+        return self._hyphens
+
+    @property
+    def sandhi(self) -> bool:
+        "Whether the sandhi orthography rule is applied."
+        return self._sandhi
+
+    @property
+    def sro(self) -> str:
+        "The whole document, in SRO."
+        return "".join("".join(block.sro) for block in self._blocks)
+
+    @property
+    def syllabics(self) -> str:
+        "The whole document, in syllabics."
+        return "".join("".join(block.syllabics) for block in self._blocks)
+
+    def edit(self, offset: int, deleted: int, inserted: str) -> TextEdit:
+        """
+        Replace ``deleted`` characters of the SRO, starting at ``offset``,
+        with the text ``inserted``. Returns the matching edit to the
+        syllabics, which is as small as possible.
+        """
+        length = self._trees[SRO_SIDE].total()
+        if not (0 <= offset and 0 <= deleted and offset + deleted <= length):
+            raise ValueError(
+                "cannot delete %d characters at offset %d of %d"
+                % (deleted, offset, length)
+            )
+        new_length = length - deleted + len(inserted)
+
+        # Find the tokens that the edit touches.
+        block_index, token_index, start, syllabics_start = self._locate(
+            offset, SRO_SIDE
+        )
+        old_sro = []  # type: List[str]
+        old_syllabics = []  # type: List[str]
+        end = start
+        tokens = self._tokens_from(block_index, token_index)
+        for sro, syllabics in tokens:
+            old_sro.append(sro)
+            old_syllabics.append(syllabics)
+            end += len(sro)
+            if end >= offset + deleted:
+                break
+        text = "".join(old_sro)
+        new_text = text[: offset - start] + inserted + text[offset - start + deleted :]
+
+        # The edited text must still end with whitespace, unless it ends the
+        # document, and start after whitespace, unless it starts the document.
+        following = next(tokens, None) if not new_text[-1:].isspace() else None
+        if following is not None:
+            sro, syllabics = following
+            old_sro.append(sro)
+            old_syllabics.append(syllabics)
+            new_text += sro
+        previous = self._previous(block_index, token_index)
+        if previous is not None:
+            block = self._blocks[previous[0]]
+            sro = block.sro[previous[1]]
+            syllabics = block.syllabics[previous[1]]
+            if new_text[:1].isspace() or not sro[-1].isspace():
+                block_index, token_index = previous
+                old_sro.insert(0, sro)
+                old_syllabics.insert(0, syllabics)
+                new_text = sro + new_text
+                syllabics_start -= len(syllabics)
+
+        new_sro = token_pattern.findall(new_text)
+        new_syllabics = self._convert_tokens(new_sro, new_length)
+        self._replace(block_index, token_index, len(old_sro), new_sro, new_syllabics)
+
+        # Only report the part of the syllabics that actually changed.
+        before = "".join(old_syllabics)
+        after = "".join(new_syllabics)
+        prefix = common_prefix_length(before, after)
+        suffix = common_suffix_length(before[prefix:], after[prefix:])
+        return TextEdit(
+            syllabics_start + prefix,
+            len(before) - prefix - suffix,
+            after[prefix : len(after) - suffix],
+        )
+
+    def syllabics_offset(self, sro_offset: int) -> int:
+        """
+        Return the offset in the syllabics that corresponds to an offset in
+        the SRO.
+        """
+        return self._map_offset(sro_offset, SRO_SIDE)
+
+    def sro_offset(self, syllabics_offset: int) -> int:
+        """
+        Return the offset in the SRO that corresponds to an offset in the
+        syllabics.
+        """
+        return self._map_offset(syllabics_offset, SYLLABICS_SIDE)
+
+    def __repr__(self) -> str:
+        return "<{} of {} characters, hyphens={!r}, sandhi={!r}>".format(
+            type(self).__name__,
+            self._trees[SRO_SIDE].total(),
+            self._hyphens,
+            self._sandhi,
+        )
+
+    def _convert_tokens(self, tokens: "List[str]", document_length: int) -> "List[str]":
+        convert = self._convert
+        # A lone "." is only a full-stop when it is the entire document.
+        return [
+            token if token == "." and document_length != 1 else convert(token)
+            for token in tokens
+        ]
+
+    def _locate(self, offset: int, side: int) -> "Tuple[int, int, int, int]":
+        """
+        Return the block and token containing the offset on one side, and the
+        offsets at which the token starts in the SRO and in the syllabics.
+        At the end of the document, the token is one past the last token.
+        """
+        trees = self._trees
+        blocks = self._blocks
+        block_index, block_start = trees[side].find(offset)
+        if block_index == len(blocks):
+            block_index -= 1
+            block_start = trees[side].offset(block_index)
+        block = blocks[block_index]
+        if side == SRO_SIDE:
+            tokens, others = block.sro, block.syllabics
+            other_start = trees[SYLLABICS_SIDE].offset(block_index)
+        else:
+            tokens, others = block.syllabics, block.sro
+            other_start = trees[SRO_SIDE].offset(block_index)
+
+        start = block_start
+        for token_index, token in enumerate(tokens):
+            if offset < start + len(token):
+                break
+            start += len(token)
+            other_start += len(others[token_index])
+        else:
+            token_index = len(tokens)
+        if side == SRO_SIDE:
+            return block_index, token_index, start, other_start
+        return block_index, token_index, other_start, start
+
+    def _tokens_from(
+        self, block_index: int, token_index: int
+    ) -> "Iterator[Tuple[str, str]]":
+        blocks = self._blocks
+        for block in blocks[block_index : block_index + 1]:
+            yield from zip(block.sro[token_index:], block.syllabics[token_index:])
+        for block in blocks[block_index + 1 :]:
+            yield from zip(block.sro, block.syllabics)
+
+    def _previous(
+        self, block_index: int, token_index: int
+    ) -> "Optional[Tuple[int, int]]":
+        if token_index > 0:
+            return block_index, token_index - 1
+        if block_index > 0:
+            return block_index - 1, len(self._blocks[block_index - 1].sro) - 1
+        return None
+
+    def _replace(
+        self,
+        block_index: int,
+        token_index: int,
+        count: int,
+        sro: "List[str]",
+        syllabics: "List[str]",
+    ) -> None:
+        """
+        Replace count tokens, starting at the given token, with new tokens.
+        """
+        blocks = self._blocks
+        block = blocks[block_index]
+        here = min(count, len(block.sro) - token_index)
+        block.sro[token_index : token_index + here] = sro
+        block.syllabics[token_index : token_index + here] = syllabics
+        count -= here
+        end = block_index + 1
+        while count:
+            following = blocks[end]
+            here = min(count, len(following.sro))
+            del following.sro[:here]
+            del following.syllabics[:here]
+            count -= here
+            end += 1
+
+        changed = blocks[block_index:end]
+        if all(0 < len(block.sro) <= 2 * INCREMENTAL_BLOCK_SIZE for block in changed):
+            for index, block in enumerate(changed, block_index):
+                deltas = block.update_lengths()
+                self._trees[SRO_SIDE].add(index, deltas[SRO_SIDE])
+                self._trees[SYLLABICS_SIDE].add(index, deltas[SYLLABICS_SIDE])
+            return
+
+        # Blocks have been emptied, or have grown too large: split them up
+        # again. This happens once every many edits.
+        rebalanced = []
+        for block in changed:
+            rebalanced.extend(
+                TokenBlock(sro, syllabics)
+                for sro, syllabics in zip(
+                    split_into_blocks(block.sro), split_into_blocks(block.syllabics)
+                )
+            )
+        blocks[block_index:end] = rebalanced
+        self._rebuild_trees()
+
+    def _rebuild_trees(self) -> None:
+        # An empty document still has one, empty, block.
+        if not self._blocks:
+            self._blocks.append(TokenBlock([], []))
+        self._trees = (
+            LengthTree([block.lengths[SRO_SIDE] for block in self._blocks]),
+            LengthTree([block.lengths[SYLLABICS_SIDE] for block in self._blocks]),
+        )
+
+    def _map_offset(self, offset: int, side: int) -> int:
+        length = self._trees[side].total()
+        if not 0 <= offset <= length:
+            raise ValueError("offset %d is not within 0..%d" % (offset, length))
+        block_index, token_index, sro_start, syllabics_start = self._locate(
+            offset, side
+        )
+        block = self._blocks[block_index]
+        if token_index == len(block.sro):
+            # The end of the document.
+            return (syllabics_start, sro_start)[side]
+        sro = block.sro[token_index]
+        syllabics = block.syllabics[token_index]
+        if side == SRO_SIDE:
+            return syllabics_start + self._map_token_offset(
+                sro, syllabics, offset - sro_start, side
+            )
+        return sro_start + self._map_token_offset(
+            sro, syllabics, offset - syllabics_start, side
+        )
+
+    def _map_token_offset(
+        self, sro: str, syllabics: str, offset: int, side: int
+    ) -> int:
+        """
+        Map an offset within one token, from one side to the other.
+        """
+        if nfc(sro) != sro:
+            # Normalization moved things around, so only the start is known.
+            return 0
+        other = 1 - side
+        # The difference in offsets between syllabics and SRO, after the
+        # matches so far.
+        shift = 0
+        for match in sro2syllabics_tables().word_or_full_stop_pattern.finditer(sro):
+            start, end = match.span()
+            starts = (start, start + shift)
+            if offset < starts[side]:
+                break
+            ends = (end, starts[1] + len(self._transliterate(match)))
+            if offset < ends[side]:
+                return starts[other]
+            shift = ends[1] - ends[0]
+        return offset + shift if side == SRO_SIDE else offset - shift
+
+
+class TokenBlock:
+    """
+    A run of consecutive tokens of an IncrementalSroToSyllabics, in SRO and in
+    syllabics, and their total lengths.
+    """
+
+    __slots__ = ("sro", "syllabics", "lengths")
+
+    def __init__(self, sro: "List[str]", syllabics: "List[str]") -> None:
+        self.sro = sro
+        self.syllabics = syllabics
+        self.lengths = (sum(map(len, sro)), sum(map(len, syllabics)))
+
+    def update_lengths(self) -> "Tuple[int, int]":
+        """
+        Recount the lengths after the tokens were changed, and return how much
+        they changed.
+        """
+        old = self.lengths
+        self.lengths = (sum(map(len, self.sro)), sum(map(len, self.syllabics)))
+        return self.lengths[0] - old[0], self.lengths[1] - old[1]
+
+
+def split_into_blocks(tokens: "List[str]") -> "List[List[str]]":
+    """
+    Split a list of tokens into blocks of INCREMENTAL_BLOCK_SIZE tokens.
+    """
+    return [
+        tokens[start : start + INCREMENTAL_BLOCK_SIZE]
+        for start in range(0, len(tokens), INCREMENTAL_BLOCK_SIZE)
+    ]
+
+
+class LengthTree:
+    """
+    The lengths of a sequence of items, stored as a Fenwick tree, so that both
+    the offset of an item, and the item at an offset, are found in O(log n)
+    time, and changing a length takes O(log n) time too.
+    """
+
+    __slots__ = ("_tree",)
+
+    def __init__(self, lengths: "List[int]") -> None:
+        tree = [0] + lengths
+        for index in range(1, len(tree)):
+            parent = index + (index & -index)
+            if parent < len(tree):
+                tree[parent] += tree[index]
+        self._tree = tree
+
+    def add(self, index: int, delta: int) -> None:
+        "Add delta to the length of the item at index."
+        tree = self._tree
+        index += 1
+        while index < len(tree):
+            tree[index] += delta
+            index += index & -index
+
+    def offset(self, index: int) -> int:
+        "The total length of the items before the item at index."
+        tree = self._tree
+        total = 0
+        while index > 0:
+            total += tree[index]
+            index -= index & -index
+        return total
+
+    def total(self) -> int:
+        "The total length of all items."
+        return self.offset(len(self._tree) - 1)
+
+    def find(self, offset: int) -> "Tuple[int, int]":
+        """
+        Return the index of the last item that starts at or before offset,
+        and where it starts. At the very end, this is one past the last item.
+        """
+        tree = self._tree
+        index = start = 0
+        step = 1 << (len(tree) - 1).bit_length()
+        while step:
+            following = index + step
+            if following < len(tree) and start + tree[following] <= offset:
+                index = following
+                start += tree[following]
+            step >>= 1
+        return index, start
+
+
+def common_prefix_length(a: str, b: str) -> int:
+    """
+    Return how many characters a and b start with in common.
+
+    >>> common_prefix_length('ᑖᓂᓯ', 'ᑖᓂ')
+    2
+    """
+    return len(os.path.commonprefix([a, b]))
+
+
+def common_suffix_length(a: str, b: str) -> int:
+    """
+    Return how many characters a and b end with in common.
+
+    >>> common_suffix_length('ᑖᓂᓯ', 'ᓂᓯ')
+    2
+    """
+    return len(os.path.commonprefix([a[::-1], b[::-1]]))
+
+
+# The command-line interface reads and writes this many characters at a time.
+COMMAND_LINE_BLOCK_SIZE = 1024 * 1024
+
+
+def main(argv=None) -> int:
+    """
+    Convert files (or stdin) between SRO and syllabics on the command line.
+
+    Usage::
+
+        cree-sro-syllabics sro2syllabics [--hyphens=H] [--no-sandhi] [FILE ...]
+        cree-sro-syllabics syllabics2sro [--macrons] [FILE ...]
+        cree-sro-syllabics warm-cache [--hyphens=H] [--no-sandhi] DATABASE [FILE ...]
+
+    Run ``cree-sro-syllabics --help`` for all options.
+    """
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        prog="cree-sro-syllabics",
+        description="Convert between Western Cree SRO and syllabics.",
+    )
+    parser.add_argument(
+        "--version", action="version", version="%(prog)s " + __version__
+    )
+    subparsers = parser.add_subparsers(dest="command", metavar="COMMAND")
+    subparsers.required = True
+
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument(
+        "files",
+        nargs="*",
+        metavar="FILE",
+        help="files to convert (default: standard input)",
+    )
+    common.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        metavar="N",
+        help="convert using N worker processes (0: one per CPU; default: 1)",
+    )
+    common.add_argument(
+        "-i",
+        "--in-place",
+        action="store_true",
+        help="rewrite each file with its conversion, instead of printing it",
+    )
+
+    sro_options = argparse.ArgumentParser(add_help=False)
+    sro_options.add_argument(
+        "--hyphens",
+        default=DEFAULT_HYPHENS,
+        help="what to replace hyphens with (default: U+202F NARROW NO-BREAK SPACE)",
+    )
+    sro_options.add_argument(
+        "--no-sandhi",
+        dest="sandhi",
+        action="store_false",
+        help="do not apply the sandhi orthographic rule",
+    )
+
+    to_syllabics = subparsers.add_parser(
+        "sro2syllabics",
+        parents=[common, sro_options],
+        help="convert SRO to syllabics",
+    )
+    to_syllabics.add_argument(
+        "--word-cache",
+        metavar="DATABASE",
+        help="look up and store converted words in this persistent word cache",
+    )
+    to_syllabics.set_defaults(convert=sro2syllabics)
+
+    to_sro = subparsers.add_parser(
+        "syllabics2sro", parents=[common], help="convert syllabics to SRO"
+    )
+    to_sro.add_argument(
+        "--macrons",
+        dest="produce_macrons",
+        action="store_true",
+        help="produce macrons (āēīō) instead of circumflexes (âêîô)",
+    )
+    to_sro.set_defaults(convert=syllabics2sro)
+
+    warm_cache = subparsers.add_parser(
+        "warm-cache",
+        parents=[sro_options],
+        help="add the Cree words in SRO text to a persistent word cache",
+    )
+    warm_cache.add_argument("database", metavar="DATABASE", help="the word cache")
+    warm_cache.add_argument(
+        "files",
+        nargs="*",
+        metavar="FILE",
+        help="files with Cree words written in SRO (default: standard input)",
+    )
+    warm_cache.set_defaults(convert=None)
+
+    args = parser.parse_args(argv)
+
+    if args.convert is None:
+        return warm_cache_command(args.database, args.files, args.hyphens, args.sandhi)
+
+    word_cache_path = None
+    if args.convert is sro2syllabics:
+        options = dict(hyphens=args.hyphens, sandhi=args.sandhi)
+        word_cache_path = args.word_cache
+    else:
+        options = dict(produce_macrons=args.produce_macrons)
+    if args.jobs < 0:
+        parser.error("--jobs must be 0 or more")
+    max_workers = args.jobs or os.cpu_count() or 1
+
+    def convert_file(source, destination):
+        blocks = read_blocks(source, COMMAND_LINE_BLOCK_SIZE)
+        if max_workers == 1:
+            converted = convert_stream(args.convert, blocks, options)
+        else:
+            chunks = split_stream(blocks, DEFAULT_CHUNK_SIZE)
+            converted = convert_in_parallel(
+                args.convert, chunks, options, max_workers, word_cache_path
+            )
+        destination.writelines(converted)
+
+    if word_cache_path is not None and max_workers == 1:
+        enable_word_cache(path=word_cache_path)
+        try:
+            return convert_files(args, parser, convert_file)
+        finally:
+            disable_word_cache()
+    return convert_files(args, parser, convert_file)
+
+
+def convert_files(
+    args: "Any", parser: "Any", convert_file: "Callable[[IO[str], IO[str]], None]"
+) -> int:
+    """
+    Convert each file in args.files (or stdin) with convert_file(), either to
+    stdout or, with --in-place, rewriting each file.
+    """
+    if args.in_place:
+        if not args.files or "-" in args.files:
+            parser.error("--in-place requires one or more files")
+        for path in args.files:
+            rewrite_file(path, convert_file)
+        return 0
+
+    stdout = io.TextIOWrapper(sys.stdout.buffer, encoding="UTF-8", newline="")
+    try:
+        for path in args.files or ["-"]:
+            if path == "-":
+                stdin = io.TextIOWrapper(sys.stdin.buffer, encoding="UTF-8", newline="")
+                try:
+                    convert_file(stdin, stdout)
+                finally:
+                    stdin.detach()
+            else:
+                with open_text(path) as source:
+                    convert_file(source, stdout)
+    finally:
+        stdout.flush()
+        stdout.detach()
+    return 0
+
+
+def warm_cache_command(
+    database: str, files: "List[str]", hyphens: str, sandhi: bool
+) -> int:
+    """
+    Add the Cree words in the files (or stdin) to a persistent word cache.
+    """
+    added = 0
+    for path in files or ["-"]:
+        if path == "-":
+            stdin = io.TextIOWrapper(sys.stdin.buffer, encoding="UTF-8", newline="")
+            try:
+                added += warm_word_cache(stdin, database, hyphens, sandhi)
+            finally:
+                stdin.detach()
+        else:
+            with open_text(path) as source:
+                added += warm_word_cache(source, database, hyphens, sandhi)
+    print("{}: added {} words".format(database, added), file=sys.stderr)
+    return 0
+
+
+def open_text(path: str, mode: str = "r") -> "IO[str]":
+    """
+    Open a UTF-8 text file with a large buffer, leaving newlines untouched.
+    """
+    return open(
+        path, mode, encoding="UTF-8", newline="", buffering=COMMAND_LINE_BLOCK_SIZE
+    )
+
+
+def rewrite_file(path: str, convert_file: "Callable[[IO[str], IO[str]], None]") -> None:
+    """
+    Replace the file's contents with its conversion. The conversion is written
+    to a temporary file first, so the original file is left untouched if the
+    conversion fails.
+    """
+    import shutil
+    import tempfile
+
+    directory = os.path.dirname(os.path.abspath(path))
+    file_descriptor, temporary_path = tempfile.mkstemp(dir=directory)
+    os.close(file_descriptor)
+    try:
+        with open_text(path) as source, open_text(temporary_path, "w") as destination:
+            convert_file(source, destination)
+        shutil.copymode(path, temporary_path)
+        os.replace(temporary_path, path)
+    except BaseException:
+        os.unlink(temporary_path)
+        raise
+
+
+# These tables are built on first use, but are also available as module
+# attributes. Some used to be built when importing the module. Others, like
+# sro_pattern, full_stop_pattern, and final_dot_pattern, are no longer used,
+# and have been removed (see CHANGELOG.md).
+LAZY_ATTRIBUTES = {
+    "word_pattern": (sro2syllabics_tables, "word_pattern"),
+    "word_or_full_stop_pattern": (sro2syllabics_tables, "word_or_full_stop_pattern"),
+    "syllabic_full_stop_pattern": (sro2syllabics_tables, "syllabic_full_stop_pattern"),
+    "LETTER_CLASSES": (sro2syllabics_tables, "letter_classes"),
+    "only_vowels_pattern": (sro2syllabics_tables, "only_vowels_pattern"),
+    "syllabics2sro_lookup": (syllabics2sro_tables, "syllabics2sro_lookup"),
+    "SYLLABICS_TO_SRO": (syllabics2sro_tables, "translation"),
+}
+
+
+def __getattr__(name: str):
+    try:
+        tables, attribute = LAZY_ATTRIBUTES[name]
+    except KeyError:
+        raise AttributeError(
+            "module {!r} has no attribute {!r}".format(__name__, name)
+        ) from None
+    return getattr(tables(), attribute)
+
+
+if sys.version_info < (3, 7):  # pragma: no cover
+    # Modules can only define __getattr__() since Python 3.7 (PEP 562), so
+    # older versions build these names when importing the module.
+    globals().update((name, __getattr__(name)) for name in LAZY_ATTRIBUTES)
+
+
+if __name__ == "__main__":
+    # Import ourselves by name, so that functions sent to worker processes
+    # refer to this module, and not to __main__.
+    import cree_sro_syllabics
+
+    sys.exit(cree_sro_syllabics.main())
@@ -0,0 +1,283 @@
+# Copyright © 2018–2021 National Research Council Canada
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy of
+# this software and associated documentation files (the "Software"), to deal in
+# the Software without restriction, including without limitation the rights to
+# use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of
+# the Software, and to permit persons to whom the Software is furnished to do so,
+# subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS
+# FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR
+# COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER
+# IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+"""
+Convert between Western Cree SRO and syllabics without blocking an asyncio
+event loop.
+
+This module needs Python 3.7 or later, and cree_sro_syllabics.py alongside
+it.
+"""
+
+import asyncio
+import re
+from functools import partial
+from typing import Any, AsyncIterable, AsyncIterator, Callable, Iterator
+
+from cree_sro_syllabics import (
+    DEFAULT_HYPHENS,
+    convert_fragment,
+    split_at_last_whitespace,
+    sro2syllabics,
+    syllabics2sro,
+)
+
+__all__ = [
+    "asro2syllabics",
+    "asyllabics2sro",
+    "asro2syllabics_stream",
+    "asyllabics2sro_stream",
+]
+
+# Asynchronous conversion converts texts up to this many characters directly
+# in the event loop; it's not worth handing them off to an executor.
+ASYNC_INLINE_LIMIT = 4 * 1024
+# Longer texts are converted in an executor, in chunks of (at least) this
+# many characters, one chunk at a time.
+ASYNC_CHUNK_SIZE = 64 * 1024
+
+whitespace_pattern = re.compile(r"\s")
+
+
+async def asro2syllabics(
+    sro: str,
+    hyphens: str = DEFAULT_HYPHENS,
+    sandhi: bool = True,
+    executor: Any = None,
+    inline_limit: int = ASYNC_INLINE_LIMIT,
+) -> str:
+    """
+    Convert Cree words written in SRO text to syllabics, without blocking the
+    event loop.
+
+    >>> import asyncio
+    >>> asyncio.run(asro2syllabics('tânisi.'))
+    'ᑖᓂᓯ᙮'
+
+    Short texts (up to ``inline_limit`` characters) are converted directly.
+    Longer texts are split on whitespace, and converted one chunk at a time
+    in ``executor``, so that only one chunk per call is ever waiting in the
+    executor. If the call is cancelled, the remaining chunks are never
+    converted. The result is always the same as :py:func:`~cree_sro_syllabics.sro2syllabics`.
+
+    :param str sro: the text with Cree words written in SRO.
+    :param str hyphens: what to replace hyphens with
+                        (default: ``<U+202F NARROW NO-BREAK SPACE>``).
+    :param bool sandhi: whether to apply sandhi orthography rule (default:
+                        ``True``).
+    :param executor: the :py:class:`concurrent.futures.Executor` to convert
+                     long texts in (default: the event loop's default
+                     executor).
+    :param int inline_limit: the length of the longest text to convert
+                             directly in the event loop.
+    :return: the text with Cree words written in syllabics.
+    :rtype: str
+    """
+    return await convert_async(
+        sro2syllabics, sro, dict(hyphens=hyphens, sandhi=sandhi), executor, inline_limit
+    )
+
+
+async def asyllabics2sro(
+    syllabics: str,
+    produce_macrons: bool = False,
+    executor: Any = None,
+    inline_limit: int = ASYNC_INLINE_LIMIT,
+) -> str:
+    """
+    Convert Cree words written in syllabics to SRO, without blocking the event
+    loop.
+
+    >>> import asyncio
+    >>> asyncio.run(asyllabics2sro('ᑖᓂᓯ᙮'))
+    'tânisi.'
+
+    Short texts (up to ``inline_limit`` characters) are converted directly.
+    Longer texts are split on whitespace, and converted one chunk at a time
+    in ``executor``, so that only one chunk per call is ever waiting in the
+    executor. If the call is cancelled, the remaining chunks are never
+    converted. The result is always the same as :py:func:`~cree_sro_syllabics.syllabics2sro`.
+
+    :param str syllabics: the text with Cree words written in syllabics.
+    :param produce_macrons: if ``True``, produces macrons (āēīō) instead of
+                            circumflexes (âêîô).
+    :param executor: the :py:class:`concurrent.futures.Executor` to convert
+                     long texts in (default: the event loop's default
+                     executor).
+    :param int inline_limit: the length of the longest text to convert
+                             directly in the event loop.
+    :return: the text with Cree words written in SRO.
+    :rtype: str
+    """
+    return await convert_async(
+        syllabics2sro,
+        syllabics,
+        dict(produce_macrons=produce_macrons),
+        executor,
+        inline_limit,
+    )
+
+
+async def asro2syllabics_stream(
+    source: AsyncIterable[str],
+    hyphens: str = DEFAULT_HYPHENS,
+    sandhi: bool = True,
+    executor: Any = None,
+    inline_limit: int = ASYNC_INLINE_LIMIT,
+) -> AsyncIterator[str]:
+    """
+    Convert SRO text to syllabics, incrementally, from an asynchronous
+    iterable of strings (e.g., the chunks of an HTTP request body).
+
+    This is the asynchronous version of :py:func:`~cree_sro_syllabics.sro2syllabics_stream`; the
+    source is only read as fast as the converted pieces are consumed. Long
+    pieces are converted in ``executor``, as in :py:func:`asro2syllabics`.
+
+    :param source: an asynchronous iterable of strings, with Cree words
+                   written in SRO.
+    :param str hyphens: what to replace hyphens with
+                        (default: ``<U+202F NARROW NO-BREAK SPACE>``).
+    :param bool sandhi: whether to apply sandhi orthography rule (default:
+                        ``True``).
+    :param executor: the :py:class:`concurrent.futures.Executor` to convert
+                     long pieces in (default: the event loop's default
+                     executor).
+    :param int inline_limit: the length of the longest piece to convert
+                             directly in the event loop.
+    :return: an asynchronous iterator of pieces of the text with Cree words
+             written in syllabics.
+    """
+    options = dict(hyphens=hyphens, sandhi=sandhi)
+    async for converted in convert_async_stream(
+        sro2syllabics, source, options, executor, inline_limit
+    ):
+        yield converted
+
+
+async def asyllabics2sro_stream(
+    source: AsyncIterable[str],
+    produce_macrons: bool = False,
+    executor: Any = None,
+    inline_limit: int = ASYNC_INLINE_LIMIT,
+) -> AsyncIterator[str]:
+    """
+    Convert syllabics text to SRO, incrementally, from an asynchronous
+    iterable of strings (e.g., the chunks of an HTTP request body).
+
+    This is the asynchronous version of :py:func:`~cree_sro_syllabics.syllabics2sro_stream`; the
+    source is only read as fast as the converted pieces are consumed. Long
+    pieces are converted in ``executor``, as in :py:func:`asyllabics2sro`.
+
+    :param source: an asynchronous iterable of strings, with Cree words
+                   written in syllabics.
+    :param produce_macrons: if ``True``, produces macrons (āēīō) instead of
+                            circumflexes (âêîô).
+    :param executor: the :py:class:`concurrent.futures.Executor` to convert
+                     long pieces in (default: the event loop's default
+                     executor).
+    :param int inline_limit: the length of the longest piece to convert
+                             directly in the event loop.
+    :return: an asynchronous iterator of pieces of the text with Cree words
+             written in SRO.
+    """
+    options = dict(produce_macrons=produce_macrons)
+    async for converted in convert_async_stream(
+        syllabics2sro, source, options, executor, inline_limit
+    ):
+        yield converted
+
+
+async def convert_async(
+    convert: Callable[..., str],
+    text: str,
+    options: dict,
+    executor: Any,
+    inline_limit: int,
+    whole_text: bool = True,
+) -> str:
+    """
+    Convert text directly, if it's short, or else chunk by chunk in the
+    executor. If whole_text is False, the text is a fragment of a larger
+    text (see convert_fragment()).
+    """
+    if len(text) <= inline_limit:
+        if whole_text:
+            return convert(text, **options)
+        return convert_fragment(convert, text, options)
+
+    loop = asyncio.get_running_loop()
+    converted = []
+    for chunk in split_at_whitespace(text, ASYNC_CHUNK_SIZE):
+        if whole_text:
+            # The first chunk might be the entire text.
+            job = partial(convert, chunk, **options)
+            whole_text = False
+        else:
+            job = partial(convert_fragment, convert, chunk, options)
+        converted.append(await loop.run_in_executor(executor, job))
+    return "".join(converted)
+
+
+async def convert_async_stream(
+    convert: Callable[..., str],
+    blocks: AsyncIterable[str],
+    options: dict,
+    executor: Any,
+    inline_limit: int,
+) -> AsyncIterator[str]:
+    """
+    Convert a text arriving as blocks of arbitrary size from an asynchronous
+    iterable, yielding converted pieces as soon as it is safe to do so. This
+    is the asynchronous version of convert_stream() and split_stream().
+    """
+    whole_text = True
+    pieces = []  # type: list
+    async for block in blocks:
+        ready, rest = split_at_last_whitespace(block)
+        if ready:
+            pieces.append(ready)
+            yield await convert_async(
+                convert, "".join(pieces), options, executor, inline_limit, whole_text
+            )
+            whole_text = False
+            pieces.clear()
+        if rest:
+            pieces.append(rest)
+
+    if pieces:
+        yield await convert_async(
+            convert, "".join(pieces), options, executor, inline_limit, whole_text
+        )
+
+
+def split_at_whitespace(text: str, chunk_size: int) -> Iterator[str]:
+    """
+    Split text into chunks of at least chunk_size characters, so that every
+    chunk but the last ends with whitespace.
+
+    >>> list(split_at_whitespace('tânisi. nitisiyihkâson.', 4))
+    ['tânisi. ', 'nitisiyihkâson.']
+    """
+    start = 0
+    end = len(text)
+    while start < end:
+        match = whitespace_pattern.search(text, start + chunk_size - 1)
+        stop = end if match is None else match.end()
+        yield text[start:stop]
+        start = stop
@@ -0,0 +1,18 @@
+import pytest  # type: ignore
+
+import cree_sro_syllabics
+
+BUILT_ACCELERATOR = cree_sro_syllabics.accelerator
+
+
+@pytest.fixture(autouse=True, params=["python", "c"])
+def backend(request, monkeypatch):
+    """
+    Runs every test twice: once with pure Python, and once with the C
+    accelerator (if it has been built; see build.py).
+    """
+    if request.param == "python":
+        monkeypatch.setattr(cree_sro_syllabics, "accelerator", None)
+    elif BUILT_ACCELERATOR is None:
+        pytest.skip("the C accelerator has not been built")
+    return request.param
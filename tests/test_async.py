@@ -0,0 +1,109 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest  # type: ignore
+
+import cree_sro_syllabics_async
+from cree_sro_syllabics import sro2syllabics, syllabics2sro
+
+SRO = "tânisi. nitisiyihkâson.\nkâ-mahihkani-pimohtêt\n.\n"
+
+
+class BlockingExecutor(ThreadPoolExecutor):
+    """
+    Counts the jobs submitted, and holds the first job until released.
+    """
+
+    def __init__(self):
+        super().__init__(max_workers=1)
+        self.submitted = 0
+        self.release = threading.Event()
+
+    def submit(self, function, *args, **kwargs):
+        self.submitted += 1
+        if self.submitted == 1:
+            return super().submit(self.run_when_released, function, *args, **kwargs)
+        return super().submit(function, *args, **kwargs)
+
+    def run_when_released(self, function, *args, **kwargs):
+        self.release.wait(timeout=5)
+        return function(*args, **kwargs)
+
+
+async def blocks_of(text, size):
+    for start in range(0, len(text), size):
+        await asyncio.sleep(0)
+        yield text[start : start + size]
+
+
+async def join(pieces):
+    return "".join([piece async for piece in pieces])
+
+
+@pytest.mark.parametrize("inline_limit", [0, 10, 10000])
+def test_async(inline_limit):
+    """
+    Test that the async functions give the same results, whether the text is
+    converted inline or in an executor.
+    """
+    syllabics = sro2syllabics(SRO * 100)
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        assert (
+            asyncio.run(
+                cree_sro_syllabics_async.asro2syllabics(
+                    SRO * 100, executor=executor, inline_limit=inline_limit
+                )
+            )
+            == syllabics
+        )
+        assert asyncio.run(
+            cree_sro_syllabics_async.asyllabics2sro(
+                syllabics, produce_macrons=True, inline_limit=inline_limit
+            )
+        ) == syllabics2sro(syllabics, produce_macrons=True)
+    assert asyncio.run(cree_sro_syllabics_async.asro2syllabics(".", inline_limit=0)) == "᙮"
+
+
+@pytest.mark.parametrize("block_size", [1, 3, 1000])
+@pytest.mark.parametrize("inline_limit", [0, 10000])
+def test_async_stream(block_size, inline_limit):
+    """
+    Test that converting an async stream gives the same results as converting
+    the whole text at once.
+    """
+    for sro in (SRO, ".", ""):
+        converted = cree_sro_syllabics_async.asro2syllabics_stream(
+            blocks_of(sro, block_size), inline_limit=inline_limit
+        )
+        assert asyncio.run(join(converted)) == sro2syllabics(sro)
+
+    syllabics = sro2syllabics(SRO) + "ᐃᑌᐧᐃᐧᓇ"
+    converted = cree_sro_syllabics_async.asyllabics2sro_stream(
+        blocks_of(syllabics, block_size), inline_limit=inline_limit
+    )
+    assert asyncio.run(join(converted)) == syllabics2sro(syllabics)
+
+
+def test_async_cancellation():
+    """
+    Test that cancelling a conversion stops it before it converts any more
+    chunks.
+    """
+    text = "tânisi " * cree_sro_syllabics_async.ASYNC_CHUNK_SIZE
+
+    async def cancel_conversion(executor):
+        task = asyncio.ensure_future(
+            cree_sro_syllabics_async.asro2syllabics(text, executor=executor)
+        )
+        while executor.submitted == 0:
+            await asyncio.sleep(0)
+        task.cancel()
+        executor.release.set()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    executor = BlockingExecutor()
+    with executor:
+        asyncio.run(cancel_conversion(executor))
+    assert executor.submitted == 1
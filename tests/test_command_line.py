@@ -0,0 +1,112 @@
+import io
+import subprocess
+import sys
+
+import pytest  # type: ignore
+
+from cree_sro_syllabics import main
+
+SRO = "tânisi. nitisiyihkâson.\r\nkâ-mahihkani-pimohtêt\n.\n"
+SYLLABICS = "ᑖᓂᓯ᙮ ᓂᑎᓯᔨᐦᑳᓱᐣ᙮\r\nᑳ ᒪᐦᐃᐦᑲᓂ ᐱᒧᐦᑌᐟ\n.\n"
+
+
+@pytest.fixture
+def stdin(monkeypatch):
+    """
+    Replaces standard input with the given text.
+    """
+
+    def set_stdin(text):
+        monkeypatch.setattr(sys, "stdin", io.TextIOWrapper(io.BytesIO(text.encode())))
+
+    return set_stdin
+
+
+@pytest.mark.parametrize("jobs", ["1", "2"])
+def test_sro2syllabics_stdin(stdin, capsysbinary, jobs):
+    stdin(SRO)
+    assert main(["sro2syllabics", "--jobs", jobs]) == 0
+    assert capsysbinary.readouterr().out.decode("UTF-8") == SYLLABICS
+
+
+def test_syllabics2sro_stdin(stdin, capsysbinary):
+    stdin("ᐃᑌᐧᐃᐧᓇ ᔫᑎᓂᐯᐢᑖᐤ")
+    assert main(["syllabics2sro", "--macrons"]) == 0
+    assert capsysbinary.readouterr().out.decode("UTF-8") == "itwēwina yōtinipēstāw"
+
+
+def test_options(stdin, capsysbinary):
+    stdin("pîhc-âyihk")
+    assert main(["sro2syllabics", "--no-sandhi", "--hyphens="]) == 0
+    assert capsysbinary.readouterr().out.decode("UTF-8") == "ᐲᐦᐨᐋᔨᕽ"
+
+
+def test_files(tmp_path, capsysbinary):
+    first = tmp_path / "first.txt"
+    first.write_text(SRO, encoding="UTF-8")
+    second = tmp_path / "second.txt"
+    second.write_text("tânisi", encoding="UTF-8")
+
+    assert main(["sro2syllabics", str(first), str(second)]) == 0
+    assert capsysbinary.readouterr().out.decode("UTF-8") == SYLLABICS + "ᑖᓂᓯ"
+
+
+def test_in_place(tmp_path):
+    path = tmp_path / "text.txt"
+    path.write_bytes(SYLLABICS.encode("UTF-8"))
+
+    assert main(["syllabics2sro", "--in-place", str(path)]) == 0
+    assert path.read_bytes().decode("UTF-8") == SRO
+    assert list(tmp_path.iterdir()) == [path]
+
+
+def test_in_place_requires_files():
+    with pytest.raises(SystemExit):
+        main(["sro2syllabics", "--in-place"])
+
+
+def test_word_cache(tmp_path, stdin, capsysbinary):
+    path = tmp_path / "words.sqlite3"
+    corpus = tmp_path / "corpus.txt"
+    corpus.write_text(SRO, encoding="UTF-8")
+    assert main(["warm-cache", str(path), str(corpus)]) == 0
+    assert b"added 3 words" in capsysbinary.readouterr().err
+
+    stdin(SRO)
+    assert main(["sro2syllabics", "--word-cache", str(path)]) == 0
+    assert capsysbinary.readouterr().out.decode("UTF-8") == SYLLABICS
+
+
+def test_word_cache_in_parallel(tmp_path, stdin, capsysbinary, monkeypatch):
+    """
+    Test that worker processes use the word cache, when converting more than
+    one chunk.
+    """
+    import sqlite3
+
+    import cree_sro_syllabics
+
+    monkeypatch.setattr(cree_sro_syllabics, "COMMAND_LINE_BLOCK_SIZE", 16)
+    monkeypatch.setattr(cree_sro_syllabics, "DEFAULT_CHUNK_SIZE", 8)
+    path = tmp_path / "words.sqlite3"
+    corpus = tmp_path / "corpus.txt"
+    corpus.write_text("tânisi\n", encoding="UTF-8")
+    assert main(["warm-cache", str(path), str(corpus)]) == 0
+
+    stdin(SRO * 4)
+    assert main(["sro2syllabics", "--jobs", "2", "--word-cache", str(path)]) == 0
+    assert capsysbinary.readouterr().out.decode("UTF-8") == SYLLABICS * 4
+    # The workers added the words they converted to the database.
+    with sqlite3.connect(str(path)) as connection:
+        (count,) = connection.execute("SELECT COUNT(*) FROM words").fetchone()
+    assert count == 3
+
+
+def test_run_as_module():
+    result = subprocess.run(
+        [sys.executable, "-m", "cree_sro_syllabics", "sro2syllabics"],
+        input=SRO.encode("UTF-8"),
+        stdout=subprocess.PIPE,
+        check=True,
+    )
+    assert result.stdout.decode("UTF-8") == SYLLABICS
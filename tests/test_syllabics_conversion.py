@@ -1,4 +1,11 @@
+import io
+import re
+import subprocess
+import sys
+
 import pytest  # type: ignore
+
+import cree_sro_syllabics
 from cree_sro_syllabics import sro2syllabics, syllabics2sro
 
 COMBINING_CIRCUMFLEX = "\u0302"
@@ -56,6 +63,19 @@ def test_unicode_normalization():
     assert sro2syllabics(leaf) == "ᓃᐱᐩ"
 
 
+@pytest.mark.parametrize("text", ["nipiy", "nîpiy", "Eddie ni" + COMBINING_CIRCUMFLEX])
+def test_already_normalized(text):
+    """
+    Test that normalized text is not copied, and that assume_nfc gives the
+    same result for normalized text.
+    """
+    normalized = cree_sro_syllabics.nfc(text)
+    assert cree_sro_syllabics.nfc(normalized) is normalized
+    assert sro2syllabics(normalized, assume_nfc=True) == sro2syllabics(text)
+    converted = cree_sro_syllabics.sro2syllabics_many([normalized], assume_nfc=True)
+    assert list(converted) == [sro2syllabics(text)]
+
+
 @pytest.mark.parametrize(
     "sro,syllabics",
     [
@@ -103,6 +123,64 @@ def test_macrons(sro, syllabics):
     assert syllabics2sro(syllabics, produce_macrons=True) == sro
 
 
+@pytest.mark.parametrize(
+    "syllabics,sro",
+    [
+        ("ᐃᑌᐧᐃᐧᓇ", "itwēwina"),
+        ("ᐃᑘᐏᓇ", "itwēwina"),
+        ("ᐃᑌᐧᐃᐧᓇ (itwêwina)", "itwēwina (itwēwina)"),
+        ("ᐧ", "ᐧ"),
+    ],
+)
+def test_macrons_and_final_middle_dot(syllabics, sro):
+    """
+    Test that macrons are produced with and without FINAL MIDDLE DOTs, and
+    that circumflexes already in the text are also converted to macrons.
+    """
+    assert syllabics2sro(syllabics, produce_macrons=True) == sro
+    converted = cree_sro_syllabics.syllabics2sro_many([syllabics], produce_macrons=True)
+    assert list(converted) == [sro]
+
+
+def two_pass_syllabics2sro(syllabics, produce_macrons):
+    """
+    How syllabics2sro() used to convert: first composing each SYLLABIC +
+    FINAL MIDDLE DOT, then translating one character at a time.
+    """
+    with_dot = cree_sro_syllabics.SYLLABIC_WITH_DOT
+    final_dot_pattern = re.compile("([{}])ᐧ".format("".join(with_dot)))
+    composed = final_dot_pattern.sub(lambda match: with_dot[match.group(1)], syllabics)
+    sro = composed.translate(cree_sro_syllabics.SYLLABICS_TO_SRO)
+    if produce_macrons:
+        return sro.translate(cree_sro_syllabics.circumflex_to_macrons)
+    return sro
+
+
+@pytest.mark.parametrize("produce_macrons", [False, True])
+def test_final_middle_dots_match_two_passes(produce_macrons):
+    """
+    Test that converting SYLLABIC + FINAL MIDDLE DOT in a single scan gives
+    the same results as composing the syllabic first.
+    """
+    texts = [
+        # Every syllabic that has a 'w' variant, followed by a dot:
+        " ".join(syllabic + "ᐧ" for syllabic in cree_sro_syllabics.SYLLABIC_WITH_DOT),
+        "ᐃᑌᐧᐃᐧᓇ (itwêwina) ᐚᐱ ᐋᐧᐱ",
+        "ᐧ",
+        "ᐧᐊ",
+        "ᐊᐧᐧ",
+        "ᐁᐧᐃᐧᐅᐧᐊᐧ",
+        "ᐘᐧ",
+        "ᐤᐧ",
+        "aᐧ ᐧ ᐊ ᐧᐊᐧ",
+    ]
+    for text in texts:
+        expected = two_pass_syllabics2sro(text, produce_macrons)
+        assert syllabics2sro(text, produce_macrons=produce_macrons) == expected
+        converted = cree_sro_syllabics.syllabics2sro_many([text], produce_macrons)
+        assert list(converted) == [expected]
+
+
 @pytest.mark.parametrize(
     "sro,syllabics",
     [
@@ -269,3 +347,734 @@ def test_sandhi_with_h(sro, syllabics):
     https://github.com/eddieantonio/cree-sro-syllabics/issues/17
     """
     assert sro2syllabics(sro, sandhi=True) == syllabics
+
+
+@pytest.mark.parametrize("sandhi", [True, False])
+def test_long_words(sandhi):
+    """
+    Very long words should be transcribed just like their parts.
+    """
+    morpheme = "kâ-mahihkani-pimohtêt"
+    word = "-".join([morpheme] * 200)
+    expected = "\N{NARROW NO-BREAK SPACE}".join(
+        [sro2syllabics(morpheme, sandhi=sandhi)] * 200
+    )
+    assert sro2syllabics(word, sandhi=sandhi) == expected
+
+
+@pytest.fixture
+def word_cache():
+    """
+    Enables a small word cache for the duration of the test.
+    """
+    cree_sro_syllabics.enable_word_cache(maxsize=3)
+    yield
+    cree_sro_syllabics.disable_word_cache()
+
+
+def test_word_cache(word_cache):
+    """
+    Test that the word cache evicts the least recently used words.
+    """
+    text = "kâ-mahihkani-pimohtêt isiyihkâsow. tânisi."
+    # Three words; the cache is cold:
+    assert sro2syllabics(text) == "ᑳ ᒪᐦᐃᐦᑲᓂ ᐱᒧᐦᑌᐟ ᐃᓯᔨᐦᑳᓱᐤ᙮ ᑖᓂᓯ᙮"
+    info = cree_sro_syllabics.word_cache_info()
+    assert (info.hits, info.misses, info.evictions, info.currsize) == (0, 3, 0, 3)
+
+    # "tânisi" was used most recently; "kâ-mahihkani-pimohtêt" least recently.
+    assert sro2syllabics("tânisi nipiy tânisi") == "ᑖᓂᓯ ᓂᐱᐩ ᑖᓂᓯ"
+    info = cree_sro_syllabics.word_cache_info()
+    assert (info.hits, info.misses, info.evictions, info.currsize) == (2, 4, 1, 3)
+
+    cree_sro_syllabics.clear_word_cache()
+    assert cree_sro_syllabics.word_cache_info() == (0, 0, 0, 3, 0)
+
+
+def test_word_cache_respects_options(word_cache):
+    """
+    Test that cached words are not reused with different conversion options.
+    """
+    assert sro2syllabics("pîhc-âyihk") == "ᐲᐦᒑᔨᕽ"
+    assert sro2syllabics("pîhc-âyihk", sandhi=False) == "ᐲᐦᐨ ᐋᔨᕽ"
+    assert sro2syllabics("pîhc-âyihk", sandhi=False, hyphens="") == "ᐲᐦᐨᐋᔨᕽ"
+    assert cree_sro_syllabics.word_cache_info().misses == 3
+
+
+def test_persistent_word_cache(tmp_path):
+    """
+    Test that words cached by one process are available to the next.
+    """
+    import sqlite3
+
+    path = tmp_path / "words.sqlite3"
+    text = "kâ-mahihkani-pimohtêt isiyihkâsow. tânisi."
+    try:
+        cree_sro_syllabics.enable_word_cache(path=path)
+        assert sro2syllabics(text) == "ᑳ\u202fᒪᐦᐃᐦᑲᓂ\u202fᐱᒧᐦᑌᐟ ᐃᓯᔨᐦᑳᓱᐤ᙮ ᑖᓂᓯ᙮"
+        assert cree_sro_syllabics.word_cache_info().hit_rate == 0.0
+        # Disabling the cache writes its new words to the database:
+        cree_sro_syllabics.disable_word_cache()
+
+        cree_sro_syllabics.enable_word_cache(path=path)
+        assert sro2syllabics(text) == "ᑳ\u202fᒪᐦᐃᐦᑲᓂ\u202fᐱᒧᐦᑌᐟ ᐃᓯᔨᐦᑳᓱᐤ᙮ ᑖᓂᓯ᙮"
+        assert sro2syllabics("nipiy", sandhi=False) == "ᓂᐱᐩ"
+        info = cree_sro_syllabics.word_cache_info()
+        assert (info.hits, info.misses, info.currsize) == (3, 1, 4)
+        assert info.hit_rate == 0.75
+
+        cree_sro_syllabics.clear_word_cache()
+        cree_sro_syllabics.disable_word_cache()
+        cree_sro_syllabics.enable_word_cache(path=path)
+        assert cree_sro_syllabics.word_cache_info().currsize == 0
+    finally:
+        cree_sro_syllabics.disable_word_cache()
+
+    # Words cached by other versions are discarded.
+    with sqlite3.connect(str(path)) as connection:
+        connection.execute("INSERT INTO words VALUES ('nipiy', '', 1, 'wrong')")
+        connection.execute("UPDATE metadata SET value = '1999.1.1'")
+    assert cree_sro_syllabics.warm_word_cache(["nipiy"], path, hyphens="") == 1
+
+
+def test_warm_word_cache(tmp_path):
+    """
+    Test that warming the word cache adds each distinct word once.
+    """
+    path = tmp_path / "words.sqlite3"
+    lines = ["tânisi. Eddie nitisiyihkâson.\n", "TÂNISI pîhc-âyihk\n"]
+    assert cree_sro_syllabics.warm_word_cache(lines, path) == 3
+    assert cree_sro_syllabics.warm_word_cache(lines, path) == 0
+    assert cree_sro_syllabics.warm_word_cache(lines, path, sandhi=False) == 3
+    try:
+        cree_sro_syllabics.enable_word_cache(path=path)
+        assert sro2syllabics("tânisi pîhc-âyihk") == "ᑖᓂᓯ ᐲᐦᒑᔨᕽ"
+        assert cree_sro_syllabics.word_cache_info().hits == 2
+    finally:
+        cree_sro_syllabics.disable_word_cache()
+
+
+def test_persistent_word_cache_looks_up_database(tmp_path):
+    """
+    Test that words missing from memory are looked up in the database, even
+    when more words are cached than fit in memory, or they were added after
+    the cache was enabled.
+    """
+    path = tmp_path / "words.sqlite3"
+    text = "tânisi nitisiyihkâson kâ-mahihkani-pimohtêt nipiy wâpamêw acâhkos"
+    syllabics = sro2syllabics(text)
+    assert cree_sro_syllabics.warm_word_cache([text], path) == 6
+    try:
+        cree_sro_syllabics.enable_word_cache(maxsize=2, path=path)
+        assert sro2syllabics(text) == syllabics
+        info = cree_sro_syllabics.word_cache_info()
+        assert (info.hits, info.misses, info.currsize) == (6, 0, 2)
+
+        assert cree_sro_syllabics.warm_word_cache(["mistik"], path) == 1
+        assert sro2syllabics("mistik") == "ᒥᐢᑎᐠ"
+        assert cree_sro_syllabics.word_cache_info().hits == 7
+    finally:
+        cree_sro_syllabics.disable_word_cache()
+
+
+@pytest.mark.parametrize(
+    "options",
+    [{}, {"sandhi": False}, {"hyphens": ""}, {"hyphens": "-", "sandhi": False}],
+)
+def test_sro2syllabics_many(options):
+    """
+    Test that converting a batch is the same as converting one at a time.
+    """
+    texts = ["", "tânisi.", "pîhc-âyihk", "write nêhiyawêwin", ".", "Dr. Thunder"]
+    converted = cree_sro_syllabics.sro2syllabics_many(iter(texts), **options)
+    assert list(converted) == [sro2syllabics(text, **options) for text in texts]
+
+
+@pytest.mark.parametrize("produce_macrons", [True, False])
+def test_syllabics2sro_many(produce_macrons):
+    """
+    Test that converting a batch is the same as converting one at a time.
+    """
+    texts = ["", "ᑖᓂᓯ᙮", "ᐃᑌᐧᐃᐧᓇ", "write ᓀᐦᐃᔭᐍᐏᐣ", "ᑳ ᒪᐦᐃᐦᑲᓂ ᐱᒧᐦᑌᐟ"]
+    converted = cree_sro_syllabics.syllabics2sro_many(
+        iter(texts), produce_macrons=produce_macrons
+    )
+    assert list(converted) == [
+        syllabics2sro(text, produce_macrons=produce_macrons) for text in texts
+    ]
+
+
+@pytest.mark.parametrize("produce_macrons", [True, False])
+def test_syllabics2sro_numpy(produce_macrons):
+    """
+    Test that the NumPy engine gives the same results as syllabics2sro().
+    """
+    pytest.importorskip("numpy")
+
+    texts = [
+        "",
+        "ᑖᓂᓯ᙮",
+        "ᐃᑌᐧᐃᐧᓇ",
+        "write ᓀᐦᐃᔭᐍᐏᐣ, êwako ôma",
+        "ᑳ\u202fᒪᐦᐃᐦᑲᓂ\u202fᐱᒧᐦᑌᐟ",
+        # A FINAL MIDDLE DOT only combines with a syllabic in the same text:
+        "ᐊ",
+        "ᐧᐊ",
+        "ᐧ",
+        "\U0001F600 ᐁᐧ",
+    ]
+    assert cree_sro_syllabics.syllabics2sro_numpy(
+        iter(texts), produce_macrons=produce_macrons
+    ) == [syllabics2sro(text, produce_macrons=produce_macrons) for text in texts]
+    assert cree_sro_syllabics.syllabics2sro_numpy([]) == []
+
+
+@pytest.mark.parametrize(
+    "options",
+    [{}, {"sandhi": False}, {"hyphens": ""}, {"hyphens": ".", "assume_nfc": True}],
+)
+def test_sro_to_syllabics_converter(options):
+    """
+    Test that a converter gives the same results as sro2syllabics(), even
+    after it has been pickled.
+    """
+    import pickle
+
+    texts = ["", "tânisi.", "pîhc-âyihk", "write nêhiyawêwin", ".", "Dr. Thunder"]
+    convert = cree_sro_syllabics.SroToSyllabics(**options)
+    expected = [sro2syllabics(text, **options) for text in texts]
+    assert [convert(text) for text in texts] == expected
+    assert list(convert.many(iter(texts))) == expected
+
+    unpickled = pickle.loads(pickle.dumps(convert))
+    assert repr(unpickled) == repr(convert)
+    assert [unpickled.convert(text) for text in texts] == expected
+    with pytest.raises(AttributeError):
+        convert.sandhi = False
+
+
+COLUMN = ["nipiy", "wâpamêw", None, "nipiy", "kâ-mahihkani-pimohtêt", "wâpamêw"]
+
+
+def test_column_list():
+    """
+    Test converting lists and tuples of texts, with missing values.
+    """
+    expected = [None if text is None else sro2syllabics(text) for text in COLUMN]
+    assert cree_sro_syllabics.sro2syllabics_column(COLUMN) == expected
+    assert cree_sro_syllabics.sro2syllabics_column(tuple(COLUMN)) == tuple(expected)
+    assert cree_sro_syllabics.sro2syllabics_column(iter(COLUMN)) == expected
+    assert cree_sro_syllabics.sro2syllabics_column([]) == []
+    assert cree_sro_syllabics.syllabics2sro_column(expected, produce_macrons=True) == [
+        None if text is None else syllabics2sro(text, produce_macrons=True)
+        for text in expected
+    ]
+    assert cree_sro_syllabics.sro2syllabics_column(["pîhc-âyihk"], hyphens="") == [
+        "ᐲᐦᒑᔨᕽ"
+    ]
+
+
+def test_column_numpy():
+    """
+    Test converting NumPy arrays, of objects and of strings.
+    """
+    numpy = pytest.importorskip("numpy")
+
+    objects = numpy.array(COLUMN, dtype=object).reshape(2, 3)
+    converted = cree_sro_syllabics.sro2syllabics_column(objects)
+    assert converted.dtype == object and converted.shape == (2, 3)
+    assert converted.ravel().tolist() == cree_sro_syllabics.sro2syllabics_column(COLUMN)
+
+    texts = [text for text in COLUMN if text is not None]
+    strings = numpy.array(texts)
+    converted = cree_sro_syllabics.sro2syllabics_column(strings)
+    assert converted.dtype.kind == "U"
+    assert converted.tolist() == [sro2syllabics(text) for text in texts]
+    assert cree_sro_syllabics.syllabics2sro_column(converted).tolist() == [
+        syllabics2sro(sro2syllabics(text)) for text in texts
+    ]
+
+
+def test_column_pandas():
+    """
+    Test converting pandas Series, keeping their index, name, and dtype.
+    """
+    pandas = pytest.importorskip("pandas")
+
+    series = pandas.Series(COLUMN, index=list("abcdef"), name="lemma", dtype=object)
+    converted = cree_sro_syllabics.sro2syllabics_column(series)
+    assert list(converted.index) == list("abcdef")
+    assert converted.name == "lemma"
+    assert converted.dtype == object
+    assert converted.tolist() == cree_sro_syllabics.sro2syllabics_column(COLUMN)
+
+    for dtype in ["string", "category"]:
+        typed = series.astype(dtype)
+        converted = cree_sro_syllabics.sro2syllabics_column(typed)
+        if dtype == "string":
+            assert converted.dtype == typed.dtype
+        assert converted.isna().tolist() == typed.isna().tolist()
+        assert converted.dropna().tolist() == [
+            sro2syllabics(text) for text in COLUMN if text is not None
+        ]
+
+    frame = pandas.DataFrame({"lemma": ["ᓂᐱᐩ", "ᓂᐱᐩ"]})
+    frame["sro"] = cree_sro_syllabics.syllabics2sro_column(frame["lemma"])
+    assert frame["sro"].tolist() == ["nipiy", "nipiy"]
+
+
+def test_column_pyarrow():
+    """
+    Test converting pyarrow arrays and chunked arrays, keeping their type.
+    """
+    pyarrow = pytest.importorskip("pyarrow")
+
+    expected = cree_sro_syllabics.sro2syllabics_column(COLUMN)
+    array = pyarrow.array(COLUMN, type=pyarrow.large_string())
+    converted = cree_sro_syllabics.sro2syllabics_column(array)
+    assert converted.type == pyarrow.large_string()
+    assert converted.to_pylist() == expected
+
+    chunked = pyarrow.chunked_array([COLUMN[:2], COLUMN[2:], []])
+    converted = cree_sro_syllabics.sro2syllabics_column(chunked)
+    assert isinstance(converted, pyarrow.ChunkedArray)
+    assert converted.to_pylist() == expected
+
+
+def test_column_does_not_import_dataframe_libraries():
+    """
+    Test that converting a list never imports NumPy, pandas, or pyarrow.
+    """
+    script = """
+import sys
+import cree_sro_syllabics
+assert cree_sro_syllabics.sro2syllabics_column(["nipiy"]) == ["ᓂᐱᐩ"]
+assert not {"numpy", "pandas", "pyarrow"} & set(sys.modules)
+"""
+    subprocess.run([sys.executable, "-c", script], check=True)
+
+
+@pytest.mark.parametrize(
+    "sro",
+    [
+        "tânisi. nitisiyihkâson.\nkâ-mahihkani-pimohtêt\n.",
+        "\t namoya  tataspêyihtam. ",
+        'She told Dr. Thunder: "ninôhtêhkatân."',
+        "ni" + COMBINING_CIRCUMFLEX + "piy ni" + COMBINING_CIRCUMFLEX + "piy",
+    ],
+)
+@pytest.mark.parametrize("options", [{}, {"sandhi": False}, {"hyphens": "."}])
+def test_incremental_typing(sro, options):
+    """
+    Test that typing a document one character at a time, then deleting it,
+    keeps the syllabics the same as converting the whole document.
+    """
+    document = cree_sro_syllabics.IncrementalSroToSyllabics(**options)
+    syllabics = ""
+
+    def apply(edit):
+        return (
+            syllabics[: edit.offset]
+            + edit.inserted
+            + syllabics[edit.offset + edit.deleted :]
+        )
+
+    for end, character in enumerate(sro, 1):
+        syllabics = apply(document.edit(end - 1, 0, character))
+        assert syllabics == sro2syllabics(sro[:end], **options)
+    assert document.sro == sro
+    assert document.syllabics == syllabics
+
+    # Delete from the start, one word at a time.
+    remaining = sro
+    while remaining:
+        deleted = len(remaining.split(" ", 1)[0]) + 1
+        deleted = min(deleted, len(remaining))
+        syllabics = apply(document.edit(0, deleted, ""))
+        remaining = remaining[deleted:]
+        assert syllabics == sro2syllabics(remaining, **options)
+    assert document.sro == document.syllabics == ""
+
+
+def test_incremental_edits():
+    """
+    Test edits in the middle of a document, and that they only report what
+    changed in the syllabics.
+    """
+    TextEdit = cree_sro_syllabics.TextEdit
+    document = cree_sro_syllabics.IncrementalSroToSyllabics("tânisi pîhc âyihk. Eddie")
+    assert document.syllabics == "ᑖᓂᓯ ᐲᐦᐨ ᐋᔨᕽ᙮ Eddie"
+
+    # Joining two words converts them as one:
+    assert document.edit(11, 1, "") == TextEdit(6, 3, "ᒑ")
+    assert document.sro == "tânisi pîhcâyihk. Eddie"
+    assert document.syllabics == "ᑖᓂᓯ ᐲᐦᒑᔨᕽ᙮ Eddie"
+    # Edits that change nothing in the syllabics replace nothing:
+    assert document.edit(11, 0, "-").inserted == ""
+    assert document.edit(0, 0, "").deleted == 0
+    # A lone full-stop is only converted when it's the entire document:
+    assert document.edit(0, 24, ".") == TextEdit(0, 16, "᙮")
+    assert document.edit(1, 0, " ") == TextEdit(0, 1, ". ")
+
+    with pytest.raises(ValueError):
+        document.edit(1, 2, "")
+    with pytest.raises(ValueError):
+        document.edit(-1, 0, "")
+
+
+def test_incremental_offsets():
+    """
+    Test mapping offsets between the SRO and the syllabics of a document.
+    """
+    sro = "Eddie nitisiyihkâson. kâ-mahihkani-pimohtêt isiyihkâsow"
+    syllabics = sro2syllabics(sro)
+    document = cree_sro_syllabics.IncrementalSroToSyllabics(sro)
+
+    # Text that is not converted, and the start and end of words map exactly.
+    for start, end in [(0, 6), (21, 22), (43, 44)]:
+        for offset in range(start, end):
+            mapped = document.syllabics_offset(offset)
+            assert syllabics[mapped : mapped + 1] == sro[offset : offset + 1]
+            assert document.sro_offset(mapped) == offset
+    assert document.syllabics_offset(len(sro)) == len(syllabics)
+    assert document.sro_offset(len(syllabics)) == len(sro)
+
+    # Offsets within words map to the start of the word.
+    assert syllabics[document.syllabics_offset(6) :].startswith("ᓂᑎᓯᔨᐦᑳᓱᐣ᙮")
+    assert document.syllabics_offset(10) == document.syllabics_offset(6)
+    assert document.sro_offset(document.syllabics_offset(6) + 3) == 6
+
+    with pytest.raises(ValueError):
+        document.syllabics_offset(len(sro) + 1)
+
+
+@pytest.mark.parametrize("produce_macrons", [True, False])
+def test_syllabics_to_sro_converter(produce_macrons):
+    """
+    Test that a converter gives the same results as syllabics2sro(), even
+    after it has been pickled.
+    """
+    import pickle
+
+    texts = ["", "ᑖᓂᓯ᙮", "ᐃᑌᐧᐃᐧᓇ", "write ᓀᐦᐃᔭᐍᐏᐣ", "ᑳ ᒪᐦᐃᐦᑲᓂ ᐱᒧᐦᑌᐟ"]
+    convert = cree_sro_syllabics.SyllabicsToSro(produce_macrons=produce_macrons)
+    expected = [syllabics2sro(text, produce_macrons=produce_macrons) for text in texts]
+    assert [convert(text) for text in texts] == expected
+    assert list(convert.many(iter(texts))) == expected
+
+    unpickled = pickle.loads(pickle.dumps(convert))
+    assert unpickled.produce_macrons == produce_macrons
+    assert [unpickled.convert(text) for text in texts] == expected
+
+
+@pytest.mark.parametrize(
+    "sro",
+    [
+        "",
+        ".",
+        "tânisi.\nnitisiyihkâson.\n.",
+        "kâ-mahihkani-pimohtêt\n\nisiyihkâsow. \r\n Howdy, English text.\n" * 20,
+    ],
+)
+def test_parallel(sro):
+    """
+    Test that converting in parallel gives the same results as converting in
+    one go.
+    """
+    syllabics = sro2syllabics(sro)
+    assert (
+        cree_sro_syllabics.sro2syllabics_parallel(sro, max_workers=2, chunk_size=10)
+        == syllabics
+    )
+    assert (
+        cree_sro_syllabics.syllabics2sro_parallel(
+            syllabics, max_workers=2, chunk_size=10
+        )
+        == syllabics2sro(syllabics)
+    )
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "",
+        "Big dogs bark!",
+        "tânisi. Eddie nitisiyihkâson, kâ-mahihkani-pimohtêt ᓂᔭ",
+        "ni" + COMBINING_CIRCUMFLEX + "piy nipiy",
+    ],
+)
+def test_find_sro_words(text):
+    """
+    Test that the words found are exactly the words that sro2syllabics()
+    converts, and that their syllabics are only computed when asked for.
+    """
+    normalized = cree_sro_syllabics.nfc(text)
+    words = list(cree_sro_syllabics.find_sro_words(text))
+    assert all(word._syllabics is None for word in words)
+
+    converted = []
+    last_end = 0
+    for start, end, sro, syllabics in words:
+        assert normalized[start:end] == sro
+        converted.append(normalized[last_end:start] + syllabics)
+        last_end = end
+    converted.append(normalized[last_end:])
+    assert "".join(converted) == sro2syllabics(text).replace("\u166e", ".")
+
+
+@pytest.mark.parametrize("buffer_type", [bytes, bytearray, memoryview])
+def test_bytes(buffer_type):
+    """
+    Test converting UTF-8 buffers, returning bytes.
+    """
+    sro = "Eddie nitisiyihkâson. kâ-mahihkani-pimohtêt"
+    syllabics = sro2syllabics(sro)
+    sro_bytes = buffer_type(sro.encode("UTF-8"))
+    syllabics_bytes = buffer_type(syllabics.encode("UTF-8"))
+
+    assert cree_sro_syllabics.sro2syllabics_bytes(sro_bytes) == syllabics.encode()
+    assert cree_sro_syllabics.syllabics2sro_bytes(syllabics_bytes) == sro.encode()
+    assert cree_sro_syllabics.syllabics2sro_bytes(
+        syllabics_bytes, produce_macrons=True
+    ) == syllabics2sro(syllabics, produce_macrons=True).encode()
+
+
+def test_bytes_into_buffer():
+    """
+    Test converting UTF-8 into a caller-supplied buffer.
+    """
+    out = bytearray(b"x" * 16)
+    size = cree_sro_syllabics.syllabics2sro_bytes("ᐃᑌᐧᐃᐧᓇ".encode(), out=out)
+    assert (size, bytes(out)) == (9, b"itw\xc3\xaawinaxxxxxxx")
+
+    size = cree_sro_syllabics.sro2syllabics_bytes(b"niya", out=memoryview(out)[4:])
+    assert out[4 : 4 + size].decode() == "ᓂᔭ"
+
+    with pytest.raises(ValueError):
+        cree_sro_syllabics.sro2syllabics_bytes(b"niya", out=bytearray(5))
+    with pytest.raises(UnicodeDecodeError):
+        cree_sro_syllabics.syllabics2sro_bytes(b"\xe1\x90")
+
+
+@pytest.mark.parametrize("block_size", [1, 2, 3, 7, 1000])
+@pytest.mark.parametrize(
+    "sro",
+    [
+        "",
+        ".",
+        " .",
+        "tânisi.\nnitisiyihkâson.\n.",
+        "\t namoya  tataspêyihtam. ",
+        'She told Dr. Thunder: "ninôhtêhkatân."',
+        "kâ-mahihkani-pimohtêt\n\nisiyihkâsow. \r\n Howdy, English text.\n" * 3,
+        "ni" + COMBINING_CIRCUMFLEX + "piy ni" + COMBINING_CIRCUMFLEX + "piy",
+    ],
+)
+def test_streaming(sro, block_size):
+    """
+    Test that converting a stream gives the same results as converting the
+    whole text at once, no matter how the text is split.
+    """
+    blocks = [sro[i : i + block_size] for i in range(0, len(sro), block_size)]
+    syllabics = sro2syllabics(sro)
+    assert "".join(cree_sro_syllabics.sro2syllabics_stream(blocks)) == syllabics
+    assert (
+        "".join(
+            cree_sro_syllabics.sro2syllabics_stream(
+                io.StringIO(sro), buffer_size=block_size
+            )
+        )
+        == syllabics
+    )
+
+    syllabics += "ᐃᑌᐧᐃᐧᓇ ᐋᐧᐱ"
+    blocks = [syllabics[i : i + block_size] for i in range(0, len(syllabics), block_size)]
+    assert "".join(
+        cree_sro_syllabics.syllabics2sro_stream(blocks)
+    ) == syllabics2sro(syllabics)
+
+
+@pytest.mark.parametrize("region_size", [1, 2, 3, 7, 1000])
+@pytest.mark.parametrize(
+    "sro",
+    [
+        "",
+        ".",
+        " .",
+        "tânisi.\nnitisiyihkâson.\n.",
+        "\t namoya  tataspêyihtam. ",
+        "kâ-mahihkani-pimohtêt\n\nisiyihkâsow. \r\n Howdy, English text.\n" * 3,
+        "ni" + COMBINING_CIRCUMFLEX + "piy ni" + COMBINING_CIRCUMFLEX + "piy",
+    ],
+)
+def test_file_conversion(tmp_path, sro, region_size):
+    """
+    Test that converting a memory-mapped file gives the same results as
+    converting the whole text at once, no matter the size of the regions.
+    """
+    source = tmp_path / "sro.txt"
+    destination = tmp_path / "syllabics.txt"
+    source.write_bytes(sro.encode("UTF-8"))
+    progress = []
+    cree_sro_syllabics.sro2syllabics_file(
+        source, destination, region_size=region_size, progress=progress.append
+    )
+    syllabics = sro2syllabics(sro)
+    assert destination.read_bytes().decode("UTF-8") == syllabics
+    if sro:
+        assert [p.bytes_done for p in progress] == sorted(p.bytes_done for p in progress)
+        assert progress[-1].bytes_done == progress[-1].total_bytes == source.stat().st_size
+
+    source.write_bytes((syllabics + "ᐃᑌᐧᐃᐧᓇ ᐋᐧᐱ").encode("UTF-8"))
+    cree_sro_syllabics.syllabics2sro_file(
+        source, destination, produce_macrons=True, region_size=region_size
+    )
+    assert destination.read_bytes().decode("UTF-8") == syllabics2sro(
+        syllabics + "ᐃᑌᐧᐃᐧᓇ ᐋᐧᐱ", produce_macrons=True
+    )
+
+
+@pytest.mark.parametrize(
+    "text,skipped",
+    [
+        ("", True),
+        ("Big dogs bark loudly!", True),
+        ("Quick brown fox, lazy dog: 1, 2, 3.", True),
+        ("Big dogs bark at the moon!", False),
+        ("Big dogs bark ᓂᔭ", False),
+        ("Big dogs bark.ᐊ", False),
+        (".", False),
+        ("\N{KELVIN SIGN}i", False),
+    ],
+)
+def test_fast_path(text, skipped):
+    """
+    Test that text with nothing to convert is returned as-is.
+    """
+    cree_sro_syllabics.reset_fast_path_info()
+    result = sro2syllabics(text)
+    info = cree_sro_syllabics.fast_path_info()
+    assert info == ((1, 0) if skipped else (0, 1))
+    if skipped:
+        assert result == text
+
+
+def test_tables_are_built_on_first_use():
+    """
+    Test that converting syllabics to SRO never builds the tables for
+    converting SRO to syllabics, nor imports modules that only the
+    command-line interface and parallel conversion need.
+    """
+    script = """
+import sys
+import cree_sro_syllabics
+assert cree_sro_syllabics.syllabics2sro("ᑖᓂᓯ") == "tânisi"
+assert cree_sro_syllabics.sro2syllabics_tables.cache_info().currsize == 0
+assert not {"argparse", "concurrent.futures", "tempfile"} & set(sys.modules)
+"""
+    subprocess.run([sys.executable, "-c", script], check=True)
+
+
+@pytest.mark.parametrize(
+    "name", ["word_pattern", "LETTER_CLASSES", "SYLLABICS_TO_SRO", "syllabics2sro_lookup"]
+)
+def test_lazy_attributes(name):
+    """
+    Test that the tables built on first use are still module attributes.
+    """
+    assert getattr(cree_sro_syllabics, name) is getattr(cree_sro_syllabics, name)
+    with pytest.raises(AttributeError):
+        cree_sro_syllabics.no_such_attribute
+
+
+@pytest.fixture
+def instrumentation():
+    """
+    Enables instrumentation for the duration of the test.
+    """
+    cree_sro_syllabics.enable_instrumentation()
+    yield
+    cree_sro_syllabics.disable_instrumentation()
+
+
+def test_instrumentation(instrumentation):
+    """
+    Test that instrumented conversions give the same results, and record
+    each stage.
+    """
+    import json
+
+    texts = ["tânisi. Eddie nitisiyihkâson.", "Big dogs bark!", ".", "pîhc-âyihk"]
+    cree_sro_syllabics.disable_instrumentation()
+    expected = [sro2syllabics(text, hyphens=".") for text in texts]
+    cree_sro_syllabics.enable_instrumentation()
+
+    assert [sro2syllabics(text, hyphens=".") for text in texts] == expected
+    assert list(cree_sro_syllabics.sro2syllabics_many(texts, hyphens=".")) == expected
+    assert syllabics2sro("ᐃᑌᐧᐃᐧᓇ ᓂᔭ", produce_macrons=True) == "itwēwina niya"
+    assert syllabics2sro("ᓂᔭ") == "niya"
+
+    info = json.loads(cree_sro_syllabics.dump_instrumentation())
+    counters = info["counters"]
+    assert counters["sro2syllabics.calls"] == 8
+    assert counters["sro2syllabics.fast_path_skips"] == 2
+    assert counters["sro2syllabics.words"] == 6
+    assert counters["sro2syllabics.full_stops"] == 6
+    assert counters["syllabics2sro.calls"] == 2
+    assert counters["syllabics2sro.final_middle_dots"] == 2
+    assert set(info["timers"]) >= {
+        "sro2syllabics.transcode",
+        "syllabics2sro.sequences",
+        "syllabics2sro.translate",
+    }
+    assert all(seconds >= 0 for seconds in info["timers"].values())
+
+    cree_sro_syllabics.reset_instrumentation()
+    assert cree_sro_syllabics.instrumentation_info()["counters"] == {}
+
+
+def test_instrumentation_disabled():
+    """
+    Test that nothing is recorded when instrumentation is disabled.
+    """
+    sro2syllabics("tânisi")
+    info = cree_sro_syllabics.instrumentation_info()
+    assert info["timers"] == info["counters"] == {}
+    assert info["word_cache"]["maxsize"] == 0
+
+
+def test_backends_agree(backend, monkeypatch):
+    """
+    Test that the C accelerator gives exactly the same results as pure
+    Python, including for odd words, and words that cannot be converted.
+    """
+    import itertools
+
+    if backend != "c":
+        pytest.skip("compares the C accelerator to pure Python")
+
+    pieces = ["p", "th", "k", "w", "h", "a", "ê", "i", "-", "E", "'", "x"]
+    words = ["".join(word) for word in itertools.product(pieces, repeat=4)]
+    text = " ".join(words) + ". ᐃᑌᐧᐃᐧᓇ ᓂᔭ᙮ ᑳ ᒫᒋ"
+
+    def convert_all():
+        def attempt(convert, *args):
+            try:
+                return convert(*args)
+            except Exception as error:
+                return repr(error)
+
+        results = []
+        for hyphens, sandhi in itertools.product([" ", "", "ᐦ", "-"], [True, False]):
+            results.append(attempt(sro2syllabics, text, hyphens, sandhi))
+            results.extend(
+                attempt(cree_sro_syllabics.transcode_syllables, word.lower(), hyphens, sandhi)
+                for word in words
+            )
+        for produce_macrons in (True, False):
+            results.append(syllabics2sro(sro2syllabics(text) + text, produce_macrons))
+        return results
+
+    accelerated = convert_all()
+    monkeypatch.setattr(cree_sro_syllabics, "accelerator", None)
+    assert convert_all() == accelerated